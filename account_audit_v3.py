@@ -7,6 +7,8 @@ Identifikacija svih Google Ads Accounta u V3 podacima
 
 import pandas as pd
 
+from hub_parsing import parse_cost_series
+
 # ============================================================================
 # PATHS
 # ============================================================================
@@ -44,16 +46,7 @@ if 'Account' in df_no_seg.columns:
     print(f"Broj unikatnih Accounta: {len(unique_accounts)}\n")
 
     # Parsiraj Cost za statistiku
-    def parse_cost(value):
-        if pd.isna(value):
-            return 0.0
-        value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-        try:
-            return float(value_str)
-        except:
-            return 0.0
-
-    df_no_seg['Cost_parsed'] = df_no_seg['Cost'].apply(parse_cost)
+    df_no_seg['Cost_parsed'] = parse_cost_series(df_no_seg['Cost'])
 
     # Grupiraj po accountima
     account_stats = df_no_seg.groupby('Account').agg({
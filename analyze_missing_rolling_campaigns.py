@@ -8,6 +8,8 @@ Identifies campaigns in MASTER file but not in ROLLING file
 import pandas as pd
 import numpy as np
 
+from hub_parsing import parse_cost_series
+
 print("=" * 80)
 print("MISSING ROLLING REACH CAMPAIGNS ANALYSIS")
 print("=" * 80)
@@ -53,20 +55,11 @@ print("\n[STEP 3] PARSING COST AND ANALYZING...")
 print("-" * 80)
 
 # Parse cost
-def parse_cost(value):
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
-df_missing['Cost_Parsed'] = df_missing['Cost'].apply(parse_cost)
+df_missing['Cost_Parsed'] = parse_cost_series(df_missing['Cost'])
 
 # Total cost of missing campaigns
 total_missing_cost = df_missing['Cost_Parsed'].sum()
-total_all_cost = df_master['Cost'].apply(parse_cost).sum()
+total_all_cost = parse_cost_series(df_master['Cost']).sum()
 
 print(f"Total cost of MISSING campaigns: EUR {total_missing_cost:,.2f}")
 print(f"Total cost of ALL campaigns: EUR {total_all_cost:,.2f}")
@@ -8,6 +8,8 @@ Analiza mogućih filtera koji mogu objasniti razliku između 74 i 56 accounta
 import pandas as pd
 from datetime import datetime
 
+from hub_parsing import parse_cost_series
+
 # ============================================================================
 # UCITAJ CAMPAIGN METRICS
 # ============================================================================
@@ -25,16 +27,7 @@ print(f"Ukupno unikatnih Campaign ID-eva: {df['Campaign ID'].nunique()}")
 print(f"Ukupno unikatnih Accounta: {df['Account'].nunique()}\n")
 
 # Parse Cost
-def parse_cost(value):
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
-df['Cost_parsed'] = df['Cost'].apply(parse_cost)
+df['Cost_parsed'] = parse_cost_series(df['Cost'])
 
 # ============================================================================
 # PROVJERA 1: ACCOUNTI SA ZERO SPEND
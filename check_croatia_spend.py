@@ -6,20 +6,12 @@ PROVJERA CROATIA SPEND - iz country file-a
 
 import pandas as pd
 
-def parse_cost(value):
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
+from hub_data import load_location_data
 
 # Ucitaj country file
 PATH_COUNTRY = "data - v3/campaign - country - v3/campaign location - version 3.csv"
 
-df_country = pd.read_csv(PATH_COUNTRY, delimiter=';', encoding='utf-8-sig')
-df_country['Cost_parsed'] = df_country['Cost'].apply(parse_cost)
+df_country = load_location_data(PATH_COUNTRY)
 
 print("COUNTRY FILE ANALIZA")
 print("=" * 80)
@@ -9,6 +9,9 @@ import pandas as pd
 import shutil
 from datetime import datetime
 
+from hub_corrections import apply_corrections
+from hub_standardization import standardized_name_series
+
 # ============================================================================
 # KONFIGURACIJA
 # ============================================================================
@@ -68,34 +71,22 @@ print()
 
 print("KORAK 3: Primjena Ad Format popravaka...")
 
-# Pripremi lookup dictionary iz df_format_fix
-# Ključ: Campaign (originalno ime kampanje)
-# Vrijednost: Campaign Type (ispravan format)
-format_fix_dict = {}
-
-for idx, row in df_format_fix.iterrows():
-    campaign_name = row['Campaign']
-    correct_format = row['Campaign Type']
-    format_fix_dict[campaign_name] = correct_format
-
-print(f"   Pripremljen dictionary s {len(format_fix_dict)} popravaka")
-
-# Primijeni popravke na glavnu bazu
-fixed_count = 0
-for idx, row in df_main.iterrows():
-    campaign_name = row['Campaign']
+# Jedan keyed map: Campaign (originalno ime kampanje) -> Campaign Type (ispravan format)
+format_report = apply_corrections(df_main, df_format_fix, key='Campaign', value='Campaign Type', target='Ad_Format')
+fixed_count = format_report.matched_rows
 
-    if campaign_name in format_fix_dict:
-        # Zamijeni Ad_Format s ispravnom vrijednošću
-        correct_format = format_fix_dict[campaign_name]
-        df_main.at[idx, 'Ad_Format'] = correct_format
-        fixed_count += 1
+print(f"   Pripremljen dictionary s {format_report.table_keys} popravaka")
 
 print(f"   OK - Popravljeno: {fixed_count} kampanja (ocekivano: 131)")
 
 if fixed_count != 131:
     print(f"   UPOZORENJE: Ocekivali smo 131 popravaka, ali smo primijenili {fixed_count}")
 
+if format_report.unmatched_keys:
+    print(f"   UPOZORENJE: {len(format_report.unmatched_keys)} kampanja iz {AD_FORMAT_FIX_PATH} nije pronadeno u bazi:")
+    for campaign_name in format_report.unmatched_keys[:10]:
+        print(f"      - {campaign_name}")
+
 print()
 
 # ============================================================================
@@ -154,32 +145,8 @@ print()
 
 print("KORAK 6: Rebuild Standardized_Campaign_Name s novim vrijednostima...")
 
-def rebuild_campaign_name(row):
-    """Rebuild standardized name with corrected values."""
-    parts = []
-
-    if pd.notna(row.get('Brand')):
-        parts.append(str(row['Brand']))
-
-    if pd.notna(row.get('Ad_Format')):
-        parts.append(str(row['Ad_Format']))
-
-    if pd.notna(row.get('Target')):
-        parts.append(str(row['Target']))
-
-    if pd.notna(row.get('Date_Range')):
-        parts.append(str(row['Date_Range']))
-
-    if pd.notna(row.get('Bid_Strategy_Short')):
-        parts.append(str(row['Bid_Strategy_Short']))
-
-    if pd.notna(row.get('Goal')):
-        parts.append(str(row['Goal']))
-
-    return " | ".join(parts)
-
 # Rebuild svih imena
-df_main['Standardized_Campaign_Name'] = df_main.apply(rebuild_campaign_name, axis=1)
+df_main['Standardized_Campaign_Name'] = standardized_name_series(df_main, target_column='Target')
 
 print(f"   OK - Rebuildan standardizirani naziv za sve kampanje")
 
@@ -8,19 +8,12 @@ Identifikacija i uklanjanje worldwide gresaka i multi-market anomalija
 import pandas as pd
 import numpy as np
 
+from hub_data import LOCATION_COLUMNS, load_location_data
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_cost(value):
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
 def safe_print(text):
     """Safely print text with encoding handling."""
     try:
@@ -50,8 +43,7 @@ print("=" * 120)
 print("STEP 1: UCITAVANJE COUNTRY FILE")
 print("=" * 120)
 
-df_country = pd.read_csv(PATH_COUNTRY, delimiter=';', encoding='utf-8-sig')
-df_country['Cost_parsed'] = df_country['Cost'].apply(parse_cost)
+df_country = load_location_data(PATH_COUNTRY, columns=LOCATION_COLUMNS + ['Campaign', 'Account name'])
 
 print(f"\nCountry file: {PATH_COUNTRY}")
 print(f"Ukupno redaka: {len(df_country):,}")
@@ -9,20 +9,13 @@ import pandas as pd
 import numpy as np
 from collections import defaultdict
 
+from hub_parsing import parse_cost_series
+from hub_data import load_demographics_data, load_location_data
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_cost(value):
-    """Parsiraj Cost vrijednost."""
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
 def safe_print(text):
     """Safely print text with encoding handling."""
     try:
@@ -63,7 +56,7 @@ print("STEP 1: FINANCIAL ANCHOR CHECK")
 print("=" * 120)
 
 df_anchor = pd.read_csv(PATH_ANCHOR, delimiter=';', encoding='utf-8-sig')
-df_anchor['Cost_parsed'] = df_anchor['Cost'].apply(parse_cost)
+df_anchor['Cost_parsed'] = parse_cost_series(df_anchor['Cost'])
 
 grand_total = df_anchor['Cost_parsed'].sum()
 expected_total = 2354918.67
@@ -90,8 +83,7 @@ print("\n" + "=" * 120)
 print("STEP 2A: COVERAGE & GAP CHECK - COUNTRY (Location)")
 print("=" * 120)
 
-df_country = pd.read_csv(PATH_COUNTRY, delimiter=';', encoding='utf-8-sig')
-df_country['Cost_parsed'] = df_country['Cost'].apply(parse_cost)
+df_country = load_location_data(PATH_COUNTRY)
 
 country_total = df_country['Cost_parsed'].sum()
 country_diff = abs(grand_total - country_total)
@@ -119,8 +111,7 @@ print("\n" + "=" * 120)
 print("STEP 2B: COVERAGE & GAP CHECK - AGE GENDER")
 print("=" * 120)
 
-df_age = pd.read_csv(PATH_AGE_GENDER, delimiter=';', encoding='utf-8-sig')
-df_age['Cost_parsed'] = df_age['Cost'].apply(parse_cost)
+df_age = load_demographics_data(PATH_AGE_GENDER, columns=['Campaign ID', 'Cost'])
 
 age_total = df_age['Cost_parsed'].sum()
 age_gap = grand_total - age_total
@@ -172,7 +163,7 @@ print("STEP 2C: COVERAGE & GAP CHECK - INTERESTS")
 print("=" * 120)
 
 df_interests = pd.read_csv(PATH_INTERESTS, delimiter=';', encoding='utf-8-sig')
-df_interests['Cost_parsed'] = df_interests['Cost'].apply(parse_cost)
+df_interests['Cost_parsed'] = parse_cost_series(df_interests['Cost'])
 
 interests_total = df_interests['Cost_parsed'].sum()
 interests_gap = grand_total - interests_total
@@ -8,28 +8,13 @@ Dinamicko filtriranje i analytics
 import pandas as pd
 import numpy as np
 
+from hub_parsing import parse_cost_series, parse_number_series
+from hub_data import load_demographics_data, load_location_data
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_cost(value):
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
-def parse_impressions(value):
-    if pd.isna(value):
-        return 0
-    value_str = str(value).strip().replace(',', '').strip()
-    try:
-        return int(float(value_str))
-    except:
-        return 0
-
 def safe_print(text):
     """Safely print text with encoding handling."""
     try:
@@ -50,11 +35,11 @@ class FilterEngine:
         self.df_country = df_country
 
         # Parse numeric columns
-        self.df_campaigns['Cost_parsed'] = self.df_campaigns['Cost'].apply(parse_cost)
-        self.df_campaigns['Impr_parsed'] = self.df_campaigns['Impr.'].apply(parse_impressions)
+        self.df_campaigns['Cost_parsed'] = parse_cost_series(self.df_campaigns['Cost'])
+        self.df_campaigns['Impr_parsed'] = parse_number_series(self.df_campaigns['Impr.'])
 
-        self.df_age_gender['Cost_parsed'] = self.df_age_gender['Cost'].apply(parse_cost)
-        self.df_country['Cost_parsed'] = self.df_country['Cost'].apply(parse_cost)
+        self.df_age_gender['Cost_parsed'] = parse_cost_series(self.df_age_gender['Cost'])
+        self.df_country['Cost_parsed'] = parse_cost_series(self.df_country['Cost'])
 
     def filter_by_format(self, df, format_keyword):
         """Filter by ad format."""
@@ -321,8 +306,8 @@ if __name__ == "__main__":
 
     # Load data
     df_campaigns = pd.read_csv(PATH_PROTOTYPE, delimiter=';', encoding='utf-8-sig')
-    df_age_gender = pd.read_csv(PATH_AGE_GENDER, delimiter=';', encoding='utf-8-sig')
-    df_country = pd.read_csv(PATH_COUNTRY, delimiter=';', encoding='utf-8-sig')
+    df_age_gender = load_demographics_data(PATH_AGE_GENDER)
+    df_country = load_location_data(PATH_COUNTRY)
 
     print(f"Campaigns loaded:   {len(df_campaigns):,}")
     print(f"Age-Gender data:    {len(df_age_gender):,} rows")
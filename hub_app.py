@@ -8,9 +8,16 @@ PRODUCTION VERSION with Clean Master Data & Sortable Columns
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
+
+import hub_cache
+import hub_curves
+import hub_data
+import hub_datasets
+import hub_fitting
+import hub_timing
+from hub_data import category_options
+from hub_filters import FilterPipeline
 
 # ============================================================================
 # PAGE CONFIG
@@ -237,323 +244,37 @@ st.markdown("""
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_cost(value):
-    """Parse cost values."""
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
-def parse_number(value):
-    """Parse numeric values."""
-    if pd.isna(value):
-        return 0
-    value_str = str(value).strip().replace(',', '').strip()
-    try:
-        return int(float(value_str))
-    except:
-        return 0
-
-def parse_float(value):
-    """Parse float values."""
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace(',', '').replace('%', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
-@st.cache_data
-def load_campaign_data(file_path):
-    """Load and parse the campaign data."""
-    df = pd.read_csv(file_path, delimiter=';', encoding='utf-8-sig')
-
-    # Parse numeric columns
-    df['Cost_parsed'] = df['Cost'].apply(parse_cost)
-    df['Impr_parsed'] = df['Impr.'].apply(parse_number)
-    df['Reach_parsed'] = df['Peak_Reach'].apply(parse_number)
-
-    # Parse additional metrics if they exist
-    if 'Clicks' in df.columns:
-        df['Clicks_parsed'] = df['Clicks'].apply(parse_number)
-    else:
-        df['Clicks_parsed'] = 0
-
-    if 'CTR' in df.columns:
-        df['CTR_parsed'] = df['CTR'].apply(parse_float)
-    else:
-        df['CTR_parsed'] = 0.0
-
-    if 'Avg. CPC' in df.columns:
-        df['Avg_CPC_parsed'] = df['Avg. CPC'].apply(parse_cost)
-    else:
-        df['Avg_CPC_parsed'] = 0.0
-
-    if 'Avg. CPM' in df.columns:
-        df['Avg_CPM_parsed'] = df['Avg. CPM'].apply(parse_cost)
-    else:
-        df['Avg_CPM_parsed'] = 0.0
-
-    if 'TrueView views' in df.columns:
-        df['TrueView_views_parsed'] = df['TrueView views'].apply(parse_number)
-    else:
-        df['TrueView_views_parsed'] = 0
+@st.cache_resource
+def load_shared_datasets(campaign_path, demographics_path, threshold):
+    """Campaigns, demographics and filter index - one read-only copy shared by every session."""
+    return hub_datasets.load_shared_datasets(campaign_path, demographics_path, threshold)
 
-    if 'TrueView avg. CPV' in df.columns:
-        df['TrueView_CPV_parsed'] = df['TrueView avg. CPV'].apply(parse_cost)
-    else:
-        df['TrueView_CPV_parsed'] = 0.0
+@st.cache_resource(max_entries=1)
+def load_reach_curve_model(rolling_path, source_version):
+    """Fitted reach curves for one version (size, mtime) of the rolling file."""
+    return hub_curves.load_reach_curves(rolling_path)
 
-    if 'Conversions' in df.columns:
-        df['Conversions_parsed'] = df['Conversions'].apply(parse_float)
-    else:
-        df['Conversions_parsed'] = 0.0
-
-    if 'Conv. rate' in df.columns:
-        df['Conv_rate_parsed'] = df['Conv. rate'].apply(parse_float)
-    else:
-        df['Conv_rate_parsed'] = 0.0
-
-    if 'Cost / conv.' in df.columns:
-        df['Cost_per_conv_parsed'] = df['Cost / conv.'].apply(parse_cost)
-    else:
-        df['Cost_per_conv_parsed'] = 0.0
-
-    # Calculate CPM
-    df['CPM'] = np.where(df['Impr_parsed'] > 0, (df['Cost_parsed'] / df['Impr_parsed']) * 1000, 0)
-
-    # Extract Quarter from Date_Range
-    def extract_quarter(date_range):
-        if pd.isna(date_range):
-            return 'Unknown'
-        date_str = str(date_range).lower()
-
-        if any(month in date_str for month in ['jan', 'feb', 'mar']):
-            if '25' in date_str:
-                return 'Q1 2025'
-        if any(month in date_str for month in ['apr', 'may', 'jun']):
-            if '25' in date_str:
-                return 'Q2 2025'
-        if any(month in date_str for month in ['jul', 'aug', 'sep']):
-            if '25' in date_str:
-                return 'Q3 2025'
-        if any(month in date_str for month in ['oct', 'nov', 'dec']):
-            if '25' in date_str:
-                return 'Q4 2025'
-
-        return 'Unknown'
-
-    df['Quarter'] = df['Date_Range'].apply(extract_quarter)
-
-    return df
-
-@st.cache_data
-def load_demographics_data(file_path):
-    """Load demographics (age-gender) data."""
-    try:
-        df = pd.read_csv(file_path, delimiter=';', encoding='utf-8-sig')
-        df['Cost_parsed'] = df['Cost'].apply(parse_cost)
-        return df
-    except:
-        return pd.DataFrame()
-
-def parse_age_range(age_str):
+def load_reach_curves(rolling_path):
     """
-    Parse age range string to get min and max age.
-    Examples:
-    - '18-24' -> (18, 24)
-    - '25 - 34' -> (25, 34)  [handles spaces]
-    - '65+' -> (65, 100)
-    - 'Unknown' -> (0, 0)
+    Fitted reach curves, refitted when the rolling file changes (the cache is
+    keyed on its size + mtime). Missing rolling file -> None.
     """
-    age_str = str(age_str).strip()
-
-    if age_str in ['Unknown', '', 'N/A']:
-        return (0, 0)
-
-    # Remove all spaces for easier parsing
-    age_str_clean = age_str.replace(' ', '')
-
-    if '-' in age_str_clean:
-        # Format: "18-24" or "25-34" or "25 - 34"
-        parts = age_str_clean.split('-')
-        try:
-            age_min = int(parts[0])
-            age_max_str = parts[1].replace('+', '')
-            age_max = int(age_max_str) if age_max_str else 100
-        except:
-            return (0, 0)
-    elif '+' in age_str_clean:
-        # Format: "65+" or "65 +"
-        try:
-            age_min = int(age_str_clean.replace('+', ''))
-            age_max = 100
-        except:
-            return (0, 0)
-    else:
-        # Single number or unknown
-        try:
-            age_min = age_max = int(age_str_clean)
-        except:
-            return (0, 0)
-
-    return (age_min, age_max)
-
-def get_full_range_demographics(campaign_id, df_demographics, threshold=0.10):
-    """
-    Get FULL RANGE demographics with THRESHOLD FILTERING.
-
-    CRITICAL CHANGE: Only includes age/gender segments that account for at least
-    10% of total campaign spend. This eliminates noise from optimized targeting
-    and accidental impressions.
-
-    Examples:
-    - Campaign with 95% spend in 25-34 → Returns "25-34" (NOT "18-65+")
-    - Campaign with 40% in 18-24, 45% in 25-34 → Returns "18-34"
-    - Campaign with 5% in each age → Returns dominant segment only
-
-    This ensures accurate targeting representation and meaningful filter options.
-    """
-    if df_demographics is None or len(df_demographics) == 0:
-        return ("Unknown", "Unknown")
-
-    # Filter for this campaign
-    demo_data = df_demographics[df_demographics['Campaign ID'] == campaign_id]
-
-    if len(demo_data) == 0:
-        return ("Unknown", "Unknown")
-
-    # Calculate total spend for this campaign
-    total_spend = demo_data['Cost_parsed'].sum()
-
-    if total_spend == 0:
-        return ("Unknown", "Unknown")
-
-    # Group by Age and calculate spend per segment
-    age_spend = demo_data.groupby('Age')['Cost_parsed'].sum()
-
-    # Filter ages by threshold (10% minimum) AND exclude Unknown
-    significant_ages = []
-    for age, spend in age_spend.items():
-        age_str = str(age).strip()
-
-        # CRITICAL: Skip Unknown and invalid values
-        if age_str in ['Unknown', 'nan', '', 'N/A']:
-            continue
-
-        percentage = spend / total_spend
-
-        # Only include if meets 10% threshold
-        if percentage >= threshold:
-            significant_ages.append((age_str, spend, percentage))
-
-    # If no significant ages meet threshold, fall back to dominant segment
-    if len(significant_ages) == 0:
-        valid_ages = {age: spend for age, spend in age_spend.items()
-                      if str(age).strip() not in ['Unknown', 'nan', '', 'N/A']}
-
-        if len(valid_ages) > 0:
-            dominant_age = max(valid_ages, key=valid_ages.get)
-            dominant_spend = valid_ages[dominant_age]
-            significant_ages = [(str(dominant_age), dominant_spend, dominant_spend / total_spend)]
-        else:
-            return ("Unknown", "Unknown")
-
-    # Sort by percentage descending
-    significant_ages.sort(key=lambda x: x[2], reverse=True)
-
-    # CRITICAL: If only ONE significant age segment, return it AS IS (don't create range)
-    if len(significant_ages) == 1:
-        age_range = significant_ages[0][0]
-    else:
-        # Multiple significant segments - create range from min to max
-        age_strings = [a[0] for a in significant_ages]
-
-        # Parse all significant ages to find min/max
-        age_min = 999
-        age_max = 0
-
-        for age_str in age_strings:
-            min_age, max_age = parse_age_range(age_str)
-            if min_age > 0:
-                if min_age < age_min:
-                    age_min = min_age
-                # Don't let 65+ (100) inflate the max
-                if max_age < 100 and max_age > age_max:
-                    age_max = max_age
-                elif max_age >= 100:  # This is 65+
-                    age_max = 65
-
-        # Construct range
-        if age_min == 999 or age_max == 0:
-            age_range = significant_ages[0][0]  # Fallback to dominant
-        elif age_min == age_max:
-            age_range = str(age_min)
-        elif age_max >= 65:
-            age_range = f"{age_min}-65+"
-        else:
-            age_range = f"{age_min}-{age_max}"
-
-    # Gender logic with threshold
-    gender_spend = demo_data.groupby('Gender')['Cost_parsed'].sum()
-
-    significant_genders = []
-    for gender, spend in gender_spend.items():
-        gender_str = str(gender).strip()
-
-        # CRITICAL: Skip Unknown
-        if gender_str in ['Unknown', 'nan', '', 'N/A']:
-            continue
-
-        percentage = spend / total_spend
-
-        if percentage >= threshold:
-            significant_genders.append(gender_str)
-
-    # If no significant genders, fall back to dominant
-    if len(significant_genders) == 0:
-        valid_genders = {gender: spend for gender, spend in gender_spend.items()
-                        if str(gender).strip() not in ['Unknown', 'nan', '', 'N/A']}
-
-        if len(valid_genders) > 0:
-            dominant_gender = max(valid_genders, key=valid_genders.get)
-            significant_genders = [str(dominant_gender)]
-        else:
-            gender = 'Unknown'
-            return (age_range, gender)
-
-    # Map gender codes
-    gender_map = {
-        'F': 'Female',
-        'M': 'Male',
-        'Female': 'Female',
-        'Male': 'Male',
-    }
-
-    genders_normalized = [gender_map.get(g, g) for g in significant_genders]
-
-    if len(genders_normalized) > 1:
-        gender = 'All'
-    else:
-        gender = genders_normalized[0]
-
-    # CRITICAL: Check if campaign has ANY spend in Unknown category
-    # If yes, add '+ UNK' suffix to indicate "grey zone" users
-    unknown_spend = 0
-    for age, spend in age_spend.items():
-        age_str = str(age).strip()
-        if age_str in ['Unknown', 'nan', '', 'N/A', 'Undetermined']:
-            unknown_spend += spend
-
-    # Add + UNK suffix if there's at least 0.01 EUR in Unknown
-    if unknown_spend >= 0.01:
-        age_range = age_range + ' + UNK'
-
-    return (age_range, gender)
+    source = hub_cache.source_fingerprint(rolling_path, with_hash=False)
+    if source is None:
+        return None
+    return load_reach_curve_model(rolling_path, (source['size'], source['mtime_ns']))
+
+@st.cache_resource(max_entries=1)
+def load_segment_curve_model(curve_path, source_version):
+    """Campaign segment curves (hub_fitting) for one version (size, mtime) of the table."""
+    return hub_fitting.load_segment_curves(curve_path)
+
+def load_segment_curves(curve_path):
+    """Campaign segment curves, reloaded when the table is rewritten. Not fitted yet -> None."""
+    source = hub_cache.source_fingerprint(curve_path, with_hash=False)
+    if source is None:
+        return None
+    return load_segment_curve_model(curve_path, (source['size'], source['mtime_ns']))
 
 def calculate_weighted_cpm(df):
     """Calculate weighted average CPM."""
@@ -565,6 +286,10 @@ def calculate_weighted_cpm(df):
     else:
         return 0.0
 
+def calculate_totals(df):
+    """Footer KPI totals: (total cost, total impressions, weighted CPM)."""
+    return (df['Cost_parsed'].sum(), df['Impr_parsed'].sum(), calculate_weighted_cpm(df))
+
 def get_targeting_level(df_filtered):
     """
     Determine targeting level based on 80% MAJORITY RULE.
@@ -600,106 +325,28 @@ def get_targeting_level(df_filtered):
     else:
         return ('🌍 NATIONAL TARGETING', 'Croatia', '#28a745')  # Green - default
 
-def rebuild_campaign_name(row):
-    """Rebuild standardized name with correct demographics and brand."""
-    parts = []
-
-    if pd.notna(row.get('Brand')):
-        parts.append(str(row['Brand']))
-
-    if pd.notna(row.get('Ad_Format')):
-        parts.append(str(row['Ad_Format']))
-
-    # Use corrected demographics
-    if 'Target_Corrected' in row:
-        parts.append(row['Target_Corrected'])
-    elif pd.notna(row.get('Target')):
-        parts.append(str(row['Target']))
-
-    if pd.notna(row.get('Date_Range')):
-        parts.append(str(row['Date_Range']))
-
-    if pd.notna(row.get('Bid_Strategy_Short')):
-        parts.append(str(row['Bid_Strategy_Short']))
-
-    if pd.notna(row.get('Goal')):
-        parts.append(str(row['Goal']))
-
-    return " | ".join(parts)
-
 # ============================================================================
 # LOAD DATA
 # ============================================================================
 
 CAMPAIGN_PATH = "MASTER_ADS_HR_CLEANED.csv"
 DEMOGRAPHICS_PATH = "data - v3/age - gender - v3/campaign age - gender - version 3.csv"
+ROLLING_REACH_PATH = "MASTER_ROLLING_DATA_2025_CLEAN.csv"
+DEMOGRAPHICS_THRESHOLD = hub_data.DEMOGRAPHICS_THRESHOLD
 
-try:
-    df_campaigns = load_campaign_data(CAMPAIGN_PATH)
-    df_demographics = load_demographics_data(DEMOGRAPHICS_PATH)
-
-    # SAFETY CLEANUP: Remove campaigns with Unknown quarter
-    unknown_quarter_count = len(df_campaigns[df_campaigns['Quarter'] == 'Unknown'])
-    if unknown_quarter_count > 0:
-        df_campaigns = df_campaigns[df_campaigns['Quarter'] != 'Unknown']
-
-    # Calculate FULL RANGE demographics with THRESHOLD filtering
-    demographics_results = df_campaigns['Campaign ID'].apply(
-        lambda cid: get_full_range_demographics(cid, df_demographics)
-    )
+# Per-rerun stage timings (diagnostics expander + rotating log, see hub_timing)
+rerun_timer = hub_timing.start_rerun('hub_app')
 
-    df_campaigns['Age_Range'] = demographics_results.apply(lambda x: x[0])
-    df_campaigns['Gender'] = demographics_results.apply(lambda x: x[1])
-
-    # Update Target column with corrected demographics
-    df_campaigns['Target_Corrected'] = df_campaigns['Age_Range'] + " | " + df_campaigns['Gender']
-
-    # Rebuild Standardized_Campaign_Name with corrected demographics
-    df_campaigns['Standardized_Campaign_Name_Corrected'] = df_campaigns.apply(rebuild_campaign_name, axis=1)
-
-    # Aggregate by Campaign ID to ensure one campaign = one row
-    duplicate_count = df_campaigns['Campaign ID'].duplicated().sum()
-
-    if duplicate_count > 0:
-        # Define aggregation rules
-        agg_rules = {
-            'Campaign': 'first',
-            'Brand': 'first',
-            'Ad_Format': 'first',
-            'Date_Range': 'first',
-            'Bid_Strategy_Short': 'first',
-            'Goal': 'first',
-            'Cost': 'first',
-            'Impr.': 'first',
-            'Peak_Reach': 'first',
-            'Cost_parsed': 'sum',
-            'Impr_parsed': 'sum',
-            'Reach_parsed': 'max',
-            'Clicks_parsed': 'sum',
-            'CTR_parsed': 'mean',
-            'Avg_CPC_parsed': 'mean',
-            'Avg_CPM_parsed': 'mean',
-            'TrueView_views_parsed': 'sum',
-            'TrueView_CPV_parsed': 'mean',
-            'Conversions_parsed': 'sum',
-            'Conv_rate_parsed': 'mean',
-            'Cost_per_conv_parsed': 'mean',
-            'CPM': 'mean',
-            'Quarter': 'first',
-            'Age_Range': 'first',
-            'Gender': 'first',
-            'Target_Corrected': 'first',
-            'Standardized_Campaign_Name_Corrected': 'first'
-        }
-
-        # Add Account column if it exists
-        if 'Account' in df_campaigns.columns:
-            agg_rules['Account'] = 'first'
-        elif 'Account name' in df_campaigns.columns:
-            agg_rules['Account name'] = 'first'
-
-        # Aggregate by Campaign ID
-        df_campaigns = df_campaigns.groupby('Campaign ID', as_index=False).agg(agg_rules)
+try:
+    # Parsed, demographics-resolved, aggregated frame (see hub_data.prepare_campaigns),
+    # the age-gender rows and the bitmap filter index. Shared by ALL sessions and
+    # frozen (see hub_datasets) - never modify df_campaigns / df_demographics in place.
+    with rerun_timer.stage('cache:datasets'):
+        shared_datasets = load_shared_datasets(CAMPAIGN_PATH, DEMOGRAPHICS_PATH, DEMOGRAPHICS_THRESHOLD)
+    filter_index = shared_datasets.filter_index
+    df_campaigns = shared_datasets.campaigns
+    df_demographics = shared_datasets.demographics
+    spend_cube = shared_datasets.spend_cube
 
     data_loaded = True
 
@@ -720,6 +367,11 @@ if data_loaded:
     if 'reset_key' not in st.session_state:
         st.session_state.reset_key = 0
 
+    # Memoized filter pipeline (per session, rebuilt when the dataset changes)
+    if st.session_state.get('filter_pipeline') is None or st.session_state.filter_pipeline.index is not filter_index:
+        st.session_state.filter_pipeline = FilterPipeline(filter_index, totals_function=calculate_totals)
+    filter_pipeline = st.session_state.filter_pipeline
+
     # ========================================================================
     # LEFT SIDEBAR - FILTERS
     # ========================================================================
@@ -798,6 +450,43 @@ if data_loaded:
     else:
         st.sidebar.caption(f"📊 Raspon: €{selected_budget_range[0]:,.0f} - €{selected_budget_range[1]:,.0f}")
 
+    # Reach forecast for the target budget (fitted reach curves, see hub_curves.py)
+    reach_curves = load_reach_curves(ROLLING_REACH_PATH) if target_budget > 0 else None
+
+    if target_budget > 0 and reach_curves is None:
+        st.sidebar.caption(f"📈 Procjena reacha nije dostupna - nema datoteke {ROLLING_REACH_PATH}")
+    elif reach_curves is not None and len(reach_curves.parameters) > 0:
+        with st.sidebar.expander("📈 Procjena Reacha", expanded=True):
+            curve_brand = st.selectbox(
+                "Brand:",
+                options=reach_curves.segment_options('Brand'),
+                key=f"curve_brand_{st.session_state.reset_key}"
+            )
+            curve_type = st.selectbox(
+                "Format:",
+                options=reach_curves.segment_options('Type', Brand=curve_brand),
+                key=f"curve_type_{st.session_state.reset_key}"
+            )
+            curve_target = st.selectbox(
+                "Target:",
+                options=reach_curves.segment_options('Target', Brand=curve_brand, Type=curve_type),
+                key=f"curve_target_{st.session_state.reset_key}"
+            )
+
+            curve = reach_curves.curve(curve_brand, curve_type, curve_target)
+            if curve is not None:
+                estimated_reach = reach_curves.forecast(target_budget, curve_brand, curve_type, curve_target)
+                st.metric(f"Procijenjeni reach za €{target_budget:,.0f} u 90 dana", f"{estimated_reach:,.0f}")
+                st.caption(
+                    f"Krivulja zasićenja: max reach {curve.R_Max:,.0f} | "
+                    f"{curve.Points} prozora (90 dana) | R² {curve.R2:.2f}"
+                )
+                st.caption("Krivulje su fitane na trošku po 90-dnevnom prozoru - budžet se tumači kao trošak potrošen unutar 90 dana.")
+                if target_budget > curve.Cost_Max:
+                    st.caption(f"⚠️ Budžet je iznad povijesnog maksimuma po prozoru (€{curve.Cost_Max:,.0f}) - ekstrapolacija")
+            else:
+                st.caption("Nema dovoljno podataka za procjenu.")
+
     st.sidebar.divider()
 
     # ========================================================================
@@ -805,7 +494,7 @@ if data_loaded:
     # ========================================================================
 
     # Brand filter
-    brands = ['Svi'] + sorted(df_campaigns['Brand'].dropna().unique().tolist())
+    brands = ['Svi'] + category_options(df_campaigns['Brand'])
     selected_brands = st.sidebar.multiselect(
         "Brand:",
         options=brands,
@@ -814,7 +503,7 @@ if data_loaded:
     )
 
     # Ad Format filter
-    ad_formats = ['Svi'] + sorted(df_campaigns['Ad_Format'].dropna().unique().tolist())
+    ad_formats = ['Svi'] + category_options(df_campaigns['Ad_Format'])
     selected_formats = st.sidebar.multiselect(
         "Ad Format:",
         options=ad_formats,
@@ -823,7 +512,7 @@ if data_loaded:
     )
 
     # Age Range filter (using corrected demographics)
-    age_ranges = ['Svi'] + sorted([x for x in df_campaigns['Age_Range'].dropna().unique().tolist() if x != 'Unknown'])
+    age_ranges = ['Svi'] + category_options(df_campaigns['Age_Range'], exclude=['Unknown'])
     selected_ages = st.sidebar.multiselect(
         "Age Group:",
         options=age_ranges,
@@ -833,7 +522,7 @@ if data_loaded:
     )
 
     # Gender filter (using corrected demographics)
-    genders = ['Svi'] + sorted([x for x in df_campaigns['Gender'].dropna().unique().tolist() if x != 'Unknown'])
+    genders = ['Svi'] + category_options(df_campaigns['Gender'], exclude=['Unknown'])
     selected_genders = st.sidebar.multiselect(
         "Gender:",
         options=genders,
@@ -843,7 +532,7 @@ if data_loaded:
     )
 
     # Bid Strategy filter
-    bid_strategies = ['Svi'] + sorted(df_campaigns['Bid_Strategy_Short'].dropna().unique().tolist())
+    bid_strategies = ['Svi'] + category_options(df_campaigns['Bid_Strategy_Short'])
     selected_bid_strategies = st.sidebar.multiselect(
         "Bid Strategy:",
         options=bid_strategies,
@@ -852,7 +541,7 @@ if data_loaded:
     )
 
     # Quarter filter
-    quarters = ['Svi'] + sorted(df_campaigns['Quarter'].dropna().unique().tolist())
+    quarters = ['Svi'] + category_options(df_campaigns['Quarter'])
     selected_quarters = st.sidebar.multiselect(
         "Quarter:",
         options=quarters,
@@ -860,6 +549,25 @@ if data_loaded:
         key=f"quarters_{st.session_state.reset_key}"
     )
 
+    # Flight date filter (Range_Start..Range_End overlaps the chosen period)
+    first_day, last_day = df_campaigns['Range_Start'].min(), df_campaigns['Range_End'].max()
+    date_range = None
+    if pd.notna(first_day) and pd.notna(last_day):
+        full_period = (first_day.date(), last_day.date())
+        selected_period = st.sidebar.date_input(
+            "Period kampanje:",
+            value=full_period,
+            min_value=full_period[0],
+            max_value=full_period[1],
+            format="DD.MM.YYYY",
+            help="Prikazuje kampanje čiji se period prikazivanja preklapa s odabranim datumima.",
+            key=f"period_{st.session_state.reset_key}"
+        )
+        # Only a complete, narrowed range filters - the full period keeps
+        # campaigns without a parsed Date_Range as well
+        if len(selected_period) == 2 and tuple(selected_period) != full_period:
+            date_range = (selected_period[0], selected_period[1])
+
     st.sidebar.markdown("---")
 
     # ========================================================================
@@ -934,58 +642,33 @@ if data_loaded:
     # APPLY FILTERS
     # ========================================================================
 
-    df_filtered = df_campaigns.copy()
-
-    # ========================================================================
-    # PRIORITY: SEARCH FILTER (Applied FIRST - has priority over other filters)
-    # ========================================================================
-
-    if search_query and search_query.strip():
-        # Case-insensitive search on ORIGINAL campaign names
-        search_lower = search_query.strip().lower()
-        df_filtered = df_filtered[
-            df_filtered['Campaign'].str.lower().str.contains(search_lower, na=False)
-        ]
-
-    # Apply Brand filter
-    if 'Svi' not in selected_brands and len(selected_brands) > 0:
-        df_filtered = df_filtered[df_filtered['Brand'].isin(selected_brands)]
-
-    # Apply Budget filter (DUALNI - Target Budget ili Slider)
+    # Budget range (DUALNI - Target Budget ili Slider)
     if target_budget > 0:
         # BENCHMARK MODE: Use target budget with ± 10% range
-        lower_bound = target_budget * 0.9
-        upper_bound = target_budget * 1.1
-        df_filtered = df_filtered[
-            (df_filtered['Cost_parsed'] >= lower_bound) &
-            (df_filtered['Cost_parsed'] <= upper_bound)
-        ]
+        budget_range = (target_budget * 0.9, target_budget * 1.1)
     else:
         # STANDARD MODE: Use slider range
-        df_filtered = df_filtered[
-            (df_filtered['Cost_parsed'] >= selected_budget_range[0]) &
-            (df_filtered['Cost_parsed'] <= selected_budget_range[1])
-        ]
-
-    # Apply Ad Format filter
-    if 'Svi' not in selected_formats and len(selected_formats) > 0:
-        df_filtered = df_filtered[df_filtered['Ad_Format'].isin(selected_formats)]
-
-    # Apply Age Range filter
-    if 'Svi' not in selected_ages and len(selected_ages) > 0:
-        df_filtered = df_filtered[df_filtered['Age_Range'].isin(selected_ages)]
-
-    # Apply Gender filter
-    if 'Svi' not in selected_genders and len(selected_genders) > 0:
-        df_filtered = df_filtered[df_filtered['Gender'].isin(selected_genders)]
-
-    # Apply Bid Strategy filter
-    if 'Svi' not in selected_bid_strategies and len(selected_bid_strategies) > 0:
-        df_filtered = df_filtered[df_filtered['Bid_Strategy_Short'].isin(selected_bid_strategies)]
+        budget_range = (selected_budget_range[0], selected_budget_range[1])
+
+    # All filters are combined as bitmaps (search has priority - it is just
+    # one more AND term), only the final selection becomes a DataFrame.
+    # Stages whose inputs did not change since the last rerun are reused.
+    with rerun_timer.stage('filters'):
+        selected_rows = filter_pipeline.run(
+            search_query=search_query,
+            budget_range=budget_range,
+            date_range=date_range,
+            selections={
+                'Brand': selected_brands,
+                'Ad_Format': selected_formats,
+                'Age_Range': selected_ages,
+                'Gender': selected_genders,
+                'Bid_Strategy_Short': selected_bid_strategies,
+                'Quarter': selected_quarters,
+            }
+        )
 
-    # Apply Quarter filter
-    if 'Svi' not in selected_quarters and len(selected_quarters) > 0:
-        df_filtered = df_filtered[df_filtered['Quarter'].isin(selected_quarters)]
+        df_filtered = filter_pipeline.frame()
 
     # ========================================================================
     # MAIN CONTENT - CENTER
@@ -1116,6 +799,19 @@ if data_loaded:
                     help="Maximum reach achieved"
                 )
 
+            # Reach curve of the campaign's segment (total campaign cost -> peak reach)
+            segment_curves = load_segment_curves(hub_fitting.SEGMENT_CURVE_PATH)
+            segment = [str(campaign_row[column]) for column in hub_fitting.SEGMENT_COLUMNS]
+            segment_curve = segment_curves.curve(*segment) if segment_curves is not None else None
+            # Formats without reach data (PMax, Search) fit a flat zero curve - nothing to show
+            if segment_curve is not None and segment_curve.R_Max > 0:
+                curve_budget = target_budget if target_budget > 0 else campaign_row['Cost_parsed']
+                st.caption(
+                    f"📈 Krivulja segmenta ({' × '.join(segment)}): procijenjeni reach za "
+                    f"€{curve_budget:,.0f} je {segment_curves.forecast(curve_budget, *segment):,.0f} | "
+                    f"{segment_curve.Points} kampanja | R² {segment_curve.R2:.2f}"
+                )
+
             st.markdown("---")
 
         # ====================================================================
@@ -1149,12 +845,13 @@ if data_loaded:
                     display_column_names.append(metric_name)
 
         # Create display dataframe
-        df_display = df_filtered[display_columns].copy()
-        df_display.columns = display_column_names
+        with rerun_timer.stage('display_frame'):
+            df_display = df_filtered[display_columns].copy()
+            df_display.columns = display_column_names
 
-        # Sort by Cost by default
-        if 'Cost (EUR)' in display_column_names:
-            df_display = df_display.sort_values('Cost (EUR)', ascending=False)
+            # Sort by Cost by default
+            if 'Cost (EUR)' in display_column_names:
+                df_display = df_display.sort_values('Cost (EUR)', ascending=False)
 
         # Configure column formatting for proper sortable display
         column_config = {}
@@ -1186,13 +883,14 @@ if data_loaded:
                 )
 
         # Display table with sortable columns
-        st.dataframe(
-            df_display,
-            use_container_width=True,
-            height=500,
-            hide_index=True,
-            column_config=column_config
-        )
+        with rerun_timer.stage('render:campaign_table'):
+            st.dataframe(
+                df_display,
+                use_container_width=True,
+                height=500,
+                hide_index=True,
+                column_config=column_config
+            )
 
         # ====================================================================
         # RIGHT SIDEBAR - INSIGHTS
@@ -1205,7 +903,10 @@ if data_loaded:
             st.markdown("### 👥 Distribucija po Dobnim Skupinama")
             st.caption("💡 Prikazuje trošak po značajnim rasponima (≥10% threshold). Kampanja s 95% troška u 25-34 prikazuje se kao '25-34', ne '18-65+'.")
 
-            age_distribution = df_filtered.groupby('Age_Range')['Cost_parsed'].sum().sort_values(ascending=False)
+            age_distribution = filter_pipeline.derived(
+                'age_distribution',
+                lambda: spend_cube.label_distribution('Age_Range', selected_rows)
+            )
 
             if len(age_distribution) > 0:
                 df_age = pd.DataFrame({
@@ -1216,29 +917,30 @@ if data_loaded:
                 total_cost = df_age['Cost'].sum()
                 df_age['Percentage'] = (df_age['Cost'] / total_cost * 100).round(2)
 
-                # Create bar chart
-                fig_age = px.bar(
-                    df_age,
-                    x='Age Group',
-                    y='Percentage',
-                    title='',
-                    labels={'Percentage': '% Troška', 'Age Group': 'Dobna Skupina'},
-                    text='Percentage',
-                    color='Percentage',
-                    color_continuous_scale='Blues'
-                )
+                with rerun_timer.stage('chart:age_distribution'):
+                    # Create bar chart
+                    fig_age = px.bar(
+                        df_age,
+                        x='Age Group',
+                        y='Percentage',
+                        title='',
+                        labels={'Percentage': '% Troška', 'Age Group': 'Dobna Skupina'},
+                        text='Percentage',
+                        color='Percentage',
+                        color_continuous_scale='Blues'
+                    )
 
-                fig_age.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-                fig_age.update_layout(showlegend=False, height=400)
+                    fig_age.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+                    fig_age.update_layout(showlegend=False, height=400)
 
-                st.plotly_chart(fig_age, use_container_width=True)
+                    st.plotly_chart(fig_age, use_container_width=True)
 
-                # Show table
-                df_age_display = df_age.copy()
-                df_age_display['Cost'] = df_age_display['Cost'].apply(lambda x: f"€{x:,.2f}")
-                df_age_display['Percentage'] = df_age_display['Percentage'].apply(lambda x: f"{x:.2f}%")
+                    # Show table
+                    df_age_display = df_age.copy()
+                    df_age_display['Cost'] = df_age_display['Cost'].apply(lambda x: f"€{x:,.2f}")
+                    df_age_display['Percentage'] = df_age_display['Percentage'].apply(lambda x: f"{x:.2f}%")
 
-                st.dataframe(df_age_display, use_container_width=True, hide_index=True)
+                    st.dataframe(df_age_display, use_container_width=True, hide_index=True)
             else:
                 st.caption("Nema podataka o dobnim skupinama za odabrane filtre.")
 
@@ -1247,7 +949,9 @@ if data_loaded:
             st.markdown("### 📍 Lokacija")
 
             # Get targeting level dynamically
-            targeting_icon, targeting_level, border_color = get_targeting_level(df_filtered)
+            targeting_icon, targeting_level, border_color = filter_pipeline.derived(
+                'targeting_level', lambda: get_targeting_level(df_filtered)
+            )
 
             st.markdown(f"""
             <div style="
@@ -1267,12 +971,16 @@ if data_loaded:
             # Gender distribution
             st.markdown("### 👤 Distribucija po Spolu")
 
-            gender_distribution = df_filtered.groupby('Gender')['Cost_parsed'].sum().sort_values(ascending=False)
+            gender_distribution = filter_pipeline.derived(
+                'gender_distribution',
+                lambda: spend_cube.label_distribution('Gender', selected_rows)
+            )
 
             if len(gender_distribution) > 0:
-                for gender, cost in gender_distribution.items():
-                    pct = (cost / gender_distribution.sum() * 100)
-                    st.markdown(f"**{gender}:** €{cost:,.2f} ({pct:.1f}%)")
+                with rerun_timer.stage('chart:gender_distribution'):
+                    for gender, cost in gender_distribution.items():
+                        pct = (cost / gender_distribution.sum() * 100)
+                        st.markdown(f"**{gender}:** €{cost:,.2f} ({pct:.1f}%)")
 
             # ================================================================
             # NOISE ANALYSIS CHART (Shows ALL age segments, no threshold)
@@ -1282,15 +990,14 @@ if data_loaded:
             st.markdown("### 📊 Detaljna Raspodjela po Godinama")
             st.caption("💡 Prikazuje SVE age segmente uključujući 'noise' ispod 10% thresholda")
 
-            # Get Campaign IDs from filtered data
-            campaign_ids_filtered = df_filtered['Campaign ID'].tolist()
-
-            # Get demographics for these campaigns
-            demo_filtered = df_demographics[df_demographics['Campaign ID'].isin(campaign_ids_filtered)]
-
-            if len(demo_filtered) > 0:
-                # Group by Age and sum spend (NO THRESHOLD - show everything)
-                age_breakdown = demo_filtered.groupby('Age')['Cost_parsed'].sum().sort_values(ascending=False)
+            # Demographics spend of the filtered campaigns from the pre-aggregated
+            # campaign x Age x Gender cube (see hub_cube)
+            if spend_cube.has_demographics(selected_rows):
+                # Sum spend per Age (NO THRESHOLD - show everything)
+                age_breakdown = filter_pipeline.derived(
+                    'age_breakdown',
+                    lambda: spend_cube.segment_spend(selected_rows, 'Age')
+                )
 
                 # Remove completely empty segments
                 age_breakdown = age_breakdown[age_breakdown > 0]
@@ -1306,27 +1013,28 @@ if data_loaded:
                     total_cost_noise = df_age_noise['Cost'].sum()
                     df_age_noise['Percentage'] = (df_age_noise['Cost'] / total_cost_noise * 100).round(2)
 
-                    # Create bar chart
-                    fig_age_noise = px.bar(
-                        df_age_noise,
-                        x='Age',
-                        y='Cost',
-                        title='',
-                        labels={'Cost': 'Trošak (EUR)', 'Age': 'Dobna Skupina'},
-                        text='Percentage',
-                        color='Percentage',
-                        color_continuous_scale='Reds',
-                        hover_data={'Cost': ':,.2f', 'Percentage': ':.2f'}
-                    )
-
-                    fig_age_noise.update_traces(
-                        texttemplate='%{text:.1f}%',
-                        textposition='outside',
-                        textfont_size=10
-                    )
-                    fig_age_noise.update_layout(showlegend=False, height=350)
-
-                    st.plotly_chart(fig_age_noise, use_container_width=True)
+                    with rerun_timer.stage('chart:age_noise'):
+                        # Create bar chart
+                        fig_age_noise = px.bar(
+                            df_age_noise,
+                            x='Age',
+                            y='Cost',
+                            title='',
+                            labels={'Cost': 'Trošak (EUR)', 'Age': 'Dobna Skupina'},
+                            text='Percentage',
+                            color='Percentage',
+                            color_continuous_scale='Reds',
+                            hover_data={'Cost': ':,.2f', 'Percentage': ':.2f'}
+                        )
+
+                        fig_age_noise.update_traces(
+                            texttemplate='%{text:.1f}%',
+                            textposition='outside',
+                            textfont_size=10
+                        )
+                        fig_age_noise.update_layout(showlegend=False, height=350)
+
+                        st.plotly_chart(fig_age_noise, use_container_width=True)
                 else:
                     st.caption("Nema dostupnih podataka o dobnim segmentima.")
             else:
@@ -1338,10 +1046,8 @@ if data_loaded:
 
         st.markdown("## 💰 Ključne Metrike")
 
-        # Calculate metrics
-        total_cost = df_filtered['Cost_parsed'].sum()
-        total_impressions = df_filtered['Impr_parsed'].sum()
-        weighted_cpm = calculate_weighted_cpm(df_filtered)
+        # Calculate metrics (cached with the filter combination)
+        total_cost, total_impressions, weighted_cpm = filter_pipeline.totals()
 
         # Display in big metric cards
         metric_col1, metric_col2, metric_col3 = st.columns(3)
@@ -1410,5 +1116,43 @@ if data_loaded:
     </div>
     """.format(total=len(df_campaigns)), unsafe_allow_html=True)
 
+    # ========================================================================
+    # DIAGNOSTICS (collapsed - per-rerun stage timings, filter cache stats)
+    # ========================================================================
+
+    rerun_stats = {
+        'filter_stage_runs': filter_pipeline.stage_runs,
+        'filter_stage_reuses': filter_pipeline.stage_reuses,
+        'selection_cache': filter_pipeline.cache.stats(),
+    }
+
+    with st.expander("🛠️ Dijagnostika", expanded=False):
+        st.caption(f"Rerun do ovog trenutka: {rerun_timer.elapsed_ms():,.1f} ms | Log: {hub_timing.TIMING_LOG_PATH}")
+        st.dataframe(
+            pd.DataFrame(rerun_timer.records(), columns=['stage', 'ms', 'calls']),
+            use_container_width=True,
+            hide_index=True,
+            column_config={'ms': st.column_config.NumberColumn('ms', format="%.2f")}
+        )
+
+        cache_stats = rerun_stats['selection_cache']
+        st.caption(
+            f"Filter stage (sesija): {rerun_stats['filter_stage_runs']} izvršeno, "
+            f"{rerun_stats['filter_stage_reuses']} iskorišteno iz memorije | "
+            f"LRU kombinacija: {cache_stats['entries']} unosa ({cache_stats['bytes'] / 1024:,.0f} KB), "
+            f"{cache_stats['hits']} hit / {cache_stats['misses']} miss ({cache_stats['hit_rate']:.0%}), "
+            f"{cache_stats['evictions']} izbačeno"
+        )
+        st.caption(
+            f"Dijeljeni podaci (svi korisnici, jedna kopija): kampanje {hub_datasets.frame_mb(df_campaigns):.1f} MB, "
+            f"demografija {hub_datasets.frame_mb(df_demographics):.1f} MB | "
+            f"Odabir ove sesije: {hub_datasets.frame_mb(df_filtered):.1f} MB"
+        )
+        if rerun_timer.counters:
+            st.caption("Brojači reruna: " + ", ".join(f"{name}: {value}" for name, value in rerun_timer.counters.items()))
+
 else:
     st.error("❌ Aplikacija ne može učitati podatke. Provjerite da li postoje datoteke 'MASTER_ADS_HR_CLEANED.csv' i 'data - v3/age - gender - v3/campaign age - gender - version 3.csv'.")
+    rerun_stats = {}
+
+hub_timing.finish_rerun(rerun_timer, **rerun_stats)
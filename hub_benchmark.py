@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB BENCHMARK - Reproducible stage benchmarks at 1x / 10x / 100x today's data
+Builds synthetic campaign, demographics and rolling-window files with the
+schemas of the real ones, runs every stage of the hub on them and writes the
+timings as JSON, so regressions can be tracked and hardware can be sized
+before onboarding more markets.
+
+Synthetic data = hub_generator streams of the three files with N times their
+row counts: every synthetic campaign is a resampled master-file campaign with
+its own Campaign ID, its rows in all three files and one seeded lognormal
+volume factor - spend shares (and so the resolved demographics) stay those of
+its template. Files are written block by block, memory does not grow with N.
+
+Stages (hub_timing stage names; nested stages are included in their parent):
+    load:campaigns / load:demographics / load:rolling
+    prepare_campaigns  (demographics_resolution, standardized_names, campaign_id_aggregation)
+    filter_index / spend_cube
+    scenario:<name>    one sidebar state on a fresh pipeline (filter:*, derived:_frame)
+    render:*           display frame, table serialization, age / gender / noise charts
+    rolling:*          window aggregates, saturation analysis, reach curve fit
+
+Usage:
+    python hub_benchmark.py                          # 1x, 10x, 100x, 3 repeats
+    python hub_benchmark.py --scales 1 10 --repeat 5
+    python hub_benchmark.py --output results.json
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+import hub_generator
+import hub_timing
+from hub_cache import CACHE_DIR, CAMPAIGN_PATH, DEMOGRAPHICS_PATH
+from hub_cube import SpendCube
+from hub_curves import fit_reach_curves
+from hub_data import load_campaign_data, load_demographics_data, prepare_campaigns
+from hub_filters import FilterIndex, FilterPipeline
+from hub_rolling import ROLLING_REACH_PATH, aggregate_windows, read_rolling_export, saturation_analysis
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+SCALES = [1, 10, 100]
+REPEAT = 3
+SEED = 42
+BENCHMARK_DIR = os.path.join(CACHE_DIR, "benchmarks")
+
+# Benchmark dataset -> hub_generator export kind it is generated as
+SYNTHETIC_EXPORTS = {'campaigns': 'campaign_master', 'demographics': 'age_gender', 'rolling': 'rolling_sheet'}
+
+# Columns of the campaign table in the default view of hub_app.py
+DISPLAY_COLUMNS = ['Standardized_Campaign_Name_Corrected', 'Cost_parsed', 'Impr_parsed', 'CPM', 'Reach_parsed']
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+def write_synthetic_data(out_dir, factor, seed=SEED, campaign_path=CAMPAIGN_PATH,
+                         demographics_path=DEMOGRAPHICS_PATH, rolling_path=ROLLING_REACH_PATH):
+    """Write the three files at factor x today's size. Returns {dataset: path}."""
+    sources = {'campaign_master': campaign_path, 'age_gender': demographics_path, 'rolling_sheet': rolling_path}
+    profiles = hub_generator.build_profiles(list(SYNTHETIC_EXPORTS.values()), sources, template='campaign_master')
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for dataset, kind in SYNTHETIC_EXPORTS.items():
+        paths[dataset] = os.path.join(out_dir, f'{dataset}.csv')
+        rows = factor * int(profiles[kind].counts.sum())
+        hub_generator.write_export(profiles[kind], paths[dataset], rows, seed, money_style='plain')
+    return paths
+
+# ============================================================================
+# STAGES
+# ============================================================================
+
+def filter_scenarios(df_campaigns):
+    """Sidebar states replayed by the benchmark (most common value of each filter)."""
+    def top(column):
+        return [df_campaigns[column].value_counts().index[0]]
+
+    return [
+        ('all', {}),
+        ('budget', {'budget_range': (1000.0, 8000.0)}),
+        ('search', {'search_query': 'mcd'}),
+        ('brand', {'selections': {'Brand': top('Brand')}}),
+        ('format_age_gender', {'selections': {'Ad_Format': top('Ad_Format'), 'Age_Range': top('Age_Range'),
+                                              'Gender': top('Gender')}}),
+        ('quarter_bid', {'budget_range': (500.0, 50000.0),
+                         'selections': {'Bid_Strategy_Short': top('Bid_Strategy_Short'), 'Quarter': top('Quarter')}}),
+    ]
+
+def render_stages(timer, df_filtered, rows, spend_cube):
+    """What hub_app.py builds for a selection (rows = its row positions), without Streamlit."""
+    with timer.stage('render:display_frame'):
+        df_display = df_filtered[DISPLAY_COLUMNS].copy().sort_values('Cost_parsed', ascending=False)
+
+    if pa is not None:
+        with timer.stage('render:table_arrow'):
+            pa.Table.from_pandas(df_display)
+
+    with timer.stage('render:age_chart'):
+        age = spend_cube.label_distribution('Age_Range', rows)
+        px.bar(x=age.index.astype(str), y=age.to_numpy()).to_json()
+
+    with timer.stage('render:gender'):
+        spend_cube.label_distribution('Gender', rows)
+
+    with timer.stage('render:noise_chart'):
+        noise = spend_cube.segment_spend(rows, 'Age')
+        px.bar(x=noise.index.astype(str), y=noise.to_numpy()).to_json()
+
+def run_stages(paths):
+    """One timed pass over every stage. Returns (StageTimer, frame sizes)."""
+    timer = hub_timing.start_rerun('benchmark')
+
+    with timer.stage('load:campaigns'):
+        df_raw = load_campaign_data(paths['campaigns'])
+    with timer.stage('load:demographics'):
+        df_demographics = load_demographics_data(paths['demographics'])
+    with timer.stage('load:rolling'):
+        df_rolling = read_rolling_export(paths['rolling'])
+
+    with timer.stage('prepare_campaigns'):
+        df_campaigns = prepare_campaigns(df_raw, df_demographics)
+    with timer.stage('filter_index'):
+        index = FilterIndex(df_campaigns)
+    with timer.stage('spend_cube'):
+        spend_cube = SpendCube(df_campaigns, df_demographics)
+
+    for name, state in filter_scenarios(df_campaigns):
+        pipeline = FilterPipeline(index)
+        with timer.stage(f'scenario:{name}'):
+            rows = pipeline.run(**state)
+            df_filtered = pipeline.frame()
+        render_stages(timer, df_filtered, rows, spend_cube)
+
+    with timer.stage('rolling:aggregate_windows'):
+        aggregate_windows(df_rolling)
+    with timer.stage('rolling:saturation_analysis'):
+        saturation_analysis(df_rolling)
+    with timer.stage('rolling:fit_reach_curves'):
+        fit_reach_curves(df_rolling)
+
+    hub_timing.finish_rerun(timer, log_path=None)
+
+    sizes = {
+        'rows': {'campaigns': len(df_raw), 'demographics': len(df_demographics), 'rolling': len(df_rolling),
+                 'prepared_campaigns': len(df_campaigns)},
+        'frame_mb': {
+            'campaigns': round(df_campaigns.memory_usage(deep=True).sum() / 1e6, 2),
+            'demographics': round(df_demographics.memory_usage(deep=True).sum() / 1e6, 2),
+            'rolling': round(df_rolling.memory_usage(deep=True).sum() / 1e6, 2),
+        },
+    }
+    return timer, sizes
+
+def benchmark_scale(factor, repeat=REPEAT, seed=SEED, data_dir=None, log=print):
+    """Generate the data for one scale, run the stages repeat times, summarize."""
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = data_dir or tmp
+        start = time.perf_counter()
+        paths = write_synthetic_data(out_dir, factor, seed)
+        generate_s = time.perf_counter() - start
+        log(f"[DATA] x{factor}: synthetic files written in {generate_s:.1f} s")
+
+        runs = []
+        for number in range(repeat):
+            timer, sizes = run_stages(paths)
+            runs.append(timer)
+            log(f"[RUN] x{factor} #{number + 1}: {timer.elapsed_ms():,.0f} ms")
+
+        file_mb = {name: round(os.path.getsize(path) / 1e6, 2) for name, path in paths.items()}
+
+    stages = {}
+    for name in runs[0].stages:
+        values = [run.stages[name][0] for run in runs if name in run.stages]
+        stages[name] = {
+            'median_ms': round(statistics.median(values), 3),
+            'min_ms': round(min(values), 3),
+            'calls': runs[0].stages[name][1],
+        }
+
+    return {
+        'scale': factor,
+        'generate_s': round(generate_s, 3),
+        'total_ms': round(statistics.median(run.elapsed_ms() for run in runs), 3),
+        'file_mb': file_mb,
+        **sizes,
+        'stages': stages,
+    }
+
+def environment():
+    """Versions / machine the numbers were measured on."""
+    import importlib.metadata as metadata
+
+    packages = {}
+    for package in ['pandas', 'numpy', 'pyarrow', 'plotly']:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'packages': packages,
+    }
+
+def run_benchmark(scales=SCALES, repeat=REPEAT, seed=SEED, output=None, log=print):
+    """Benchmark every scale and write the results JSON. Returns (results, output path)."""
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'repeat': repeat,
+        'environment': environment(),
+        'scales': [benchmark_scale(factor, repeat, seed, log=log) for factor in scales],
+    }
+
+    if output is None:
+        os.makedirs(BENCHMARK_DIR, exist_ok=True)
+        output = os.path.join(BENCHMARK_DIR, f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return results, output
+
+def format_results(results):
+    """Stage x scale table of median ms."""
+    stage_names = list(dict.fromkeys(name for scale in results['scales'] for name in scale['stages']))
+    table = pd.DataFrame({
+        f"x{scale['scale']}": pd.Series({name: stage['median_ms'] for name, stage in scale['stages'].items()})
+        for scale in results['scales']
+    }).reindex(stage_names)
+    return table.to_string(float_format=lambda value: f"{value:,.1f}")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    option_values = hub_generator.option_values
+
+    scales = [int(value) for value in option_values('--scales')] if '--scales' in sys.argv else SCALES
+    repeat = int(option_values('--repeat')[0]) if '--repeat' in sys.argv else REPEAT
+    seed = int(option_values('--seed')[0]) if '--seed' in sys.argv else SEED
+    output = option_values('--output')[0] if '--output' in sys.argv else None
+
+    results, output = run_benchmark(scales, repeat, seed, output)
+    print("\n[RESULTS] median ms per stage")
+    print(format_results(results))
+    print(f"\n[OK] Wrote {output}")
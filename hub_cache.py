@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB CACHE - Columnar on-disk cache of the prepared campaign frame
+Stores the final df_campaigns (parsed, demographics resolved, names rebuilt,
+aggregated by Campaign ID) as an uncompressed Feather file so a cold start of
+the dashboard is a single memory-mapped read instead of the full pipeline.
+
+The cache is valid only while:
+- every source file is unchanged (size + mtime, confirmed by SHA-256 when
+  the mtime moved but the content may not have; the new mtime is then
+  recorded so the file is hashed only once),
+- the demographics threshold is the same,
+- CACHE_VERSION matches (bump it whenever the preparation logic changes).
+
+Build step (run after every data refresh):
+    python hub_cache.py
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+from hub_data import build_campaign_frame, load_demographics_data, DEMOGRAPHICS_THRESHOLD
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+CACHE_VERSION = 4
+CACHE_DIR = ".hub_cache"
+CACHE_FILE = "campaigns_prepared.feather"
+META_FILE = "campaigns_prepared.json"
+
+CAMPAIGN_PATH = "MASTER_ADS_HR_CLEANED.csv"
+DEMOGRAPHICS_PATH = "data - v3/age - gender - v3/campaign age - gender - version 3.csv"
+
+# ============================================================================
+# SOURCE FINGERPRINTS
+# ============================================================================
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def source_fingerprint(file_path, with_hash=True):
+    """Size, mtime and (optionally) content hash of a source file. Missing file -> None."""
+    if not os.path.exists(file_path):
+        return None
+
+    stat = os.stat(file_path)
+    fingerprint = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+    if with_hash:
+        fingerprint['sha256'] = file_sha256(file_path)
+    return fingerprint
+
+def source_fingerprints(campaign_path=CAMPAIGN_PATH, demographics_path=DEMOGRAPHICS_PATH):
+    """Fingerprints of both sources - take them BEFORE reading the files."""
+    return {
+        campaign_path: source_fingerprint(campaign_path),
+        demographics_path: source_fingerprint(demographics_path),
+    }
+
+def source_unchanged(file_path, recorded):
+    """
+    Compare a source file with its recorded fingerprint.
+    Fast path on size + mtime; only re-hash when the mtime moved.
+    """
+    if recorded is None:
+        return not os.path.exists(file_path)
+
+    current = source_fingerprint(file_path, with_hash=False)
+    if current is None or current['size'] != recorded['size']:
+        return False
+
+    if current['mtime_ns'] == recorded['mtime_ns']:
+        return True
+
+    # Touched but maybe not modified (copy, checkout) - let the content decide
+    return file_sha256(file_path) == recorded.get('sha256')
+
+# ============================================================================
+# CACHE READ / WRITE
+# ============================================================================
+
+def _cache_paths(cache_dir):
+    return os.path.join(cache_dir, CACHE_FILE), os.path.join(cache_dir, META_FILE)
+
+def _write_meta(meta_path, meta):
+    """Atomic metadata write (temp file + replace)."""
+    with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(meta_path + '.tmp', meta_path)
+
+def is_cache_fresh(campaign_path=CAMPAIGN_PATH, demographics_path=DEMOGRAPHICS_PATH,
+                   threshold=DEMOGRAPHICS_THRESHOLD, cache_dir=CACHE_DIR):
+    """True if the cached frame was built from the current sources and threshold."""
+    data_path, meta_path = _cache_paths(cache_dir)
+
+    if feather is None or not os.path.exists(data_path) or not os.path.exists(meta_path):
+        return False
+
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if meta.get('cache_version') != CACHE_VERSION or meta.get('threshold') != threshold:
+        return False
+
+    sources = meta.get('sources', {})
+    touched = False
+    for file_path in (campaign_path, demographics_path):
+        if file_path not in sources or not source_unchanged(file_path, sources[file_path]):
+            return False
+        recorded = sources[file_path]
+        if recorded is not None:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+            if mtime_ns != recorded['mtime_ns']:
+                # Same content under a new mtime - record it so the next start
+                # takes the size + mtime fast path instead of re-hashing
+                recorded['mtime_ns'] = mtime_ns
+                touched = True
+
+    if touched:
+        try:
+            _write_meta(meta_path, meta)
+        except OSError:
+            pass    # read-only deployment: stays fresh, just hashes again next time
+
+    return True
+
+def write_cache(df_campaigns, campaign_path=CAMPAIGN_PATH, demographics_path=DEMOGRAPHICS_PATH,
+                threshold=DEMOGRAPHICS_THRESHOLD, cache_dir=CACHE_DIR, sources=None):
+    """
+    Write the prepared frame (uncompressed Feather, memory-mappable) + metadata.
+    sources: source_fingerprints() taken before df_campaigns was built (default: now).
+    """
+    if feather is None:
+        return False
+
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path, meta_path = _cache_paths(cache_dir)
+
+    meta = {
+        'cache_version': CACHE_VERSION,
+        'threshold': threshold,
+        'rows': len(df_campaigns),
+        'sources': sources or source_fingerprints(campaign_path, demographics_path),
+    }
+
+    # Write to temp files first so a concurrent reader never sees half a cache
+    feather.write_feather(df_campaigns.reset_index(drop=True), data_path + '.tmp',
+                          compression='uncompressed')
+    os.replace(data_path + '.tmp', data_path)
+    _write_meta(meta_path, meta)
+    return True
+
+def read_cache(cache_dir=CACHE_DIR):
+    """Memory-mapped read of the cached frame."""
+    data_path, _ = _cache_paths(cache_dir)
+    table = feather.read_table(data_path, memory_map=True)
+    return table.to_pandas()
+
+def load_prepared_campaigns(campaign_path=CAMPAIGN_PATH, demographics_path=DEMOGRAPHICS_PATH,
+                            threshold=DEMOGRAPHICS_THRESHOLD, cache_dir=CACHE_DIR):
+    """
+    Return the prepared df_campaigns.
+    Fresh cache -> memory-mapped read. Stale / missing -> full pipeline, then refresh the cache.
+    """
+    if is_cache_fresh(campaign_path, demographics_path, threshold, cache_dir):
+        return read_cache(cache_dir)
+
+    # Fingerprint before reading: a source replaced during the build leaves a
+    # stale fingerprint behind, so the next start rebuilds instead of caching it
+    sources = source_fingerprints(campaign_path, demographics_path)
+    df_campaigns = build_campaign_frame(campaign_path, demographics_path, threshold)
+    _store_cache(df_campaigns, campaign_path, demographics_path, threshold, cache_dir, sources)
+    return df_campaigns
+
+def load_prepared_frames(campaign_path=CAMPAIGN_PATH, demographics_path=DEMOGRAPHICS_PATH,
+                         threshold=DEMOGRAPHICS_THRESHOLD, cache_dir=CACHE_DIR):
+    """
+    (df_campaigns, df_demographics) for callers that keep the demographics rows
+    too (hub_datasets): the demographics CSV is read once, also on a cold cache.
+    """
+    if is_cache_fresh(campaign_path, demographics_path, threshold, cache_dir):
+        return read_cache(cache_dir), load_demographics_data(demographics_path)
+
+    sources = source_fingerprints(campaign_path, demographics_path)
+    df_demographics = load_demographics_data(demographics_path)
+    df_campaigns = build_campaign_frame(campaign_path, demographics_path, threshold, df_demographics)
+    _store_cache(df_campaigns, campaign_path, demographics_path, threshold, cache_dir, sources)
+    return df_campaigns, df_demographics
+
+def _store_cache(df_campaigns, campaign_path, demographics_path, threshold, cache_dir, sources):
+    try:
+        write_cache(df_campaigns, campaign_path, demographics_path, threshold, cache_dir, sources)
+    except (OSError, ValueError, TypeError) as e:
+        # A read-only deployment or an Arrow type issue must never break the app
+        print(f"[WARN] Could not write campaign cache: {e}")
+
+# ============================================================================
+# BUILD STEP
+# ============================================================================
+
+if __name__ == '__main__':
+    if feather is None:
+        print("[ERROR] pyarrow is not installed - columnar cache unavailable")
+        sys.exit(1)
+
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else DEMOGRAPHICS_THRESHOLD
+
+    if is_cache_fresh(threshold=threshold):
+        print(f"[OK] Cache is fresh: {os.path.join(CACHE_DIR, CACHE_FILE)}")
+        sys.exit(0)
+
+    print("[BUILD] Preparing campaign frame...")
+    sources = source_fingerprints()
+    df = build_campaign_frame(CAMPAIGN_PATH, DEMOGRAPHICS_PATH, threshold)
+    write_cache(df, threshold=threshold, sources=sources)
+    print(f"[OK] Wrote {len(df):,} campaigns to {os.path.join(CACHE_DIR, CACHE_FILE)} (threshold={threshold:.2f})")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB CHECKS - Shared pass / fail bookkeeping for the test_*.py scripts
+
+    from hub_checks import banner, check, finish
+
+    banner("CAMPAIGN CACHE TEST")                    # title banner
+    check(cached.equals(fresh), "cache round-trip")  # [PASS] / [FAIL] line
+    finish("Campaign Cache")                         # summary, exit code 1 on any failure
+"""
+
+import sys
+
+# Number of failed check() calls of the running script
+failures = 0
+
+def banner(title):
+    """UTF-8 output on Windows and the title banner."""
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    print("=" * 80)
+    print(title)
+    print("=" * 80)
+
+def check(condition, message):
+    """Print [PASS] / [FAIL] for one check and count failures. Returns the condition."""
+    global failures
+    if condition:
+        print(f"[PASS] {message}")
+    else:
+        failures += 1
+        print(f"[FAIL] {message}")
+    return bool(condition)
+
+def finish(name):
+    """Summary line; exits with code 1 when any check failed."""
+    print("\n" + "=" * 80)
+    if failures == 0:
+        print(f"[DONE] {name} Test Complete - all checks passed")
+    else:
+        print(f"[DONE] {name} Test Complete - {failures} FAILED")
+    print("=" * 80)
+
+    if failures > 0:
+        sys.exit(1)
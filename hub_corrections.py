@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB CORRECTIONS - Bulk manual corrections (e.g. Ad_Format fixes)
+Applies an analyst corrections table (campaign name or Campaign ID -> value)
+to the main database with ONE keyed map instead of a loop over the table or
+over the database rows.
+
+Semantics are those of the old dictionary loops:
+- a key repeated in the table keeps its LAST value (dict(zip(...)) / dict
+  filled row by row),
+- every database row with a matching key gets the new value,
+- keys without a value (NaN) are ignored.
+
+The returned report lists matched / unmatched keys so missing campaigns
+(renamed, deleted, typos) are visible after every run.
+"""
+
+from collections import namedtuple
+
+import pandas as pd
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+CorrectionReport = namedtuple('CorrectionReport', [
+    'table_keys',       # distinct keys in the corrections table
+    'matched_rows',     # database rows that were corrected
+    'matched_keys',     # table keys found in the database
+    'unmatched_keys',   # table keys NOT found in the database (table order)
+    'changes',          # DataFrame [key, 'Old', 'New'] per matched key (first matching row's old value)
+])
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+def correction_mapping(corrections, key, value):
+    """Series key -> corrected value (last value of repeated keys, first-appearance order)."""
+    table = corrections[corrections[key].notna()]
+    last_values = table.drop_duplicates(key, keep='last').set_index(key)[value]
+    return last_values.reindex(pd.unique(table[key]))
+
+def apply_corrections(df, corrections, key='Campaign', value='Campaign Type', target='Ad_Format', table_key=None):
+    """
+    Overwrite df[target] (in place) for every row whose df[key] is in the
+    corrections table. table_key names the key column of the table when it
+    differs from the database column. Returns a CorrectionReport.
+    """
+    mapping = correction_mapping(corrections, table_key or key, value)
+
+    keys = df[key]
+    matched = keys.isin(mapping.index)
+    found = mapping.index.isin(keys[matched])
+
+    # Old value of the first matching row of every matched key, in table order
+    first_rows = df.loc[matched, [key, target]].drop_duplicates(key, keep='first').set_index(key)[target]
+    matched_keys = mapping.index[found]
+    changes = pd.DataFrame({
+        key: matched_keys,
+        'Old': first_rows.reindex(matched_keys).to_numpy(),
+        'New': mapping[found].to_numpy(),
+    })
+
+    df.loc[matched, target] = keys[matched].map(mapping)
+
+    return CorrectionReport(
+        table_keys=len(mapping),
+        matched_rows=int(matched.sum()),
+        matched_keys=len(matched_keys),
+        unmatched_keys=mapping.index[~found].tolist(),
+        changes=changes,
+    )
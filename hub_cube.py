@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB CUBE - Pre-aggregated spend for the age / gender panels of hub_app.py
+Built once per dataset (next to the filter index) and shared by every session:
+
+    spend[row, age, gender]  dense float64 cube, row = df_campaigns row position:
+                             demographics spend of that campaign per Age x Gender
+    label codes + cost       campaign-level Age_Range / Gender label of every row
+
+A filtered selection (row positions from FilterPipeline.run) then becomes one
+indexed sum instead of groupbys over df_filtered / the raw demographics rows:
+
+    label_distribution('Age_Range', rows)  == df_filtered.groupby('Age_Range', observed=True)
+                                              ['Cost_parsed'].sum().sort_values(ascending=False)
+    segment_spend(rows, 'Age')             == demographics of the selected Campaign IDs
+                                              .groupby('Age')['Cost_parsed'].sum().sort_values(ascending=False)
+
+Sums are plain float sums, so totals can differ from the pandas groupbys in
+the last bits (never in the displayed cents / percentages).
+"""
+
+import numpy as np
+import pandas as pd
+
+# Campaign-level label columns with a precomputed distribution
+LABEL_COLUMNS = ['Age_Range', 'Gender']
+
+# ============================================================================
+# SPEND CUBE
+# ============================================================================
+
+class SpendCube:
+    """Dense campaign x Age x Gender spend cube plus campaign label codes (read-only)."""
+
+    def __init__(self, df_campaigns, df_demographics):
+        self.n_rows = len(df_campaigns)
+        self.cost = df_campaigns['Cost_parsed'].to_numpy(dtype=np.float64)
+
+        # Campaign-level labels: integer codes in groupby order (-1 = missing)
+        self.labels = {}
+        for column in LABEL_COLUMNS:
+            if column in df_campaigns.columns:
+                self.labels[column] = self._label_codes(df_campaigns[column])
+
+        # Demographics rows -> (campaign row, age, gender) cells; rows of
+        # campaigns outside df_campaigns are never selected and are dropped.
+        # A missing Age / Gender is a code of its own (NaN, last), so a row
+        # without a Gender still counts for its Age and vice versa
+        rows = pd.Index(df_campaigns['Campaign ID']).get_indexer(df_demographics['Campaign ID'])
+        known = rows >= 0
+        age_codes, self.ages = pd.factorize(df_demographics['Age'], sort=True, use_na_sentinel=False)
+        gender_codes, self.genders = pd.factorize(df_demographics['Gender'], sort=True, use_na_sentinel=False)
+
+        self.spend = np.zeros((self.n_rows, len(self.ages), len(self.genders)), dtype=np.float64)
+        np.add.at(self.spend, (rows[known], age_codes[known], gender_codes[known]),
+                  df_demographics['Cost_parsed'].to_numpy(dtype=np.float64)[known])
+        # Campaigns with at least one demographics row (spent or not)
+        self.demographics_rows = np.bincount(rows[known], minlength=self.n_rows)
+
+        for array in [self.cost, self.spend, self.demographics_rows]:
+            array.flags.writeable = False
+
+    @staticmethod
+    def _label_codes(series):
+        """(codes, index of the label values) - categorical codes or sorted factorization."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            index = pd.CategoricalIndex(categories, categories=categories, ordered=series.cat.ordered)
+            return series.cat.codes.to_numpy(), index
+        codes, uniques = pd.factorize(series, sort=True)
+        return codes, pd.Index(uniques)
+
+    def nbytes(self):
+        """Memory held by the cube arrays."""
+        return self.spend.nbytes + self.cost.nbytes + self.demographics_rows.nbytes + sum(
+            codes.nbytes for codes, _ in self.labels.values())
+
+    # ------------------------------------------------------------------
+    # CAMPAIGN LABELS (Age_Range / Gender panels)
+    # ------------------------------------------------------------------
+
+    def label_distribution(self, column, positions):
+        """Spend per campaign label of the selected rows, largest first (observed labels only)."""
+        codes, index = self.labels[column]
+        codes = codes[positions]
+        valid = codes >= 0
+        n_labels = len(index)
+        counts = np.bincount(codes[valid], minlength=n_labels)
+        sums = np.bincount(codes[valid], weights=self.cost[positions][valid], minlength=n_labels)
+
+        observed = np.flatnonzero(counts)
+        distribution = pd.Series(sums[observed], index=index[observed], name='Cost_parsed')
+        distribution.index.name = column
+        return distribution.sort_values(ascending=False)
+
+    # ------------------------------------------------------------------
+    # DEMOGRAPHICS SEGMENTS (noise panel)
+    # ------------------------------------------------------------------
+
+    def has_demographics(self, positions):
+        """True when any selected campaign has demographics rows."""
+        return bool(self.demographics_rows[positions].any())
+
+    def segment_spend(self, positions, segment='Age'):
+        """Demographics spend of the selected rows per Age (or Gender), largest first."""
+        selected = self.spend[positions]
+        if segment == 'Age':
+            sums, index = selected.sum(axis=(0, 2)), self.ages
+        else:
+            sums, index = selected.sum(axis=(0, 1)), self.genders
+        # like groupby(segment): rows without a value are not a segment
+        named = pd.notna(index)
+        return pd.Series(sums[named], index=pd.Index(index[named], name=segment),
+                         name='Cost_parsed').sort_values(ascending=False)
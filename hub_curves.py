@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB CURVES - Fitted reach curves (budget -> reach forecasts)
+Fits a saturating negative-exponential reach curve per segment from the
+90-day rolling windows (one point per window: Cost, Reach):
+
+    reach(cost) = R_max * (1 - exp(-cost / scale))
+
+All segments are fitted together with vectorized least squares: for a fixed
+scale R_max has a closed form, so every segment's error is evaluated on a
+shared grid of scales in one array pass, then the best scale is refined by a
+batched golden-section search. No per-segment optimizer loop.
+
+Segments are fitted on three levels so every query gets an answer:
+    Brand x Type x Target  ->  Brand x Type  ->  Type
+
+The parameter table is cached in the local cache directory (invalidated when
+the rolling file changes); a forecast is then a dict lookup plus one exp().
+
+Build step (run after every rolling data refresh):
+    python hub_curves.py
+"""
+
+import json
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+from hub_cache import CACHE_DIR, source_fingerprint, source_unchanged
+from hub_rolling import ROLLING_REACH_PATH, read_rolling_export
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+CURVE_VERSION = 1
+CURVE_FILE = "reach_curves.feather"
+CURVE_META_FILE = "reach_curves.json"
+
+# Segment levels, most specific first (forecast falls back down the list)
+SEGMENT_LEVELS = [
+    ['Brand', 'Type', 'Target'],
+    ['Brand', 'Type'],
+    ['Type'],
+]
+SEGMENT_COLUMNS = ['Brand', 'Type', 'Target']
+
+# Windows a segment needs for a fit
+MIN_POINTS = 3
+
+# Candidate scales as multiples of the segment's mean window cost
+SCALE_GRID = np.logspace(-2, 3, 101)
+REFINE_ITERATIONS = 40
+
+PARAMETER_COLUMNS = ['Level', 'Brand', 'Type', 'Target', 'R_Max', 'Scale', 'Points', 'R2', 'Cost_Min', 'Cost_Max']
+
+# ============================================================================
+# MODEL
+# ============================================================================
+
+def negative_exponential(cost, r_max, scale):
+    """Reach at a given cost (vectorized)."""
+    return r_max * (1.0 - np.exp(-np.asarray(cost, dtype=np.float64) / scale))
+
+def _segment_sums(values, starts):
+    """Per-segment column sums of a (points x candidates) array (points sorted by segment)."""
+    return np.add.reduceat(values, starts, axis=0)
+
+def _sse_for_scales(cost, reach, starts, scales_per_point, reach_sq_sums):
+    """
+    Least-squares error and R_max of every segment for per-point candidate scales.
+    scales_per_point: (points x candidates). Returns (sse, r_max), each (segments x candidates).
+    """
+    basis = 1.0 - np.exp(-cost[:, None] / scales_per_point)
+    s_rf = _segment_sums(reach[:, None] * basis, starts)
+    s_ff = _segment_sums(basis * basis, starts)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_max = np.where(s_ff > 0, s_rf / s_ff, 0.0)
+        sse = np.where(s_ff > 0, reach_sq_sums[:, None] - s_rf * r_max, reach_sq_sums[:, None])
+    return sse, np.maximum(r_max, 0.0)
+
+def fit_negative_exponential(cost, reach, segment_codes):
+    """
+    Fit reach = R_max * (1 - exp(-cost / scale)) for every segment at once.
+
+    cost, reach: float arrays (one point per window)
+    segment_codes: int segment label per point
+
+    Returns a DataFrame indexed by segment code: R_Max, Scale, Points, R2,
+    Cost_Min, Cost_Max.
+    """
+    order = np.argsort(segment_codes, kind='stable')
+    cost = np.asarray(cost, dtype=np.float64)[order]
+    reach = np.asarray(reach, dtype=np.float64)[order]
+    codes = np.asarray(segment_codes)[order]
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    points = np.diff(np.append(starts, len(codes)))
+    point_segment = np.repeat(np.arange(len(starts)), points)
+
+    mean_cost = np.add.reduceat(cost, starts) / points
+    reach_sq_sums = np.add.reduceat(reach * reach, starts)
+
+    # 1) Coarse grid: all segments x all candidate scales in one pass
+    grid_scales = mean_cost[:, None] * SCALE_GRID[None, :]
+    sse, _ = _sse_for_scales(cost, reach, starts, grid_scales[point_segment], reach_sq_sums)
+    best = np.argmin(sse, axis=1)
+
+    # 2) Batched golden-section search in log(scale) between the grid neighbours
+    log_grid = np.log(SCALE_GRID)
+    low = log_grid[np.maximum(best - 1, 0)] + np.log(mean_cost)
+    high = log_grid[np.minimum(best + 1, len(SCALE_GRID) - 1)] + np.log(mean_cost)
+    ratio = (math.sqrt(5.0) - 1.0) / 2.0
+
+    for _ in range(REFINE_ITERATIONS):
+        a = high - ratio * (high - low)
+        b = low + ratio * (high - low)
+        candidates = np.exp(np.stack([a, b], axis=1))
+        sse_ab, _ = _sse_for_scales(cost, reach, starts, candidates[point_segment], reach_sq_sums)
+        left_better = sse_ab[:, 0] <= sse_ab[:, 1]
+        high = np.where(left_better, b, high)
+        low = np.where(left_better, low, a)
+
+    scale = np.exp((low + high) / 2.0)
+    sse, r_max = _sse_for_scales(cost, reach, starts, scale[point_segment][:, None], reach_sq_sums)
+    sse = sse[:, 0]
+    r_max = r_max[:, 0]
+
+    # Goodness of fit against the segment mean
+    mean_reach = np.add.reduceat(reach, starts) / points
+    total_ss = reach_sq_sums - points * mean_reach ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(total_ss > 0, 1.0 - sse / total_ss, np.nan)
+
+    return pd.DataFrame({
+        'R_Max': r_max,
+        'Scale': scale,
+        'Points': points,
+        'R2': r2,
+        'Cost_Min': np.minimum.reduceat(cost, starts),
+        'Cost_Max': np.maximum.reduceat(cost, starts),
+    }, index=pd.Index(codes[starts], name='Segment'))
+
+def prepare_windows(df_rolling):
+    """Fit input: windows with positive cost / reach and a known Type."""
+    df = df_rolling[SEGMENT_COLUMNS + ['Cost', 'Reach']].copy()
+    df['Cost'] = pd.to_numeric(df['Cost'], errors='coerce')
+    df['Reach'] = pd.to_numeric(df['Reach'], errors='coerce')
+    df = df[(df['Cost'] > 0) & (df['Reach'] >= 0) & df['Type'].notna()]
+    for column in SEGMENT_COLUMNS:
+        df[column] = df[column].fillna('Unknown').astype(str)
+    return df.reset_index(drop=True)
+
+def segment_codes(df_windows, columns):
+    """Integer segment code per window for one segment level (segments with too few points -> -1)."""
+    codes = df_windows.groupby(columns, sort=True).ngroup().to_numpy()
+    counts = np.bincount(codes)
+    return np.where(counts[codes] >= MIN_POINTS, codes, -1)
+
+def fit_reach_curves(df_rolling):
+    """Parameter table (PARAMETER_COLUMNS) for every segment level."""
+    df = prepare_windows(df_rolling)
+    tables = []
+
+    for level, columns in enumerate(SEGMENT_LEVELS):
+        codes = segment_codes(df, columns)
+        keep = codes >= 0
+        if not keep.any():
+            continue
+
+        params = fit_negative_exponential(df['Cost'].to_numpy()[keep], df['Reach'].to_numpy()[keep], codes[keep])
+
+        # Segment labels from the first window of every segment
+        labels = df[keep].groupby(codes[keep], sort=True)[columns].first()
+        table = params.join(labels)
+        for column in SEGMENT_COLUMNS:
+            if column not in columns:
+                table[column] = None
+        table['Level'] = level
+        tables.append(table[PARAMETER_COLUMNS])
+
+    if len(tables) == 0:
+        return pd.DataFrame(columns=PARAMETER_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
+
+# ============================================================================
+# FORECASTS
+# ============================================================================
+
+class ReachCurveModel:
+    """
+    Fitted parameters keyed by segment - forecasts are closed-form evaluations.
+    levels: segment columns of every parameter Level, most specific first
+    (curve() / forecast() take the values of levels[0], in order).
+    """
+
+    def __init__(self, parameters, levels=SEGMENT_LEVELS):
+        self.parameters = parameters
+        self.levels = levels
+        self.curves = {}
+        for row in parameters.itertuples(index=False):
+            key = tuple(getattr(row, column) for column in levels[row.Level])
+            self.curves[(row.Level,) + key] = row
+
+    def segment_options(self, column, **selected):
+        """Distinct values of a segment column among the most specific fits (optionally narrowed)."""
+        table = self.parameters[self.parameters['Level'] == 0]
+        for key, value in selected.items():
+            table = table[table[key] == value]
+        return sorted(table[column].dropna().unique().tolist())
+
+    def curve(self, *segment):
+        """Parameter row of the most specific fitted segment (e.g. brand, type, target), or None."""
+        values = dict(zip(self.levels[0], segment))
+        for level, columns in enumerate(self.levels):
+            curve = self.curves.get((level,) + tuple(values.get(column) for column in columns))
+            if curve is not None:
+                return curve
+        return None
+
+    def forecast(self, budget, *segment):
+        """Estimated reach for a budget (None if no curve fits the segment)."""
+        curve = self.curve(*segment)
+        if curve is None:
+            return None
+        return curve.R_Max * (1.0 - math.exp(-budget / curve.Scale))
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _curve_paths(cache_dir):
+    return os.path.join(cache_dir, CURVE_FILE), os.path.join(cache_dir, CURVE_META_FILE)
+
+def is_curve_cache_fresh(rolling_path=ROLLING_REACH_PATH, cache_dir=CACHE_DIR):
+    """Cached parameters exist and were fitted from the current rolling file."""
+    curve_path, meta_path = _curve_paths(cache_dir)
+    if feather is None or not os.path.exists(curve_path) or not os.path.exists(meta_path):
+        return False
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return meta.get('curve_version') == CURVE_VERSION and source_unchanged(rolling_path, meta.get('source'))
+
+def write_curve_cache(parameters, rolling_path=ROLLING_REACH_PATH, cache_dir=CACHE_DIR, source=None):
+    """
+    Atomically write the parameter table and its metadata.
+    source: source_fingerprint() taken before the parameters were fitted (default: now).
+    """
+    curve_path, meta_path = _curve_paths(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    tmp_path = curve_path + '.tmp'
+    feather.write_feather(parameters, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, curve_path)
+
+    meta = {'curve_version': CURVE_VERSION, 'source': source or source_fingerprint(rolling_path)}
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, meta_path)
+
+def load_reach_curves(rolling_path=ROLLING_REACH_PATH, cache_dir=CACHE_DIR):
+    """ReachCurveModel from cached parameters (refitted when the rolling file changed)."""
+    if is_curve_cache_fresh(rolling_path, cache_dir):
+        return ReachCurveModel(feather.read_feather(_curve_paths(cache_dir)[0]))
+
+    # Fingerprint first: a file rewritten during the fit must not look fitted
+    source = source_fingerprint(rolling_path)
+    parameters = fit_reach_curves(read_rolling_export(rolling_path))
+    if feather is not None:
+        try:
+            write_curve_cache(parameters, rolling_path, cache_dir, source)
+        except OSError as e:
+            # A read-only deployment still gets forecasts, just refitted per process
+            print(f"[WARN] Could not write reach curve cache: {e}")
+    return ReachCurveModel(parameters)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    if feather is None:
+        print("[ERROR] pyarrow is not installed - curve cache unavailable")
+        sys.exit(1)
+
+    if is_curve_cache_fresh():
+        print(f"[OK] Reach curves are fresh: {os.path.join(CACHE_DIR, CURVE_FILE)}")
+        sys.exit(0)
+
+    print("[FIT] Fitting reach curves...")
+    source = source_fingerprint(ROLLING_REACH_PATH)
+    parameters = fit_reach_curves(read_rolling_export(ROLLING_REACH_PATH))
+    write_curve_cache(parameters, source=source)
+    for level, columns in enumerate(SEGMENT_LEVELS):
+        level_table = parameters[parameters['Level'] == level]
+        print(f"[OK] {' x '.join(columns)}: {len(level_table)} segments, median R2 {level_table['R2'].median():.2f}")
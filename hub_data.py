@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB DATA - Campaign data loading & preparation
+Builds the final df_campaigns frame used by the dashboard:
+parse metrics, parse date ranges (start/end dates, year, quarter), resolve
+demographics, rebuild standardized names and aggregate to one row per
+Campaign ID.
+
+No Streamlit imports here - the same pipeline is used by the app (through
+hub_datasets, st.cache_resource) and by the offline cache build step (hub_cache.py).
+"""
+
+import numpy as np
+import pandas as pd
+
+from hub_parsing import parse_cost_series, parse_number_series, parse_float_series, parse_date_range_series
+from hub_schema import read_export
+from hub_timing import timed
+from hub_demographics import resolve_demographics_batch
+from hub_standardization import standardized_name_series
+
+# Spend share a demographic segment needs to count as targeted
+DEMOGRAPHICS_THRESHOLD = 0.10
+
+# Columns the dashboards / audits use from the large breakdown exports
+DEMOGRAPHICS_COLUMNS = ['Campaign ID', 'Age', 'Gender', 'Cost']
+LOCATION_COLUMNS = ['Campaign ID', 'Country/Territory (User location)', 'Cost']
+
+# Low-cardinality dimension columns stored as pandas Categorical
+CATEGORICAL_COLUMNS = ['Brand', 'Ad_Format', 'Age_Range', 'Gender', 'Bid_Strategy_Short', 'Quarter', 'Goal', 'Account']
+
+# ============================================================================
+# LOADERS
+# ============================================================================
+
+def load_campaign_data(file_path):
+    """Load and parse the campaign data."""
+    df = pd.read_csv(file_path, delimiter=';', encoding='utf-8-sig')
+
+    # Parse numeric columns
+    df['Cost_parsed'] = parse_cost_series(df['Cost'])
+    df['Impr_parsed'] = parse_number_series(df['Impr.'])
+    df['Reach_parsed'] = parse_number_series(df['Peak_Reach'])
+
+    # Parse additional metrics if they exist
+    if 'Clicks' in df.columns:
+        df['Clicks_parsed'] = parse_number_series(df['Clicks'])
+    else:
+        df['Clicks_parsed'] = 0
+
+    if 'CTR' in df.columns:
+        df['CTR_parsed'] = parse_float_series(df['CTR'])
+    else:
+        df['CTR_parsed'] = 0.0
+
+    if 'Avg. CPC' in df.columns:
+        df['Avg_CPC_parsed'] = parse_cost_series(df['Avg. CPC'])
+    else:
+        df['Avg_CPC_parsed'] = 0.0
+
+    if 'Avg. CPM' in df.columns:
+        df['Avg_CPM_parsed'] = parse_cost_series(df['Avg. CPM'])
+    else:
+        df['Avg_CPM_parsed'] = 0.0
+
+    if 'TrueView views' in df.columns:
+        df['TrueView_views_parsed'] = parse_number_series(df['TrueView views'])
+    else:
+        df['TrueView_views_parsed'] = 0
+
+    if 'TrueView avg. CPV' in df.columns:
+        df['TrueView_CPV_parsed'] = parse_cost_series(df['TrueView avg. CPV'])
+    else:
+        df['TrueView_CPV_parsed'] = 0.0
+
+    if 'Conversions' in df.columns:
+        df['Conversions_parsed'] = parse_float_series(df['Conversions'])
+    else:
+        df['Conversions_parsed'] = 0.0
+
+    if 'Conv. rate' in df.columns:
+        df['Conv_rate_parsed'] = parse_float_series(df['Conv. rate'])
+    else:
+        df['Conv_rate_parsed'] = 0.0
+
+    if 'Cost / conv.' in df.columns:
+        df['Cost_per_conv_parsed'] = parse_cost_series(df['Cost / conv.'])
+    else:
+        df['Cost_per_conv_parsed'] = 0.0
+
+    # Calculate CPM
+    df['CPM'] = np.where(df['Impr_parsed'] > 0, (df['Cost_parsed'] / df['Impr_parsed']) * 1000, 0)
+
+    # Parse Date_Range into typed Range_Start / Range_End / Year / Quarter columns
+    date_columns = parse_date_range_series(df['Date_Range'])
+    for column in date_columns.columns:
+        df[column] = date_columns[column]
+
+    return df
+
+def load_demographics_data(file_path, columns=DEMOGRAPHICS_COLUMNS):
+    """Load demographics (age-gender) data - only the given columns (None = all)."""
+    try:
+        df = read_export('age_gender', file_path, columns=columns)
+        if 'Cost' in df.columns:
+            df['Cost_parsed'] = df['Cost']
+        return df
+    except:
+        return pd.DataFrame()
+
+def load_location_data(file_path, columns=LOCATION_COLUMNS):
+    """Load location (country) data - only the given columns (None = all)."""
+    df = read_export('location', file_path, columns=columns)
+    if 'Cost' in df.columns:
+        df['Cost_parsed'] = df['Cost']
+    return df
+
+# ============================================================================
+# PREPARATION
+# ============================================================================
+
+def prepare_campaigns(df_campaigns, df_demographics, threshold=DEMOGRAPHICS_THRESHOLD):
+    """
+    Turn the parsed master file into the final one-row-per-campaign frame.
+
+    Steps: drop Unknown quarters, resolve demographics (threshold filtering),
+    rebuild standardized names, aggregate duplicates by Campaign ID, store
+    dimension columns as Categorical.
+    """
+    # SAFETY CLEANUP: Remove campaigns with Unknown quarter
+    unknown_quarter_count = len(df_campaigns[df_campaigns['Quarter'] == 'Unknown'])
+    if unknown_quarter_count > 0:
+        df_campaigns = df_campaigns[df_campaigns['Quarter'] != 'Unknown'].copy()
+
+    # Calculate FULL RANGE demographics with THRESHOLD filtering (one grouped pass)
+    with timed('demographics_resolution'):
+        demographics_results = resolve_demographics_batch(df_demographics, threshold).set_index('Campaign ID')
+
+    df_campaigns['Age_Range'] = df_campaigns['Campaign ID'].map(demographics_results['Age_Range']).fillna('Unknown')
+    df_campaigns['Gender'] = df_campaigns['Campaign ID'].map(demographics_results['Gender']).fillna('Unknown')
+
+    # Update Target column with corrected demographics
+    df_campaigns['Target_Corrected'] = df_campaigns['Age_Range'] + " | " + df_campaigns['Gender']
+
+    # Rebuild Standardized_Campaign_Name with corrected demographics
+    with timed('standardized_names'):
+        df_campaigns['Standardized_Campaign_Name_Corrected'] = standardized_name_series(df_campaigns)
+
+    # Aggregate by Campaign ID to ensure one campaign = one row
+    duplicate_count = df_campaigns['Campaign ID'].duplicated().sum()
+
+    if duplicate_count > 0:
+        # Define aggregation rules
+        agg_rules = {
+            'Campaign': 'first',
+            'Brand': 'first',
+            'Ad_Format': 'first',
+            'Date_Range': 'first',
+            'Bid_Strategy_Short': 'first',
+            'Goal': 'first',
+            'Cost': 'first',
+            'Impr.': 'first',
+            'Peak_Reach': 'first',
+            'Cost_parsed': 'sum',
+            'Impr_parsed': 'sum',
+            'Reach_parsed': 'max',
+            'Clicks_parsed': 'sum',
+            'CTR_parsed': 'mean',
+            'Avg_CPC_parsed': 'mean',
+            'Avg_CPM_parsed': 'mean',
+            'TrueView_views_parsed': 'sum',
+            'TrueView_CPV_parsed': 'mean',
+            'Conversions_parsed': 'sum',
+            'Conv_rate_parsed': 'mean',
+            'Cost_per_conv_parsed': 'mean',
+            'CPM': 'mean',
+            'Quarter': 'first',
+            'Range_Start': 'first',
+            'Range_End': 'first',
+            'Year': 'first',
+            'Age_Range': 'first',
+            'Gender': 'first',
+            'Target_Corrected': 'first',
+            'Standardized_Campaign_Name_Corrected': 'first'
+        }
+
+        # Add Account column if it exists
+        if 'Account' in df_campaigns.columns:
+            agg_rules['Account'] = 'first'
+        elif 'Account name' in df_campaigns.columns:
+            agg_rules['Account name'] = 'first'
+
+        # Aggregate by Campaign ID
+        with timed('campaign_id_aggregation'):
+            df_campaigns = df_campaigns.groupby('Campaign ID', as_index=False).agg(agg_rules)
+
+    df_campaigns = to_categorical(df_campaigns.reset_index(drop=True))
+
+    return df_campaigns
+
+def to_categorical(df, columns=CATEGORICAL_COLUMNS):
+    """
+    Convert dimension columns to Categorical in place (returns df).
+    Categories are the sorted distinct values, so the category order (and the
+    integer codes) are stable for the same data.
+    """
+    for column in columns:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            categories = sorted(df[column].dropna().unique().tolist())
+            df[column] = pd.Categorical(df[column], categories=categories)
+    return df
+
+def category_options(series, exclude=()):
+    """
+    Sorted distinct non-null values of a column (sidebar options).
+    For a Categorical this reads the categories present in the codes - no
+    string sorting or hashing.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        values = series.cat.categories[np.unique(codes[codes >= 0])].tolist()
+    else:
+        values = sorted(series.dropna().unique().tolist())
+    return [value for value in values if value not in exclude]
+
+def build_campaign_frame(campaign_path, demographics_path, threshold=DEMOGRAPHICS_THRESHOLD, df_demographics=None):
+    """
+    Full cold-start pipeline: read both CSV files and prepare df_campaigns.
+    df_demographics: demographics rows already loaded from demographics_path (not read again).
+    """
+    with timed('load_campaign_data'):
+        df_campaigns = load_campaign_data(campaign_path)
+    if df_demographics is None:
+        with timed('load_demographics_data'):
+            df_demographics = load_demographics_data(demographics_path)
+    return prepare_campaigns(df_campaigns, df_demographics, threshold)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB DATASETS - One read-only copy of the datasets for every Streamlit session
+st.cache_data hands every caller its own unpickled copy of a DataFrame, so each
+session (and each rerun) held its own df_demographics, next to the pickled
+original. hub_app.py now keeps the datasets behind ONE st.cache_resource
+entry: every session references the same objects, and only the filtered
+selection of a session (FilterIndex.materialize, the noise panel rows) is
+materialized per session.
+
+Shared frames are frozen: their numeric / datetime columns are read-only
+views of the loaded data (no copy is made), so an accidental in-place write
+raises "assignment destination is read-only" instead of silently changing the
+data every other session sees. Selections (.iloc / boolean masks) are
+ordinary writable copies. Object columns stay writable (pandas compares them
+with a scalar through a writable buffer - df['Campaign'] == name would raise)
+and extension columns (category, Int64) cannot be frozen - treat the whole
+frame as read-only.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import hub_cache
+import hub_data
+from hub_cube import SpendCube
+from hub_filters import FilterIndex
+
+# ============================================================================
+# SHARED DATASETS
+# ============================================================================
+
+SharedDatasets = namedtuple('SharedDatasets', [
+    'campaigns',        # prepared df_campaigns (hub_data.prepare_campaigns)
+    'demographics',     # age-gender rows (hub_data.DEMOGRAPHICS_COLUMNS + Cost_parsed)
+    'filter_index',     # FilterIndex over campaigns
+    'spend_cube',       # SpendCube for the age / gender panels (hub_cube)
+])
+
+def _freezable(dtype):
+    """Numeric / datetime numpy columns - object columns must stay writable."""
+    return isinstance(dtype, np.dtype) and dtype != object
+
+def freeze_frame(df):
+    """
+    The same data as df with read-only numeric columns (views, not copies).
+    One column per block, so no consolidation copy is made either.
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if _freezable(series.dtype):
+            values = series.to_numpy()
+            values.flags.writeable = False
+            columns[column] = values
+        else:
+            columns[column] = series.array
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+def is_frozen(df):
+    """True when no numeric / datetime column of df can be written in place."""
+    return all(
+        not df[column].to_numpy().flags.writeable
+        for column in df.columns if _freezable(df[column].dtype)
+    )
+
+def load_shared_datasets(campaign_path=hub_cache.CAMPAIGN_PATH, demographics_path=hub_cache.DEMOGRAPHICS_PATH,
+                         threshold=hub_data.DEMOGRAPHICS_THRESHOLD):
+    """Load, freeze, index and pre-aggregate the datasets - call once per process (st.cache_resource)."""
+    df_campaigns, df_demographics = hub_cache.load_prepared_frames(campaign_path, demographics_path, threshold)
+    df_campaigns, df_demographics = freeze_frame(df_campaigns), freeze_frame(df_demographics)
+    return SharedDatasets(df_campaigns, df_demographics, FilterIndex(df_campaigns),
+                          SpendCube(df_campaigns, df_demographics))
+
+def frame_mb(df):
+    """Resident size of a frame in MB (deep)."""
+    return df.memory_usage(deep=True).sum() / 1e6
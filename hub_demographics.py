@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB DEMOGRAPHICS - Age/Gender targeting resolution
+Resolves the Age_Range / Gender label of every campaign from the age-gender
+export using the 10% spend THRESHOLD, dominant-segment fallback and the
+'+ UNK' suffix.
+
+get_full_range_demographics() resolves ONE campaign (reference logic).
+resolve_demographics_batch() resolves ALL campaigns in one grouped pass over
+the demographics table and returns a frame that joins back on Campaign ID.
+"""
+
+import pandas as pd
+
+# ============================================================================
+# SINGLE CAMPAIGN RESOLUTION (reference logic)
+# ============================================================================
+
+def parse_age_range(age_str):
+    """
+    Parse age range string to get min and max age.
+    Examples:
+    - '18-24' -> (18, 24)
+    - '25 - 34' -> (25, 34)  [handles spaces]
+    - '65+' -> (65, 100)
+    - 'Unknown' -> (0, 0)
+    """
+    age_str = str(age_str).strip()
+
+    if age_str in ['Unknown', '', 'N/A']:
+        return (0, 0)
+
+    # Remove all spaces for easier parsing
+    age_str_clean = age_str.replace(' ', '')
+
+    if '-' in age_str_clean:
+        # Format: "18-24" or "25-34" or "25 - 34"
+        parts = age_str_clean.split('-')
+        try:
+            age_min = int(parts[0])
+            age_max_str = parts[1].replace('+', '')
+            age_max = int(age_max_str) if age_max_str else 100
+        except:
+            return (0, 0)
+    elif '+' in age_str_clean:
+        # Format: "65+" or "65 +"
+        try:
+            age_min = int(age_str_clean.replace('+', ''))
+            age_max = 100
+        except:
+            return (0, 0)
+    else:
+        # Single number or unknown
+        try:
+            age_min = age_max = int(age_str_clean)
+        except:
+            return (0, 0)
+
+    return (age_min, age_max)
+
+def get_full_range_demographics(campaign_id, df_demographics, threshold=0.10):
+    """
+    Get FULL RANGE demographics with THRESHOLD FILTERING.
+
+    CRITICAL CHANGE: Only includes age/gender segments that account for at least
+    10% of total campaign spend. This eliminates noise from optimized targeting
+    and accidental impressions.
+
+    Examples:
+    - Campaign with 95% spend in 25-34 → Returns "25-34" (NOT "18-65+")
+    - Campaign with 40% in 18-24, 45% in 25-34 → Returns "18-34"
+    - Campaign with 5% in each age → Returns dominant segment only
+
+    This ensures accurate targeting representation and meaningful filter options.
+    """
+    if df_demographics is None or len(df_demographics) == 0:
+        return ("Unknown", "Unknown")
+
+    # Filter for this campaign
+    demo_data = df_demographics[df_demographics['Campaign ID'] == campaign_id]
+
+    if len(demo_data) == 0:
+        return ("Unknown", "Unknown")
+
+    # Calculate total spend for this campaign
+    total_spend = demo_data['Cost_parsed'].sum()
+
+    if total_spend == 0:
+        return ("Unknown", "Unknown")
+
+    # Group by Age and calculate spend per segment
+    age_spend = demo_data.groupby('Age')['Cost_parsed'].sum()
+
+    # Filter ages by threshold (10% minimum) AND exclude Unknown
+    significant_ages = []
+    for age, spend in age_spend.items():
+        age_str = str(age).strip()
+
+        # CRITICAL: Skip Unknown and invalid values
+        if age_str in ['Unknown', 'nan', '', 'N/A']:
+            continue
+
+        percentage = spend / total_spend
+
+        # Only include if meets 10% threshold
+        if percentage >= threshold:
+            significant_ages.append((age_str, spend, percentage))
+
+    # If no significant ages meet threshold, fall back to dominant segment
+    if len(significant_ages) == 0:
+        valid_ages = {age: spend for age, spend in age_spend.items()
+                      if str(age).strip() not in ['Unknown', 'nan', '', 'N/A']}
+
+        if len(valid_ages) > 0:
+            dominant_age = max(valid_ages, key=valid_ages.get)
+            dominant_spend = valid_ages[dominant_age]
+            significant_ages = [(str(dominant_age), dominant_spend, dominant_spend / total_spend)]
+        else:
+            return ("Unknown", "Unknown")
+
+    # Sort by percentage descending
+    significant_ages.sort(key=lambda x: x[2], reverse=True)
+
+    # CRITICAL: If only ONE significant age segment, return it AS IS (don't create range)
+    if len(significant_ages) == 1:
+        age_range = significant_ages[0][0]
+    else:
+        # Multiple significant segments - create range from min to max
+        age_strings = [a[0] for a in significant_ages]
+
+        # Parse all significant ages to find min/max
+        age_min = 999
+        age_max = 0
+
+        for age_str in age_strings:
+            min_age, max_age = parse_age_range(age_str)
+            if min_age > 0:
+                if min_age < age_min:
+                    age_min = min_age
+                # Don't let 65+ (100) inflate the max
+                if max_age < 100 and max_age > age_max:
+                    age_max = max_age
+                elif max_age >= 100:  # This is 65+
+                    age_max = 65
+
+        # Construct range
+        if age_min == 999 or age_max == 0:
+            age_range = significant_ages[0][0]  # Fallback to dominant
+        elif age_min == age_max:
+            age_range = str(age_min)
+        elif age_max >= 65:
+            age_range = f"{age_min}-65+"
+        else:
+            age_range = f"{age_min}-{age_max}"
+
+    # Gender logic with threshold
+    gender_spend = demo_data.groupby('Gender')['Cost_parsed'].sum()
+
+    significant_genders = []
+    for gender, spend in gender_spend.items():
+        gender_str = str(gender).strip()
+
+        # CRITICAL: Skip Unknown
+        if gender_str in ['Unknown', 'nan', '', 'N/A']:
+            continue
+
+        percentage = spend / total_spend
+
+        if percentage >= threshold:
+            significant_genders.append(gender_str)
+
+    # If no significant genders, fall back to dominant
+    if len(significant_genders) == 0:
+        valid_genders = {gender: spend for gender, spend in gender_spend.items()
+                        if str(gender).strip() not in ['Unknown', 'nan', '', 'N/A']}
+
+        if len(valid_genders) > 0:
+            dominant_gender = max(valid_genders, key=valid_genders.get)
+            significant_genders = [str(dominant_gender)]
+        else:
+            gender = 'Unknown'
+            return (age_range, gender)
+
+    # Map gender codes
+    gender_map = {
+        'F': 'Female',
+        'M': 'Male',
+        'Female': 'Female',
+        'Male': 'Male',
+    }
+
+    genders_normalized = [gender_map.get(g, g) for g in significant_genders]
+
+    if len(genders_normalized) > 1:
+        gender = 'All'
+    else:
+        gender = genders_normalized[0]
+
+    # CRITICAL: Check if campaign has ANY spend in Unknown category
+    # If yes, add '+ UNK' suffix to indicate "grey zone" users
+    unknown_spend = 0
+    for age, spend in age_spend.items():
+        age_str = str(age).strip()
+        if age_str in ['Unknown', 'nan', '', 'N/A', 'Undetermined']:
+            unknown_spend += spend
+
+    # Add + UNK suffix if there's at least 0.01 EUR in Unknown
+    if unknown_spend >= 0.01:
+        age_range = age_range + ' + UNK'
+
+    return (age_range, gender)
+
+# ============================================================================
+# BATCH RESOLUTION (all campaigns, one grouped pass)
+# ============================================================================
+
+# Segment labels that never count as real targeting (same lists as above)
+INVALID_SEGMENTS = ['Unknown', 'nan', '', 'N/A']
+UNKNOWN_AGE_SEGMENTS = INVALID_SEGMENTS + ['Undetermined']
+
+GENDER_MAP = {
+    'F': 'Female',
+    'M': 'Male',
+    'Female': 'Female',
+    'Male': 'Male',
+}
+
+def build_age_range(significant_ages):
+    """
+    Build the Age_Range label from significant age segments, already sorted
+    by spend share descending. Same rules as get_full_range_demographics:
+    one segment is returned AS IS, several become a min-max range.
+    """
+    if len(significant_ages) == 1:
+        return significant_ages[0]
+
+    age_min = 999
+    age_max = 0
+
+    for age_str in significant_ages:
+        min_age, max_age = parse_age_range(age_str)
+        if min_age > 0:
+            if min_age < age_min:
+                age_min = min_age
+            # Don't let 65+ (100) inflate the max
+            if max_age < 100 and max_age > age_max:
+                age_max = max_age
+            elif max_age >= 100:  # This is 65+
+                age_max = 65
+
+    if age_min == 999 or age_max == 0:
+        return significant_ages[0]  # Fallback to dominant
+    elif age_min == age_max:
+        return str(age_min)
+    elif age_max >= 65:
+        return f"{age_min}-65+"
+    else:
+        return f"{age_min}-{age_max}"
+
+def _significant_segments(segment_spend, column, totals, threshold):
+    """
+    Mark significant segments per campaign on a (Campaign ID, segment) spend table.
+
+    A segment is significant if it is valid and holds >= threshold of the
+    campaign spend. Campaigns without any significant segment fall back to
+    their dominant valid segment (first one on ties, like max() on a dict).
+    Returns the table with 'Segment', 'Percentage' and 'Significant' columns.
+    """
+    segment_spend = segment_spend.copy()
+    segment_spend['Segment'] = segment_spend[column].astype(str).str.strip()
+    segment_spend['Percentage'] = (
+        segment_spend['Cost_parsed'] / segment_spend['Campaign ID'].map(totals)
+    )
+
+    valid = ~segment_spend['Segment'].isin(INVALID_SEGMENTS)
+    significant = valid & (segment_spend['Percentage'] >= threshold)
+
+    # Dominant fallback for campaigns where nothing meets the threshold
+    has_significant = significant.groupby(segment_spend['Campaign ID']).transform('any')
+    fallback_pool = segment_spend[valid & ~has_significant]
+    if len(fallback_pool) > 0:
+        dominant_idx = fallback_pool.groupby('Campaign ID')['Cost_parsed'].idxmax()
+        significant.loc[dominant_idx.values] = True
+
+    segment_spend['Significant'] = significant
+    return segment_spend
+
+def resolve_demographics_batch(df_demographics, threshold=0.10):
+    """
+    Resolve Age_Range / Gender for EVERY campaign in the demographics table.
+
+    Produces exactly the labels of get_full_range_demographics(), but groups
+    the table once by (Campaign ID, Age) and (Campaign ID, Gender) instead of
+    filtering the whole table once per campaign.
+
+    Returns DataFrame ['Campaign ID', 'Age_Range', 'Gender'] (one row per
+    campaign present in df_demographics). Campaigns missing from the result
+    should be treated as ("Unknown", "Unknown").
+    """
+    result_columns = ['Campaign ID', 'Age_Range', 'Gender']
+
+    if df_demographics is None or len(df_demographics) == 0:
+        return pd.DataFrame(columns=result_columns)
+
+    df = df_demographics[['Campaign ID', 'Age', 'Gender', 'Cost_parsed']]
+
+    totals = df.groupby('Campaign ID')['Cost_parsed'].sum()
+    result = pd.DataFrame({'Campaign ID': totals.index})
+    result['Age_Range'] = 'Unknown'
+    result['Gender'] = 'Unknown'
+
+    # Campaigns with zero spend stay Unknown / Unknown
+    totals = totals[totals != 0]
+    if len(totals) == 0:
+        return result[result_columns]
+
+    df = df[df['Campaign ID'].isin(totals.index)]
+
+    # ------------------------------------------------------------------
+    # AGE: threshold filtering + dominant fallback, ordered by share
+    # ------------------------------------------------------------------
+    age_spend = df.groupby(['Campaign ID', 'Age'])['Cost_parsed'].sum().reset_index()
+    age_spend = _significant_segments(age_spend, 'Age', totals, threshold)
+
+    significant_ages = age_spend[age_spend['Significant']].sort_values(
+        ['Campaign ID', 'Percentage'], ascending=[True, False], kind='mergesort'
+    )
+    age_lists = significant_ages.groupby('Campaign ID', sort=False)['Segment'].agg(tuple)
+
+    # Few distinct segment combinations exist - build each label once
+    range_labels = {ages: build_age_range(list(ages)) for ages in set(age_lists)}
+    age_ranges = pd.Series(
+        [range_labels[ages] for ages in age_lists], index=age_lists.index, dtype=object
+    )
+
+    # '+ UNK' suffix: at least 0.01 EUR spent in Unknown / Undetermined ages
+    unknown_ages = age_spend['Segment'].isin(UNKNOWN_AGE_SEGMENTS)
+    unknown_spend = age_spend['Cost_parsed'].where(unknown_ages, 0.0).groupby(
+        age_spend['Campaign ID']
+    ).sum()
+
+    # ------------------------------------------------------------------
+    # GENDER: threshold filtering + dominant fallback
+    # ------------------------------------------------------------------
+    gender_spend = df.groupby(['Campaign ID', 'Gender'])['Cost_parsed'].sum().reset_index()
+    gender_spend = _significant_segments(gender_spend, 'Gender', totals, threshold)
+
+    significant_genders = gender_spend[gender_spend['Significant']]
+    gender_counts = significant_genders.groupby('Campaign ID').size()
+    single_gender = significant_genders.groupby('Campaign ID')['Segment'].first()
+    genders = single_gender.map(lambda g: GENDER_MAP.get(g, g))
+    genders = genders.where(gender_counts.reindex(genders.index) == 1, 'All')
+
+    # ------------------------------------------------------------------
+    # COMBINE
+    # ------------------------------------------------------------------
+    has_age = result['Campaign ID'].isin(age_ranges.index)
+    result.loc[has_age, 'Age_Range'] = result.loc[has_age, 'Campaign ID'].map(age_ranges)
+
+    # Suffix only when a valid gender was found (reference returns early otherwise)
+    has_gender = has_age & result['Campaign ID'].isin(genders.index)
+    result.loc[has_gender, 'Gender'] = result.loc[has_gender, 'Campaign ID'].map(genders)
+
+    needs_suffix = has_gender & (
+        result['Campaign ID'].map(unknown_spend).fillna(0.0) >= 0.01
+    )
+    result.loc[needs_suffix, 'Age_Range'] = result.loc[needs_suffix, 'Age_Range'] + ' + UNK'
+
+    return result[result_columns]
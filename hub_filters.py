@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB FILTERS - Bitmap index filter engine for the sidebar filters
+Precomputes one NumPy boolean array (bitmap) per value of every categorical
+filter column. A filter selection is answered by OR-ing the bitmaps of the
+selected values and AND-ing the per-column results together. Only the final
+selection is materialized as a DataFrame - no intermediate subsets.
+
+The budget filter uses a sorted cost array instead: a range lookup is two
+binary searches (np.searchsorted) returning the candidate row positions, and
+the other filters are then evaluated on those candidates only.
+
+Date-range filtering compares the typed Range_Start / Range_End columns
+(parsed once at load time, see hub_parsing.parse_date_range_series).
+
+The search box uses a trigram inverted index (hub_search.TrigramIndex) built
+once over the original campaign names instead of a regex scan over all names
+on every rerun.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from hub_search import TrigramIndex
+from hub_timing import count, timed
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+# Sidebar multiselect columns (order = order of the sidebar widgets)
+FILTER_COLUMNS = ['Brand', 'Ad_Format', 'Age_Range', 'Gender', 'Bid_Strategy_Short', 'Quarter']
+
+# Name columns with a search index (search box uses the ORIGINAL names)
+SEARCH_COLUMNS = ['Campaign']
+
+# Per-session LRU cache of filter combinations (entries / memory cap)
+SELECTION_CACHE_SIZE = 32
+SELECTION_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# Multiselect option meaning "no filter"
+ALL_OPTION = 'Svi'
+
+def is_filter_active(selected):
+    """A multiselect filters only if something is selected and 'Svi' is not."""
+    return ALL_OPTION not in selected and len(selected) > 0
+
+# ============================================================================
+# FILTER INDEX
+# ============================================================================
+
+class FilterIndex:
+    """Per-value bitmaps over a prepared campaign frame (read-only)."""
+
+    def __init__(self, df_campaigns, columns=FILTER_COLUMNS):
+        self.df = df_campaigns
+        self.n_rows = len(df_campaigns)
+        self.bitmaps = {}
+
+        for column in columns:
+            if column in df_campaigns.columns:
+                self.bitmaps[column] = self._build_bitmaps(df_campaigns[column])
+
+        # Sorted cost index: cost_sorted[i] = cost of row cost_order[i]
+        self.cost = df_campaigns['Cost_parsed'].to_numpy(dtype=np.float64)
+        self.cost_order = np.argsort(self.cost, kind='stable')
+        self.cost_sorted = self.cost[self.cost_order]
+        # Campaign flight dates (NaT = unparsed Date_Range, never matches a date filter)
+        if 'Range_Start' in df_campaigns.columns and 'Range_End' in df_campaigns.columns:
+            self.start_dates = df_campaigns['Range_Start'].to_numpy(dtype='datetime64[ns]')
+            self.end_dates = df_campaigns['Range_End'].to_numpy(dtype='datetime64[ns]')
+        else:
+            self.start_dates = None
+            self.end_dates = None
+
+        self.search_indexes = {
+            column: TrigramIndex(df_campaigns[column])
+            for column in SEARCH_COLUMNS if column in df_campaigns.columns
+        }
+
+    @staticmethod
+    def _build_bitmaps(series):
+        """
+        One boolean array per distinct non-null value (NaN never matches, like isin).
+        Categorical columns compare their integer codes directly.
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        return {value: codes == code for code, value in enumerate(uniques)}
+
+    def search_mask(self, search_query, column='Campaign'):
+        """Case-insensitive substring search (default: ORIGINAL campaign names)."""
+        return self.search_indexes[column].search_mask(search_query)
+
+    def date_mask(self, date_range):
+        """
+        Campaigns whose flight (Range_Start..Range_End) overlaps date_range.
+        date_range: (first_day, last_day), both inclusive, date-like.
+        """
+        first_day = np.datetime64(pd.Timestamp(date_range[0]), 'ns')
+        last_day = np.datetime64(pd.Timestamp(date_range[1]), 'ns')
+        # NaT comparisons are always False - unparsed date ranges never match
+        return (self.start_dates <= last_day) & (self.end_dates >= first_day)
+
+    def _budget_slice(self, lower_bound, upper_bound):
+        """Start/end of a cost range in the sorted cost array (two binary searches)."""
+        start = np.searchsorted(self.cost_sorted, lower_bound, side='left')
+        end = np.searchsorted(self.cost_sorted, upper_bound, side='right')
+        return start, max(start, end)
+
+    def budget_positions(self, lower_bound, upper_bound):
+        """
+        Row positions with lower_bound <= Cost_parsed <= upper_bound, in row order.
+        O(log n) lookup on the sorted cost array; NaN costs sort last and never
+        match, like the >= / <= comparisons.
+        """
+        start, end = self._budget_slice(lower_bound, upper_bound)
+        return np.sort(self.cost_order[start:end])
+
+    def select(self, search_query='', budget_range=None, selections=None, date_range=None):
+        """
+        Combine all active filters, returning the selected row positions (row order).
+
+        search_query: text from the search box ('' = no search)
+        budget_range: (lower_bound, upper_bound) or None
+        selections: dict {column: selected multiselect values}
+        date_range: (first_day, last_day) flight overlap filter or None
+
+        The budget range narrows the candidates first (binary search); search
+        and multiselect bitmaps are then only read at those candidate positions.
+        """
+        if budget_range is not None:
+            candidates = self.budget_positions(budget_range[0], budget_range[1])
+        else:
+            candidates = np.arange(self.n_rows)
+
+        keep = np.ones(len(candidates), dtype=bool)
+
+        if date_range is not None:
+            keep &= self.date_mask(date_range)[candidates]
+
+        if search_query and search_query.strip():
+            keep &= self.search_mask(search_query)[candidates]
+
+        for column, selected in (selections or {}).items():
+            if is_filter_active(selected):
+                column_bitmaps = self.bitmaps[column]
+                column_keep = np.zeros(len(candidates), dtype=bool)
+                for value in selected:
+                    bitmap = column_bitmaps.get(value)
+                    if bitmap is not None:
+                        column_keep |= bitmap[candidates]
+                keep &= column_keep
+
+        return candidates[keep]
+
+    def materialize(self, positions):
+        """
+        The only DataFrame created per rerun: the final filtered selection.
+        A selection of every row is the indexed frame itself (no per-session copy) -
+        treat the result as read-only.
+        """
+        if len(positions) == self.n_rows:
+            return self.df
+        return self.df.iloc[positions]
+
+# ============================================================================
+# MEMOIZED FILTER PIPELINE
+# ============================================================================
+
+def normalize_selection(selected):
+    """Order-insensitive key of a multiselect value (None = filter inactive)."""
+    if not is_filter_active(selected):
+        return None
+    return tuple(sorted(selected))
+
+class SelectionCache:
+    """
+    Bounded LRU cache: normalized filter state -> (row positions, totals).
+    Evicts the least recently used entry when either the entry count or the
+    memory cap (bytes of the stored row positions) is exceeded.
+    """
+
+    ENTRY_OVERHEAD_BYTES = 256
+
+    def __init__(self, max_entries=SELECTION_CACHE_SIZE, max_bytes=SELECTION_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _entry_bytes(self, rows):
+        return rows.nbytes + self.ENTRY_OVERHEAD_BYTES
+
+    def get(self, key):
+        """(rows, totals) for a filter state, or None (counts a hit or a miss)."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, rows, totals):
+        """Store a result, evicting least recently used entries over the caps."""
+        if key in self.entries:
+            self.nbytes -= self._entry_bytes(self.entries.pop(key)[0])
+
+        size = self._entry_bytes(rows)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        self.entries[key] = (rows, totals)
+        self.nbytes += size
+        while len(self.entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, (evicted_rows, _) = self.entries.popitem(last=False)
+            self.nbytes -= self._entry_bytes(evicted_rows)
+            self.evictions += 1
+
+    def stats(self):
+        """Counters for diagnostics."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0,
+        }
+
+class FilterPipeline:
+    """
+    Incremental filter pipeline over a FilterIndex (one per user session).
+
+    Stages run in a fixed order: budget -> dates -> search -> FILTER_COLUMNS. Each
+    stage's output (row positions) is memoized under the key of ALL its
+    upstream inputs, so changing a downstream filter reuses every upstream
+    result, and a rerun with unchanged filters (display options only - metrics,
+    original-names toggle) does no filtering at all.
+
+    Complete filter states are also kept in an LRU SelectionCache together
+    with their totals (totals_function(filtered frame)), so going back to a
+    recent combination needs no filtering and no aggregation.
+
+    Values derived from the final selection (filtered frame, chart
+    aggregates) are memoized with derived() and dropped when it changes.
+    """
+
+    def __init__(self, filter_index, totals_function=None,
+                 cache_size=SELECTION_CACHE_SIZE, cache_max_bytes=SELECTION_CACHE_MAX_BYTES):
+        self.index = filter_index
+        self.totals_function = totals_function
+        self.cache = SelectionCache(cache_size, cache_max_bytes)
+        self._stage_keys = []
+        self._stage_rows = []
+        self._derived = {}
+        self._current_totals = None
+        self.stage_runs = 0
+        self.stage_reuses = 0
+
+    def _stages(self, search_query, budget_range, selections, date_range):
+        """(name, key input) per stage, in pipeline order."""
+        search_lower = search_query.strip().lower() if search_query else ''
+        budget_key = None if budget_range is None else (float(budget_range[0]), float(budget_range[1]))
+        date_key = None if date_range is None else (pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]))
+
+        stages = [('budget', budget_key), ('dates', date_key), ('search', search_lower or None)]
+        for column in FILTER_COLUMNS:
+            if column in (selections or {}):
+                stages.append((column, normalize_selection(selections[column])))
+        return stages
+
+    def _run_stage(self, name, value, rows):
+        """Apply one stage to the upstream row positions."""
+        if name == 'budget':
+            if value is None:
+                return np.arange(self.index.n_rows)
+            return self.index.budget_positions(value[0], value[1])
+        if value is None:
+            return rows
+        if name == 'dates':
+            return rows[self.index.date_mask(value)[rows]]
+        if name == 'search':
+            return rows[self.index.search_mask(value)[rows]]
+
+        column_bitmaps = self.index.bitmaps[name]
+        keep = np.zeros(len(rows), dtype=bool)
+        for selected_value in value:
+            bitmap = column_bitmaps.get(selected_value)
+            if bitmap is not None:
+                keep |= bitmap[rows]
+        return rows[keep]
+
+    def run(self, search_query='', budget_range=None, selections=None, date_range=None):
+        """Selected row positions (row order) - same result as FilterIndex.select()."""
+        stages = self._stages(search_query, budget_range, selections, date_range)
+        key = tuple(stages)
+
+        if self._derived.get('_key') == key:
+            # Same state as the last rerun (display-only change)
+            self.stage_reuses += len(stages)
+            count('filter_state_unchanged')
+            return self._derived['_rows']
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            count('selection_cache_hits')
+            rows, self._current_totals = cached
+            self._derived = {'_key': key, '_rows': rows}
+            return rows
+
+        count('selection_cache_misses')
+        rows = self._run_stages(stages)
+        self._derived = {'_key': key, '_rows': rows}
+        self._current_totals = None
+        if self.totals_function is not None:
+            with timed('totals'):
+                self._current_totals = self.totals_function(self.frame())
+        self.cache.put(key, rows, self._current_totals)
+        return rows
+
+    def _run_stages(self, stages):
+        """Run the stages, reusing the memoized prefix of the last run."""
+        rows = None
+        key = ()
+        for depth, (name, value) in enumerate(stages):
+            key = key + ((name, value),)
+            if depth < len(self._stage_keys) and self._stage_keys[depth] == key:
+                # Upstream inputs unchanged - reuse memoized output
+                rows = self._stage_rows[depth]
+                self.stage_reuses += 1
+                count('filter_stage_reuses')
+                continue
+
+            # First changed stage: recompute it and everything downstream
+            del self._stage_keys[depth:]
+            del self._stage_rows[depth:]
+            with timed(f'filter:{name}'):
+                rows = self._run_stage(name, value, rows)
+            self._stage_keys.append(key)
+            self._stage_rows.append(rows)
+            self.stage_runs += 1
+            count('filter_stage_runs')
+
+        return rows
+
+    def frame(self):
+        """Filtered DataFrame of the current selection (materialized once)."""
+        return self.derived('_frame', lambda: self.index.materialize(self._derived['_rows']))
+
+    def totals(self):
+        """Cached totals_function() result of the current selection."""
+        return self._current_totals
+
+    def derived(self, name, compute):
+        """Value computed from the current selection, memoized until it changes."""
+        if name not in self._derived:
+            with timed(f'derived:{name}'):
+                self._derived[name] = compute()
+        return self._derived[name]
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB FITTING - Parallel batch curve fitting across campaign segments
+Fits the saturating reach curve of hub_curves.py
+
+    reach(cost) = R_max * (1 - exp(-cost / scale))
+
+for every Brand x Ad_Format x Age_Range x Gender x Bid_Strategy_Short segment
+(one point per campaign: Cost, Peak Reach).
+
+Segments are independent, so the points are sorted by segment and cut into
+shards on segment boundaries. The shards are fitted by a ProcessPoolExecutor:
+the point arrays are written ONCE to a memory-mapped .npy file and every task
+only carries the file path and its (start, stop) offsets - no DataFrame is
+pickled to the workers. Each worker returns its small parameter block and the
+blocks are concatenated into a single parameter table.
+
+Sharding does not change the result: every segment is fitted by exactly the
+same vectorized code as a serial hub_curves.fit_negative_exponential() call.
+
+The table is served as a hub_curves.ReachCurveModel (load_segment_curves):
+hub_app.py shows the curve of the selected campaign's segment in the
+drill-down view. It is rebuilt by the 'segment_curves' step of hub_pipeline.py
+after every master file rebuild, or by hand (uses all cores by default):
+    python hub_fitting.py [--workers N]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+from hub_cache import CACHE_DIR
+from hub_curves import MIN_POINTS, ReachCurveModel, fit_negative_exponential
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+SEGMENT_COLUMNS = ['Brand', 'Ad_Format', 'Age_Range', 'Gender', 'Bid_Strategy_Short']
+SEGMENT_CURVE_FILE = "segment_curves.feather"
+SEGMENT_CURVE_PATH = os.path.join(CACHE_DIR, SEGMENT_CURVE_FILE)
+
+FIT_COLUMNS = ['R_Max', 'Scale', 'Points', 'R2', 'Cost_Min', 'Cost_Max']
+SEGMENT_PARAMETER_COLUMNS = SEGMENT_COLUMNS + FIT_COLUMNS
+
+# Shards per worker (smaller shards balance uneven segments) and the largest
+# shard in points (the grid search holds points x 101 candidate arrays)
+SHARDS_PER_WORKER = 4
+SHARD_MAX_POINTS = 20000
+
+# ============================================================================
+# SHARDING
+# ============================================================================
+
+def default_workers():
+    """Worker processes for a refit: one per core."""
+    return os.cpu_count() or 1
+
+def shard_bounds(codes_sorted, n_shards):
+    """
+    (start, stop) point offsets of up to n_shards shards of roughly equal size.
+    codes_sorted must be sorted; shards are only cut where a segment starts.
+    """
+    n_points = len(codes_sorted)
+    if n_points == 0:
+        return []
+
+    segment_starts = np.flatnonzero(np.r_[True, codes_sorted[1:] != codes_sorted[:-1]])
+    targets = np.linspace(0, n_points, n_shards + 1)[1:-1]
+    cuts = segment_starts[np.minimum(np.searchsorted(segment_starts, targets), len(segment_starts) - 1)]
+    edges = np.unique(np.concatenate([[0], cuts, [n_points]]))
+    return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+def _fit_points(points, start, stop):
+    """Fit the segments of points[:, start:stop] (rows: cost, reach, segment code)."""
+    cost = np.array(points[0, start:stop])
+    reach = np.array(points[1, start:stop])
+    codes = np.array(points[2, start:stop]).astype(np.int64)
+    return fit_negative_exponential(cost, reach, codes)
+
+def _fit_shard(points_path, start, stop):
+    """Worker task: memory-map the shared point file and fit one shard."""
+    points = np.load(points_path, mmap_mode='r')
+    try:
+        return _fit_points(points, start, stop)
+    finally:
+        # Release the mapping so the parent can delete the file (Windows)
+        del points
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def fit_curves_parallel(cost, reach, segment_codes, max_workers=None):
+    """
+    Parallel hub_curves.fit_negative_exponential() of at least one point:
+    same DataFrame (indexed by segment code), fitted shard by shard in worker
+    processes. max_workers=1 fits the shards in-process.
+    """
+    workers = max_workers or default_workers()
+
+    order = np.argsort(segment_codes, kind='stable')
+    points = np.empty((3, len(order)), dtype=np.float64)
+    points[0] = np.asarray(cost, dtype=np.float64)[order]
+    points[1] = np.asarray(reach, dtype=np.float64)[order]
+    points[2] = np.asarray(segment_codes)[order]
+
+    n_shards = max(workers * SHARDS_PER_WORKER, -(-len(order) // SHARD_MAX_POINTS))
+    bounds = shard_bounds(points[2], n_shards)
+    if workers == 1 or len(bounds) == 1:
+        blocks = [_fit_points(points, start, stop) for start, stop in bounds]
+        return pd.concat(blocks)
+
+    # Shared input: one memory-mapped file, read by every worker without copies
+    work_dir = tempfile.mkdtemp(prefix='hub_fitting_')
+    try:
+        points_path = os.path.join(work_dir, 'points.npy')
+        np.save(points_path, points)
+        del points
+
+        starts, stops = zip(*bounds)
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as executor:
+            blocks = list(executor.map(_fit_shard, [points_path] * len(bounds), starts, stops))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return pd.concat(blocks)
+
+# ============================================================================
+# CAMPAIGN SEGMENTS
+# ============================================================================
+
+def fit_segment_curves(df_campaigns, max_workers=None):
+    """Single parameter table (SEGMENT_PARAMETER_COLUMNS) for every campaign segment with enough campaigns."""
+    df = df_campaigns[SEGMENT_COLUMNS + ['Cost_parsed', 'Reach_parsed']]
+    df = df[(df['Cost_parsed'] > 0) & (df['Reach_parsed'] >= 0)]
+
+    codes = df.groupby(SEGMENT_COLUMNS, sort=True, observed=True, dropna=False).ngroup().to_numpy()
+    keep = np.bincount(codes, minlength=1)[codes] >= MIN_POINTS
+    if not keep.any():
+        return pd.DataFrame(columns=SEGMENT_PARAMETER_COLUMNS)
+
+    df = df[keep]
+    codes = codes[keep]
+    params = fit_curves_parallel(df['Cost_parsed'].to_numpy(), df['Reach_parsed'].to_numpy(), codes, max_workers)
+
+    labels = df[SEGMENT_COLUMNS].groupby(codes, sort=True).first()
+    table = params.join(labels)
+    return table[SEGMENT_PARAMETER_COLUMNS].reset_index(drop=True)
+
+def write_segment_curves(parameters, curve_path=SEGMENT_CURVE_PATH):
+    """Atomically write the segment parameter table (segment labels as str)."""
+    os.makedirs(os.path.dirname(curve_path) or '.', exist_ok=True)
+    table = parameters.copy()
+    for column in SEGMENT_COLUMNS:
+        table[column] = table[column].astype(str)
+    feather.write_feather(table, curve_path + '.tmp', compression='uncompressed')
+    os.replace(curve_path + '.tmp', curve_path)
+    return curve_path
+
+def load_segment_curves(curve_path=SEGMENT_CURVE_PATH):
+    """
+    ReachCurveModel over the written segment table - curve() / forecast() take
+    the SEGMENT_COLUMNS values as str. None until the table has been written.
+    """
+    if feather is None or not os.path.exists(curve_path):
+        return None
+    parameters = feather.read_feather(curve_path)
+    parameters['Level'] = 0
+    return ReachCurveModel(parameters, levels=[SEGMENT_COLUMNS])
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    from hub_cache import load_prepared_campaigns
+
+    if feather is None:
+        print("[ERROR] pyarrow is not installed - curve cache unavailable")
+        sys.exit(1)
+
+    workers = default_workers()
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+
+    df_campaigns = load_prepared_campaigns()
+
+    print(f"[FIT] Fitting {' x '.join(SEGMENT_COLUMNS)} curves on {workers} worker(s)...")
+    start = time.perf_counter()
+    parameters = fit_segment_curves(df_campaigns, max_workers=workers)
+    elapsed = time.perf_counter() - start
+
+    curve_path = write_segment_curves(parameters)
+    print(f"[OK] {len(parameters)} segments fitted in {elapsed:.2f} s, median R2 {parameters['R2'].median():.2f}")
+    print(f"[OK] Wrote {curve_path}")
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB GENERATOR - Seeded synthetic Google Ads exports at any row count
+Writes fake campaign metrics, age-gender, location and rolling-reach files
+with the column sets and formatting of the real exports, for scale testing
+of several markets / years without real data.
+
+Every synthetic campaign is a resampled real campaign (its template - a
+campaign of the campaign metrics export, or of the cleaned master file for
+hub_benchmark.py):
+- it gets a new Campaign ID (SYNTHETIC_ID_BASE + number) and ' #number'
+  appended to the template name, so brand / format / bid strategy parsing
+  of the name gives the real distributions,
+- its rows in every export are the template's rows (21 age x gender rows,
+  its countries, its 90-day windows; none where the template has none),
+- volumes (impressions, clicks, views, cost, conversions, reach) are the
+  template's times one seeded lognormal factor; ratios (CTR, CPM, CPC,
+  frequency) stay those of the template.
+
+Campaign number n is a pure function of (seed, n), so the exports agree on
+every campaign they share. Files are written block by block (BLOCK_CAMPAIGNS
+campaigns at a time) - memory does not grow with the row count.
+
+Money columns use the raw UI export style 'EUR 1,234.56' (money_style='eur')
+or the plain '1234.56' of the cleaned files (money_style='plain'); counts are
+'1,234,567', rates '0.56%'. The rolling sheet keeps its own plain format.
+
+Usage:
+    python hub_generator.py --rows 1000000                    # every export, 1M rows each
+    python hub_generator.py --rows 10000000 --exports age_gender --out /data/synthetic
+    python hub_generator.py --rows 50000 --seed 7 --plain-money
+"""
+
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from hub_cache import CACHE_DIR, CAMPAIGN_PATH
+from hub_schema import CONVERTERS, EXPORT_SCHEMAS, ExportSchema
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+GENERATED_EXPORTS = ['campaign_metrics', 'age_gender', 'location', 'rolling_sheet']
+
+# Templates = the campaigns of this export; the others are matched by Campaign ID
+TEMPLATE_EXPORT = 'campaign_metrics'
+
+SEED = 42
+OUTPUT_DIR = os.path.join(CACHE_DIR, "synthetic")
+
+# Synthetic Campaign IDs start here (real IDs are < 3e10)
+SYNTHETIC_ID_BASE = 90_000_000_000
+
+# Campaigns generated (and written) per block
+BLOCK_CAMPAIGNS = 5000
+
+# Spread of the per-campaign volume factor
+VOLUME_SIGMA = 0.5
+
+# Additive columns - scaled by the campaign factor; all other numbers are rates
+SCALED_COLUMNS = {'Impr.', 'Clicks', 'TrueView views', 'Cost', 'Conversions', 'Impressions', 'Reach',
+                  'Cost_Original', 'Cost_Original_Global', 'Peak_Reach'}
+
+# The cleaned master file (hub_data.load_campaign_data) - only generated, so its
+# numeric columns are declared here rather than in the hub_schema registry
+MASTER_SCHEMA = ExportSchema(CAMPAIGN_PATH, ';', {
+    'Campaign': 'text',
+    'Campaign ID': 'number',
+    'Impr.': 'count',
+    'Clicks': 'count',
+    'CTR': 'float',
+    'Avg. CPM': 'money',
+    'Avg. CPC': 'money',
+    'TrueView views': 'count',
+    'TrueView avg. CPV': 'money',
+    'Cost_Original': 'money',
+    'Conversions': 'float',
+    'Conv. rate': 'float',
+    'Cost / conv.': 'money',
+    'Cost': 'money',
+    'Peak_Reach': 'number',
+    'Cost_Original_Global': 'money',
+})
+
+SCHEMAS = {**EXPORT_SCHEMAS, 'campaign_master': MASTER_SCHEMA}
+
+MONEY_STYLES = ['eur', 'plain']
+
+# ============================================================================
+# TEMPLATES
+# ============================================================================
+
+ExportProfile = namedtuple('ExportProfile', [
+    'kind',
+    'columns',      # file columns, in order
+    'id_column',    # 'Campaign ID' / 'Campaign_ID'
+    'text',         # column -> object array of template cells (copied as written)
+    'values',       # column -> float array of parsed template values (re-formatted)
+    'integer',      # numeric columns whose template values are all whole numbers
+    'percent',      # float columns written as '0.56%'
+    'starts',       # first template row of every template campaign
+    'counts',       # number of template rows of every template campaign
+])
+
+def read_raw(file_path, delimiter=';'):
+    """An export as text, exactly as written (no NaN conversion)."""
+    return pd.read_csv(file_path, delimiter=delimiter, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+
+def _id_column(columns):
+    return 'Campaign ID' if 'Campaign ID' in columns else 'Campaign_ID'
+
+def build_profile(kind, template_ids, file_path=None):
+    """Template rows of one export, grouped by template campaign (order of template_ids)."""
+    schema = SCHEMAS[kind]
+    df = read_raw(file_path or schema.path, schema.delimiter)
+    id_column = _id_column(df.columns)
+
+    positions = pd.Index(template_ids).get_indexer(pd.to_numeric(df[id_column], errors='coerce'))
+    order = np.argsort(positions, kind='mergesort')
+    order = order[positions[order] >= 0]
+    df = df.iloc[order].reset_index(drop=True)
+    positions = positions[order]
+
+    counts = np.bincount(positions, minlength=len(template_ids))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    text, values, integer, percent = {}, {}, set(), set()
+    for column in df.columns:
+        kind_of_column = schema.columns.get(column, 'text')
+        numeric = kind_of_column in ('count', 'money', 'float') or (
+            kind_of_column == 'number' and column in SCALED_COLUMNS)
+        if column == id_column or not numeric:
+            text[column] = df[column].to_numpy(dtype=object)
+            continue
+        parsed = CONVERTERS[kind_of_column](df[column]).fillna(0).to_numpy(dtype=np.float64)
+        values[column] = parsed
+        if np.all(parsed == np.round(parsed)):
+            integer.add(column)
+        if kind_of_column == 'float' and df[column].str.endswith('%').any():
+            percent.add(column)
+
+    return ExportProfile(kind, list(df.columns), id_column, text, values, integer, percent, starts, counts)
+
+def build_profiles(kinds=GENERATED_EXPORTS, sources=None, template=TEMPLATE_EXPORT):
+    """
+    Profiles of the given exports (sources: kind -> file path, default the
+    project files); the campaigns of the `template` export are the templates.
+    """
+    sources = sources or {}
+    template_path = sources.get(template, SCHEMAS[template].path)
+    templates = read_raw(template_path, SCHEMAS[template].delimiter)
+    template_ids = pd.to_numeric(templates['Campaign ID']).to_numpy(dtype=np.int64)
+    return {kind: build_profile(kind, template_ids, sources.get(kind)) for kind in kinds}
+
+# ============================================================================
+# CAMPAIGNS
+# ============================================================================
+
+def campaign_block(block, n_templates, seed=SEED):
+    """Numbers, templates and volume factors of the campaigns of one block."""
+    rng = np.random.default_rng([seed, block])
+    numbers = np.arange(block * BLOCK_CAMPAIGNS, (block + 1) * BLOCK_CAMPAIGNS, dtype=np.int64)
+    templates = rng.integers(0, n_templates, BLOCK_CAMPAIGNS)
+    factors = rng.lognormal(0.0, VOLUME_SIGMA, BLOCK_CAMPAIGNS)
+    return numbers, templates, factors
+
+# ============================================================================
+# FORMATTING
+# ============================================================================
+
+def _trim(text):
+    """'7799.00' -> '7799', '0.50' -> '0.5' (how the exports write decimals)."""
+    return text.rstrip('0').rstrip('.') if '.' in text else text
+
+def format_count(values):
+    """'1,234,567'"""
+    return [f"{value:,}" for value in np.rint(values).astype(np.int64).tolist()]
+
+def format_money(values, money_style='eur'):
+    """'EUR 1,234.56' (UI export) or '1234.56' (cleaned files)."""
+    if money_style == 'eur':
+        return [f"EUR {value:,.2f}" for value in values.tolist()]
+    return [_trim(f"{value:.2f}") for value in values.tolist()]
+
+def format_float(values, percent=False):
+    """'0.56%' or '6,036.24'"""
+    if percent:
+        return [f"{value:.2f}%" for value in values.tolist()]
+    return [_trim(f"{value:,.2f}") for value in values.tolist()]
+
+def format_sheet_number(values, integer=False):
+    """Rolling sheet: '1150315' or '1600.201855'"""
+    if integer:
+        return np.rint(values).astype(np.int64).astype(str)
+    return [f"{value:.6f}" for value in values.tolist()]
+
+# ============================================================================
+# EXPORT ROWS
+# ============================================================================
+
+def export_block(profile, numbers, templates, factors, money_style='eur'):
+    """Rows (as text) of one block of campaigns in one export."""
+    counts = profile.counts[templates]
+    total = int(counts.sum())
+    campaign = np.repeat(np.arange(len(templates)), counts)
+    rows = np.repeat(profile.starts[templates], counts) + (np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts))
+
+    kinds = SCHEMAS[profile.kind].columns
+    data = {}
+    for column in profile.columns:
+        if column == profile.id_column:
+            data[column] = (SYNTHETIC_ID_BASE + numbers[campaign]).astype(str)
+        elif column == 'Campaign':
+            data[column] = pd.Series(profile.text[column][rows]) + ' #' + numbers[campaign].astype(str)
+        elif column in profile.values:
+            values = profile.values[column][rows]
+            if column in SCALED_COLUMNS:
+                values = values * factors[campaign]
+            kind = kinds[column]
+            if kind == 'count':
+                data[column] = format_count(values)
+            elif kind == 'money':
+                data[column] = format_money(values, money_style)
+            elif kind == 'float':
+                data[column] = format_float(values, column in profile.percent)
+            else:
+                data[column] = format_sheet_number(values, column in profile.integer)
+        else:
+            data[column] = profile.text[column][rows]
+
+    return pd.DataFrame(data, columns=profile.columns)
+
+def write_export(profile, file_path, rows, seed=SEED, money_style='eur'):
+    """Stream `rows` rows of one export to file_path, block by block. Returns campaign numbers used."""
+    if money_style not in MONEY_STYLES:
+        raise ValueError(f"money_style must be one of {MONEY_STYLES}, not {money_style!r}")
+    if profile.counts.sum() == 0:
+        raise ValueError(f"{profile.kind}: no template rows match the template campaigns")
+
+    delimiter = SCHEMAS[profile.kind].delimiter
+    written, campaigns, block = 0, 0, 0
+    with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+        pd.DataFrame(columns=profile.columns).to_csv(f, sep=delimiter, index=False, lineterminator='\n')
+        while written < rows:
+            numbers, templates, factors = campaign_block(block, len(profile.counts), seed)
+            chunk = export_block(profile, numbers, templates, factors, money_style).iloc[:rows - written]
+            chunk.to_csv(f, sep=delimiter, index=False, header=False, lineterminator='\n')
+            written += len(chunk)
+            if len(chunk):
+                campaigns = int(chunk[profile.id_column].iloc[-1]) - SYNTHETIC_ID_BASE + 1
+            del chunk
+            block += 1
+    return campaigns
+
+def generate_exports(out_dir=OUTPUT_DIR, rows=100_000, seed=SEED, money_style='eur',
+                     kinds=GENERATED_EXPORTS, sources=None, log=print):
+    """
+    Write every requested export with `rows` rows (int, or dict kind -> rows).
+    File names are those of the real exports. Returns {kind: path}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    profiles = build_profiles(kinds, sources)
+
+    paths = {}
+    for kind in kinds:
+        n_rows = rows[kind] if isinstance(rows, dict) else rows
+        paths[kind] = os.path.join(out_dir, os.path.basename(SCHEMAS[kind].path))
+        start = time.perf_counter()
+        campaigns = write_export(profiles[kind], paths[kind], n_rows, seed, money_style)
+        log(f"[OK] {kind}: {n_rows:,} rows from campaigns 0-{campaigns - 1:,} in "
+            f"{time.perf_counter() - start:.1f} s -> {paths[kind]}")
+    return paths
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def option_values(name, argv=None):
+    """Values after a command line option: ['1', '10'] for '--scales 1 10'."""
+    argv = sys.argv if argv is None else argv
+    position = argv.index(name) + 1
+    values = []
+    while position < len(argv) and not argv[position].startswith('--'):
+        values.append(argv[position])
+        position += 1
+    return values
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    rows = int(option_values('--rows')[0]) if '--rows' in sys.argv else 100_000
+    seed = int(option_values('--seed')[0]) if '--seed' in sys.argv else SEED
+    out_dir = option_values('--out')[0] if '--out' in sys.argv else OUTPUT_DIR
+    kinds = option_values('--exports') if '--exports' in sys.argv else GENERATED_EXPORTS
+    money_style = 'plain' if '--plain-money' in sys.argv else 'eur'
+
+    unknown = [kind for kind in kinds if kind not in GENERATED_EXPORTS]
+    if unknown:
+        print(f"[ERROR] Unknown exports {unknown} - choose from {GENERATED_EXPORTS}")
+        sys.exit(1)
+
+    generate_exports(out_dir, rows, seed, money_style, kinds)
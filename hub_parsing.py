@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB PARSING - Shared numeric parsing for Google Ads exports
+Vectorized replacements for the per-cell parse_cost / parse_number / parse_float
+helpers that every script used to re-implement.
+
+Column functions (parse_cost_series, parse_number_series, parse_float_series)
+turn whole columns of "EUR 1,234.56", "12.3%" and "--" strings into numbers
+with pandas string operations and NumPy, and produce EXACTLY the same values
+as the scalar helpers (which are kept here for single-value call sites).
+"""
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# SCALAR HELPERS (reference semantics)
+# ============================================================================
+
+def parse_cost(value):
+    """Parse cost values."""
+    if pd.isna(value):
+        return 0.0
+    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
+    try:
+        return float(value_str)
+    except:
+        return 0.0
+
+def parse_number(value):
+    """Parse numeric values."""
+    if pd.isna(value):
+        return 0
+    value_str = str(value).strip().replace(',', '').strip()
+    try:
+        return int(float(value_str))
+    except:
+        return 0
+
+def parse_float(value):
+    """Parse float values."""
+    if pd.isna(value):
+        return 0.0
+    value_str = str(value).strip().replace(',', '').replace('%', '').strip()
+    try:
+        return float(value_str)
+    except:
+        return 0.0
+
+# ============================================================================
+# VECTORIZED COLUMN PARSERS
+# ============================================================================
+
+_SEPARATOR = '\x00'
+
+def _clean_strings(series, tokens):
+    """
+    Remove the given tokens from every cell of a column, returning an object array.
+
+    All cells are joined into ONE Python string so each token is removed with
+    a single C-level str.replace instead of one call per cell. Surrounding
+    whitespace is left in place - float() ignores it exactly like .strip().
+    """
+    values = series.to_numpy(dtype=object)
+
+    if pd.api.types.infer_dtype(values, skipna=False) != 'string':
+        values = np.array([str(v) for v in values], dtype=object)
+
+    joined = _SEPARATOR.join(values)
+
+    if joined.count(_SEPARATOR) != len(values) - 1:
+        # Separator appears inside a cell - fall back to per-cell replacement
+        cleaned = pd.Series(values, dtype=object)
+        for token in tokens:
+            cleaned = cleaned.str.replace(token, '', regex=False)
+        return cleaned.to_numpy(dtype=object)
+
+    for token in tokens:
+        joined = joined.replace(token, '')
+
+    return np.array(joined.split(_SEPARATOR), dtype=object)
+
+def _float_or_zero(value_str):
+    """float() of an already cleaned string, 0.0 if it is not a number."""
+    try:
+        return float(value_str)
+    except:
+        return 0.0
+
+def _strings_to_float(values):
+    """
+    Convert cleaned strings to float64 with Python float() semantics.
+
+    Fast path: a single NumPy object -> float64 cast (calls float() in C for
+    every cell). If any cell is not a valid number ("--", "N/A", ...), only
+    those cells are parsed one by one.
+    """
+    try:
+        return values.astype(np.float64)
+    except (ValueError, TypeError):
+        pass
+
+    # Locate unparseable cells with a coercing pass, parse the rest in bulk
+    coerced = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64)
+    bad = np.isnan(coerced)
+
+    result = np.empty(len(values), dtype=np.float64)
+    try:
+        result[~bad] = values[~bad].astype(np.float64)
+    except (ValueError, TypeError):
+        return np.array([_float_or_zero(v) for v in values], dtype=np.float64)
+
+    result[bad] = [_float_or_zero(v) for v in values[bad]]
+    return result
+
+def _parse_series(series, tokens):
+    """Shared driver: null -> 0.0, numeric dtypes pass through, strings are cleaned."""
+    result = np.zeros(len(series), dtype=np.float64)
+
+    if len(series) == 0:
+        return result
+
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        # Already numeric (pandas inferred it) - str() round-trips exactly
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.where(np.isnan(values), 0.0, values)
+
+    mask = series.notna().to_numpy()
+    if mask.any():
+        cleaned = _clean_strings(series[mask], tokens)
+        result[mask] = _strings_to_float(cleaned)
+
+    return result
+
+def parse_cost_series(series):
+    """
+    Vectorized parse_cost for a whole column.
+    'EUR 1,234.56' -> 1234.56, '--' -> 0.0, NaN -> 0.0
+    """
+    values = _parse_series(series, ['EUR', ','])
+    return pd.Series(values, index=series.index, dtype=np.float64)
+
+def parse_float_series(series):
+    """
+    Vectorized parse_float for a whole column.
+    '12.3%' -> 12.3, '1,092.5' -> 1092.5, '--' -> 0.0, NaN -> 0.0
+    """
+    values = _parse_series(series, [',', '%'])
+    return pd.Series(values, index=series.index, dtype=np.float64)
+
+def parse_number_series(series):
+    """
+    Vectorized parse_number for a whole column.
+    '4,956,859' -> 4956859, '12.9' -> 12 (truncated like int()), '--' -> 0
+    NaN / inf (which int() rejects) become 0.
+    """
+    values = _parse_series(series, [','])
+    values = np.where(np.isfinite(values), np.trunc(values), 0.0)
+    return pd.Series(values.astype(np.int64), index=series.index)
+
+# ============================================================================
+# EXPORT DATES ('15 Apr 2025')
+# ============================================================================
+
+def parse_export_dates_series(series):
+    """pd.to_datetime(value, dayfirst=True) of every value - parsed once per distinct value."""
+    codes, uniques = pd.factorize(series)
+    parsed = pd.DatetimeIndex([pd.to_datetime(value, dayfirst=True, errors='coerce') for value in uniques])
+    values = parsed.take(codes, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(values, index=series.index)
+
+# ============================================================================
+# DATE RANGES ('Jan-Mar 25', 'Oct 25')
+# ============================================================================
+
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+QUARTER_MONTHS = [
+    ('Q1 2025', ['jan', 'feb', 'mar']),
+    ('Q2 2025', ['apr', 'may', 'jun']),
+    ('Q3 2025', ['jul', 'aug', 'sep']),
+    ('Q4 2025', ['oct', 'nov', 'dec']),
+]
+
+# '<mon>[-<mon>] <yy|yyyy>'
+_DATE_RANGE_PATTERN = r'^\s*([a-z]{3})\s*(?:-\s*([a-z]{3})\s*)?\s(\d{2}|\d{4})\s*$'
+
+def extract_quarter(date_range):
+    """Quarter label of a Date_Range value (first quarter with a matching month)."""
+    if pd.isna(date_range):
+        return 'Unknown'
+    date_str = str(date_range).lower()
+
+    for quarter, months in QUARTER_MONTHS:
+        if any(month in date_str for month in months):
+            if '25' in date_str:
+                return quarter
+
+    return 'Unknown'
+
+def extract_quarter_series(series):
+    """
+    Vectorized extract_quarter for a whole column (same labels).
+    One substring mask per month instead of a Python loop per value.
+    """
+    lower = series.str.lower()
+    has_year = lower.str.contains('25', regex=False, na=False).to_numpy()
+
+    conditions = []
+    for _, months in QUARTER_MONTHS:
+        mask = np.zeros(len(series), dtype=bool)
+        for month in months:
+            mask |= lower.str.contains(month, regex=False, na=False).to_numpy()
+        conditions.append(mask & has_year)
+
+    labels = [quarter for quarter, _ in QUARTER_MONTHS]
+    return pd.Series(np.select(conditions, labels, default='Unknown'), index=series.index, dtype=object)
+
+def _parse_date_range_values(values):
+    """Typed date columns for an array of distinct Date_Range strings."""
+    values = pd.Series(values, dtype=object)
+    parts = values.str.lower().str.extract(_DATE_RANGE_PATTERN)
+
+    month_numbers = {month: number for number, month in enumerate(MONTHS, start=1)}
+    start_month = parts[0].map(month_numbers)
+    end_month = parts[1].fillna(parts[0]).map(month_numbers)
+
+    year = pd.to_numeric(parts[2], errors='coerce')
+    year = year.where(year >= 100, year + 2000)
+
+    valid = (start_month.notna() & end_month.notna() & year.notna()).to_numpy()
+    start_month = start_month.to_numpy(dtype=np.float64)
+    end_month = end_month.to_numpy(dtype=np.float64)
+    year = year.to_numpy(dtype=np.float64)
+
+    # A range that wraps the year ('Oct-Feb 24') ends in the following year
+    end_year = year + (end_month < start_month)
+
+    # Months since 1970-01 -> datetime64 (first day of the month)
+    start_dates = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[ns]')
+    end_dates = start_dates.copy()
+    start_index = ((year - 1970) * 12 + start_month - 1)[valid].astype(np.int64)
+    end_index = ((end_year - 1970) * 12 + end_month)[valid].astype(np.int64)
+    start_dates[valid] = start_index.astype('datetime64[M]').astype('datetime64[ns]')
+    end_dates[valid] = (end_index.astype('datetime64[M]').astype('datetime64[D]') - 1).astype('datetime64[ns]')
+
+    years = pd.array(np.where(valid, year, 0).astype(np.int64), dtype='Int64')
+    years[~valid] = pd.NA
+
+    return start_dates, end_dates, years, extract_quarter_series(values).to_numpy(dtype=object)
+
+def parse_date_range_series(series):
+    """
+    Parse a Date_Range column into typed columns in one vectorized pass.
+
+    Returns a DataFrame (same index) with:
+        Range_Start - first day of the start month (datetime64, NaT if unparsed)
+        Range_End   - last day of the end month; a range that wraps the year
+                      ('Oct-Feb 24') ends in the following year
+        Year        - year of the start month (nullable Int64)
+        Quarter     - extract_quarter() label
+
+    Named Range_* because the master file already has exact-day Start_Date /
+    End_Date text columns, which are kept as they are.
+
+    'Mar 25' is a single-month range, 2-digit years are 20yy. A column only
+    holds a few dozen distinct ranges, so each distinct value is parsed once.
+    """
+    codes, uniques = pd.factorize(series)
+    start_dates, end_dates, years, quarters = _parse_date_range_values(np.append(uniques.astype(object), None))
+
+    # Code -1 (missing value) picks the trailing None entry
+    codes = np.where(codes < 0, len(uniques), codes)
+
+    return pd.DataFrame({
+        'Range_Start': start_dates[codes],
+        'Range_End': end_dates[codes],
+        'Year': years[codes],
+        'Quarter': quarters[codes],
+    }, index=series.index)
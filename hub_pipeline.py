@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB PIPELINE - Declarative build of MASTER_ADS_HR_CLEANED.csv
+Replaces the hand-run chain of merge scripts with a DAG of steps that declare
+their input and output files:
+
+    master_merge_v3_full_backup ─┬─ create_hr_prototype_v3        (report only)
+                                 └─ deep_cleaning_mcdonalds_kaufland
+                                      └─ mega_merge_standardization_v4
+                                           └─ update_formats_from_cleaned
+                                                └─ create_master_file
+                                                     └─ hub_fitting   (segment curves)
+
+- A step runs only when the content (SHA-256) of one of its inputs - including
+  its own script and every local module it imports (hub_data,
+  hub_standardization, ...) - changed, or its outputs are not the files it
+  wrote last time. An unchanged output of a re-run step does not re-run its
+  dependants.
+- Steps whose dependencies are done run concurrently (independent branches).
+- Fingerprints are kept in .hub_cache/pipeline.json; step output goes to
+  .hub_cache/pipeline_logs/<step>.log.
+
+Usage:
+    python hub_pipeline.py [--dry-run] [--force] [--workers N]
+"""
+
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from hub_cache import CACHE_DIR, file_sha256
+from hub_fitting import SEGMENT_CURVE_PATH
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+PIPELINE_VERSION = 2
+MANIFEST_FILE = "pipeline.json"
+LOG_DIR = "pipeline_logs"
+
+RAW_MASTER = "ads_estimation_hub_V3_MASTER_BACKUP_RAW.csv"
+HR_CLEANED = "ads_estimation_hub_HR_PROTOTYPE_V3_CLEANED.csv"
+HR_STANDARDIZED = "ads_estimation_hub_HR_PROTOTYPE_V4_STANDARDIZED.csv"
+FORMAT_FIXES = "other-format-cleaned.csv"
+MASTER_FILE = "MASTER_ADS_HR_CLEANED.csv"
+
+PATH_COUNTRY = "data - v3/campaign - country - v3/campaign location - version 3.csv"
+PATH_AGE_GENDER = "data - v3/age - gender - v3/campaign age - gender - version 3.csv"
+
+PipelineStep = namedtuple('PipelineStep', ['name', 'script', 'inputs', 'outputs'])
+
+# Steps in run order; dependencies follow from the declared files
+PIPELINE_STEPS = [
+    PipelineStep(
+        'master_merge', 'master_merge_v3_full_backup.py',
+        inputs=[
+            "data - v3/campaign - metrics - v3/campaign metrics - version 3 - no segmentation - all campaigns.csv",
+            "data - v3/campaign - metrics - v3/campaign metrics - version 3 - segmented by ad format - only youtube campaigns.csv",
+            PATH_COUNTRY,
+            PATH_AGE_GENDER,
+            "data - v3/campaign - interests - v3/campaign - audience segements or interests - version 3.csv",
+            "data - v3/campaign - duration - v3/campaign - duration - version 3.csv",
+            "data - v3/campaign reach - frequency - v3/campaign - reach - frequency - q1 - version 3.csv",
+            "data - v3/campaign reach - frequency - v3/campaign - reach - frequency - q2 - version 3.csv",
+            "data - v3/campaign reach - frequency - v3/campaign - reach - frequency - q3 - version 3.csv",
+            "data - v3/campaign reach - frequency - v3/campaign - reach - frequency - q4 - version.csv",
+        ],
+        outputs=[RAW_MASTER],
+    ),
+    PipelineStep(
+        'hr_prototype', 'create_hr_prototype_v3.py',
+        inputs=[RAW_MASTER],
+        outputs=["ads_estimation_hub_HR_PROTOTYPE_V3.csv"],
+    ),
+    PipelineStep(
+        'deep_cleaning', 'deep_cleaning_mcdonalds_kaufland.py',
+        inputs=[PATH_COUNTRY, RAW_MASTER],
+        outputs=[HR_CLEANED],
+    ),
+    PipelineStep(
+        'standardization', 'mega_merge_standardization_v4.py',
+        inputs=[
+            HR_CLEANED,
+            "data - v3/campaign - bidding strategies - v3/campaign - bidding strategies - version 3.csv",
+            PATH_AGE_GENDER,
+        ],
+        outputs=[HR_STANDARDIZED],
+    ),
+    PipelineStep(
+        'format_update', 'update_formats_from_cleaned.py',
+        inputs=[FORMAT_FIXES, HR_STANDARDIZED],
+        outputs=[HR_STANDARDIZED, "ads_estimation_hub_HR_PROTOTYPE_V4_STANDARDIZED_BACKUP.csv"],
+    ),
+    PipelineStep(
+        'master_file', 'create_master_file.py',
+        inputs=[HR_STANDARDIZED, FORMAT_FIXES],
+        outputs=["BACKUP_ADS_HR_PRE_CLEANUP.csv", MASTER_FILE],
+    ),
+    PipelineStep(
+        'segment_curves', 'hub_fitting.py',
+        inputs=[MASTER_FILE, PATH_AGE_GENDER],
+        outputs=[SEGMENT_CURVE_PATH],
+    ),
+]
+
+# ============================================================================
+# DAG
+# ============================================================================
+
+def step_dependencies(steps):
+    """Step name -> names of the steps it waits for (the last earlier writer of each input)."""
+    dependencies = {}
+    last_writer = {}
+    for step in steps:
+        dependencies[step.name] = sorted({last_writer[path] for path in step.inputs if path in last_writer})
+        for path in step.outputs:
+            last_writer[path] = step.name
+    return dependencies
+
+# ============================================================================
+# FINGERPRINTS
+# ============================================================================
+
+class FileHasher:
+    """Content hashes of pipeline files; size + mtime matching a recorded fingerprint skips the re-hash."""
+
+    def __init__(self, root, manifest):
+        self.root = root
+        self.known = {}
+        for record in manifest.get('steps', {}).values():
+            for section in ('inputs', 'outputs'):
+                for path, fingerprint in record.get(section, {}).items():
+                    if fingerprint is not None:
+                        self.known[(path, fingerprint['size'], fingerprint['mtime_ns'])] = fingerprint['sha256']
+
+    def fingerprint(self, path):
+        """Size, mtime and SHA-256 of a file (None if missing)."""
+        full_path = os.path.join(self.root, path)
+        if not os.path.exists(full_path):
+            return None
+        stat = os.stat(full_path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        if key not in self.known:
+            self.known[key] = file_sha256(full_path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': self.known[key]}
+
+    def digest(self, path):
+        fingerprint = self.fingerprint(path)
+        return None if fingerprint is None else fingerprint['sha256']
+
+def script_modules(script, root='.'):
+    """
+    Local modules (<name>.py next to the scripts) a script imports, directly
+    or through other local modules. Sorted paths relative to root.
+    """
+    seen, pending = {script}, [script]
+    while pending:
+        path = pending.pop()
+        try:
+            with open(os.path.join(root, path), 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError, ValueError):
+            continue  # missing / broken script: its own hash already marks the step stale
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module = name.split('.')[0] + '.py'
+                if module not in seen and os.path.exists(os.path.join(root, module)):
+                    seen.add(module)
+                    pending.append(module)
+
+    return sorted(seen - {script})
+
+def step_sources(step, root='.'):
+    """Code a step depends on: its script and the local modules it imports."""
+    return [step.script] + script_modules(step.script, root)
+
+def _recorded_digest(record, section, path):
+    fingerprint = record.get(section, {}).get(path) if record else None
+    return None if fingerprint is None else fingerprint['sha256']
+
+def _expected_output(steps, manifest, step, path):
+    """
+    Content a step's output should have now: what the step wrote, carried
+    through later steps that rewrite the same file in place.
+    """
+    records = manifest.get('steps', {})
+    expected = _recorded_digest(records.get(step.name), 'outputs', path)
+    later = steps[[s.name for s in steps].index(step.name) + 1:]
+    for writer in later:
+        if path in writer.inputs and path in writer.outputs:
+            record = records.get(writer.name)
+            if record and _recorded_digest(record, 'inputs', path) == expected:
+                expected = _recorded_digest(record, 'outputs', path)
+    return expected
+
+def stale_reason(steps, manifest, step, hasher):
+    """Why a step must run (None when it is up to date)."""
+    record = manifest.get('steps', {}).get(step.name)
+    if record is None:
+        return "never built"
+
+    for path in step_sources(step, hasher.root) + step.inputs:
+        if path in step.outputs:
+            continue  # in-place file: checked as an output below
+        if hasher.digest(path) != _recorded_digest(record, 'inputs', path):
+            return f"input changed: {path}"
+
+    for path in step.outputs:
+        current = hasher.digest(path)
+        if current is None:
+            return f"output missing: {path}"
+        if current != _expected_output(steps, manifest, step, path):
+            return f"output modified: {path}"
+    return None
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+
+def load_manifest(cache_dir=CACHE_DIR):
+    """Recorded step fingerprints (empty for a first build or another pipeline version)."""
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'version': PIPELINE_VERSION, 'steps': {}}
+    if manifest.get('version') != PIPELINE_VERSION:
+        return {'version': PIPELINE_VERSION, 'steps': {}}
+    return manifest
+
+def write_manifest(manifest, cache_dir=CACHE_DIR):
+    """Atomic manifest write."""
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def _run_script(step, root, log_path):
+    """Run one step script in its own interpreter; returns (exit code, seconds)."""
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        result = subprocess.run([sys.executable, step.script], cwd=root, env=env,
+                                stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode, time.perf_counter() - start
+
+def run_pipeline(steps=PIPELINE_STEPS, root='.', cache_dir=None, max_workers=None,
+                 force=False, dry_run=False, log=print):
+    """
+    Bring every step up to date. Returns {step name: status} with status one of
+    'skipped', 'built', 'failed', 'blocked' (a dependency failed) or 'stale' (dry run).
+    """
+    cache_dir = cache_dir or os.path.join(root, CACHE_DIR)
+    log_dir = os.path.join(cache_dir, LOG_DIR)
+    os.makedirs(log_dir, exist_ok=True)
+
+    manifest = load_manifest(cache_dir)
+    hasher = FileHasher(root, manifest)
+    dependencies = step_dependencies(steps)
+    by_name = {step.name: step for step in steps}
+
+    status = {}
+    running = {}
+    input_fingerprints = {}
+
+    def ready_steps():
+        for step in steps:
+            if step.name in status or step.name in running.values():
+                continue
+            if all(status.get(dependency) in ('skipped', 'built', 'stale') for dependency in dependencies[step.name]):
+                yield step
+            elif any(status.get(dependency) in ('failed', 'blocked') for dependency in dependencies[step.name]):
+                status[step.name] = 'blocked'
+                log(f"[BLOCKED] {step.name}: a dependency failed")
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(steps)) as executor:
+        while True:
+            ready = list(ready_steps())
+            for step in ready:
+                upstream_stale = any(status[dependency] == 'stale' for dependency in dependencies[step.name])
+                reason = "forced" if force else ("upstream stale" if upstream_stale else stale_reason(steps, manifest, step, hasher))
+
+                if reason is None:
+                    status[step.name] = 'skipped'
+                    log(f"[SKIP] {step.name}: up to date")
+                elif dry_run:
+                    status[step.name] = 'stale'
+                    log(f"[STALE] {step.name}: {reason}")
+                else:
+                    log(f"[RUN] {step.name}: {reason}")
+                    input_fingerprints[step.name] = {path: hasher.fingerprint(path)
+                                                     for path in step_sources(step, root) + step.inputs}
+                    future = executor.submit(_run_script, step, root, os.path.join(log_dir, f"{step.name}.log"))
+                    running[future] = step.name
+
+            if not running:
+                if ready:
+                    continue  # skipped / dry-run steps may have unblocked dependants
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                step = by_name[name]
+                returncode, elapsed = future.result()
+                outputs = {path: hasher.fingerprint(path) for path in step.outputs}
+
+                if returncode != 0 or any(fingerprint is None for fingerprint in outputs.values()):
+                    status[name] = 'failed'
+                    manifest['steps'].pop(name, None)
+                    log(f"[FAIL] {name}: exit code {returncode} after {elapsed:.1f} s "
+                        f"(see {os.path.join(log_dir, name + '.log')})")
+                else:
+                    status[name] = 'built'
+                    manifest['steps'][name] = {'inputs': input_fingerprints[name], 'outputs': outputs}
+                    log(f"[OK] {name}: {elapsed:.1f} s")
+
+                if not dry_run:
+                    write_manifest(manifest, cache_dir)
+
+    # Steps further down a failed branch
+    for step in steps:
+        if step.name not in status:
+            status[step.name] = 'blocked'
+            log(f"[BLOCKED] {step.name}: a dependency failed")
+    return status
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    workers = None
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+
+    start = time.perf_counter()
+    status = run_pipeline(max_workers=workers, force='--force' in sys.argv, dry_run='--dry-run' in sys.argv)
+    elapsed = time.perf_counter() - start
+
+    counts = {state: list(status.values()).count(state) for state in sorted(set(status.values()))}
+    print(f"[DONE] {', '.join(f'{count} {state}' for state, count in counts.items())} in {elapsed:.1f} s")
+    if any(state in ('failed', 'blocked') for state in status.values()):
+        sys.exit(1)
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB ROLLING - Persistent rolling-reach store (90-day windows)
+Keeps every ingested 90-day window row plus per-campaign running aggregates
+(peak Reach, Avg_Frequency sum / count) in the local cache directory.
+
+Ingesting a file appends ONLY the windows the store has not seen yet
+(key: Campaign_ID + Window_Start + Window_End) and folds just those rows into
+the per-campaign aggregates - the full window history is never regrouped.
+New windows are written as a partition file of their own; stored partitions
+are never rewritten, and deduplication reads only their (memory-mapped) key
+columns. A source file whose fingerprint is unchanged is not even read.
+
+Windows are append-only: a window that is already stored keeps its values.
+Use --rebuild after a correction of historical windows.
+
+Usage (after every Google Ads rolling-script export):
+    python hub_rolling.py                     # sync MASTER_ROLLING_DATA_2025_CLEAN.csv
+    python hub_rolling.py export1.csv ...     # ingest additional export files
+    python hub_rolling.py --rebuild           # drop the store and re-ingest
+"""
+
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+from hub_cache import CACHE_DIR, source_fingerprint, source_unchanged
+from hub_schema import read_export
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+STORE_VERSION = 2
+ROLLING_REACH_PATH = "MASTER_ROLLING_DATA_2025_CLEAN.csv"
+
+# One Feather partition per sync that added windows (listed in the metadata)
+WINDOWS_DIR = "rolling_windows"
+AGGREGATES_FILE = "rolling_aggregates.feather"
+META_FILE = "rolling_store.json"
+
+# One row per campaign per 90-day window
+WINDOW_KEY = ['Campaign_ID', 'Window_Start', 'Window_End']
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def read_rolling_export(file_path):
+    """Read a rolling-script export / master rolling file with typed key and metric columns."""
+    df = read_export('rolling_sheet', file_path)
+    df = df.dropna(subset=['Campaign_ID'])
+    df['Campaign_ID'] = df['Campaign_ID'].astype(np.int64)
+    return df
+
+def aggregate_windows(df_windows):
+    """Per-campaign running aggregates of a set of window rows."""
+    return df_windows.groupby('Campaign_ID').agg(
+        Peak_Reach=('Reach', 'max'),
+        Frequency_Sum=('Avg_Frequency', 'sum'),
+        Frequency_Count=('Avg_Frequency', 'count'),
+    )
+
+def merge_aggregates(old, new):
+    """Fold new per-campaign aggregates into the stored ones (O(campaigns))."""
+    if old is None or len(old) == 0:
+        return new
+    combined = pd.concat([old, new])
+    return combined.groupby(level=0).agg({
+        'Peak_Reach': 'max',
+        'Frequency_Sum': 'sum',
+        'Frequency_Count': 'sum',
+    })
+
+# ============================================================================
+# S-CURVE SATURATION
+# ============================================================================
+
+# A campaign saturates when late growth < SATURATION_RATIO * early growth
+SATURATION_RATIO = 0.5
+
+def saturation_analysis(df_rolling):
+    """
+    Reach growth between consecutive 90-day windows for EVERY campaign, in one
+    grouped pass (no per-campaign filtering).
+
+    Per campaign (windows ordered by Window_Start):
+        growth_i = (Reach_i - Reach_i-1) / Reach_i-1 * 100, only where Reach_i-1 > 0
+        early / late growth = mean of the first / second half of those rates
+        Saturation = 'Yes' if late growth < early growth * SATURATION_RATIO
+
+    Campaigns need >= 3 windows and >= 2 growth rates, like the original loop.
+    Returns one row per analysed campaign, ordered by Campaign_ID.
+    """
+    df = df_rolling.sort_values(['Campaign_ID', 'Window_Start'], kind='mergesort')
+    campaign_ids = df['Campaign_ID'].to_numpy()
+    reach_values = df['Reach'].to_numpy()
+    reach = reach_values.astype(np.float64)
+
+    # Previous window of the SAME campaign (first window of a campaign has none)
+    same_campaign = np.zeros(len(df), dtype=bool)
+    same_campaign[1:] = campaign_ids[1:] == campaign_ids[:-1]
+    previous = np.full(len(df), np.nan)
+    previous[1:] = reach[:-1]
+    has_rate = same_campaign & (previous > 0)
+
+    rate_campaigns = campaign_ids[has_rate]
+    growth = (reach[has_rate] - previous[has_rate]) / previous[has_rate] * 100
+
+    # Position of each rate within its campaign -> early (first half) / late
+    new_campaign = np.ones(len(growth), dtype=bool)
+    new_campaign[1:] = rate_campaigns[1:] != rate_campaigns[:-1]
+    campaign_starts = np.flatnonzero(new_campaign)
+    rate_count = np.diff(np.append(campaign_starts, len(growth)))
+    position = np.arange(len(growth)) - np.repeat(campaign_starts, rate_count)
+    late = position >= np.repeat(rate_count // 2, rate_count)
+
+    # Contiguous (campaign, half) blocks -> block sums (NaN propagates like np.mean)
+    new_block = new_campaign.copy()
+    new_block[1:] |= late[1:] != late[:-1]
+    block_starts = np.flatnonzero(new_block)
+    block_means = np.add.reduceat(growth, block_starts) / np.diff(np.append(block_starts, len(growth))) \
+        if len(growth) > 0 else growth
+
+    halves = pd.DataFrame({
+        'Campaign_ID': rate_campaigns[block_starts],
+        'Late': late[block_starts],
+        'Growth': block_means,
+    }).pivot(index='Campaign_ID', columns='Late', values='Growth')
+    halves = halves.reindex(columns=[False, True])
+    halves.columns = ['Early_Growth', 'Late_Growth']
+    halves['Rates'] = pd.Series(rate_count, index=rate_campaigns[campaign_starts])
+
+    # Per-campaign window stats from group boundaries of the sorted arrays
+    # (maximum.reduceat propagates NaN like reaches.max() did)
+    starts = np.flatnonzero(~same_campaign)
+    ends = np.append(starts[1:], len(df))
+    windows = pd.DataFrame({
+        'Campaign': df['Campaign'].to_numpy()[starts],
+        'Brand': df['Brand'].to_numpy()[starts],
+        'Windows': ends - starts,
+        'Initial_Reach': reach_values[starts],
+        'Peak_Reach': np.maximum.reduceat(reach_values, starts) if len(df) > 0 else reach_values,
+        'Final_Reach': reach_values[ends - 1],
+    }, index=pd.Index(campaign_ids[starts], name='Campaign_ID'))
+
+    result = windows.join(halves, how='inner')
+    result = result[(result['Windows'] >= 3) & (result['Rates'] >= 2)]
+
+    saturated = result['Late_Growth'] < result['Early_Growth'] * SATURATION_RATIO
+    return pd.DataFrame({
+        'Campaign_ID': result.index.to_numpy(),
+        'Campaign': result['Campaign'].to_numpy(),
+        'Brand': result['Brand'].to_numpy(),
+        'Windows': result['Windows'].to_numpy(),
+        'Initial_Reach': result['Initial_Reach'].to_numpy(),
+        'Peak_Reach': result['Peak_Reach'].to_numpy(),
+        'Final_Reach': result['Final_Reach'].to_numpy(),
+        'Early_Growth_%': result['Early_Growth'].round(2).to_numpy(),
+        'Late_Growth_%': result['Late_Growth'].round(2).to_numpy(),
+        'Saturation': np.where(saturated, 'Yes', 'No'),
+    })
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class RollingReachStore:
+    """Window partitions + per-campaign aggregates persisted as Feather files."""
+
+    def __init__(self, store_dir=CACHE_DIR):
+        self.store_dir = store_dir
+        self.windows_dir = os.path.join(store_dir, WINDOWS_DIR)
+        self.aggregates_path = os.path.join(store_dir, AGGREGATES_FILE)
+        self.meta_path = os.path.join(store_dir, META_FILE)
+        self.meta = self._read_meta()
+        self._keys = None
+        self._pending = []
+        self._aggregates = None
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+
+        empty = {'store_version': STORE_VERSION, 'sources': {}, 'window_count': 0, 'partitions': []}
+        if meta is None or meta.get('store_version') != STORE_VERSION:
+            return empty
+        paths = [self.aggregates_path] + [os.path.join(self.windows_dir, name) for name in meta['partitions']]
+        if not all(os.path.exists(path) for path in paths):
+            return empty
+        return meta
+
+    def partition_paths(self):
+        """Stored window partitions, oldest first."""
+        return [os.path.join(self.windows_dir, name) for name in self.meta['partitions']]
+
+    @property
+    def keys(self):
+        """WINDOW_KEY of every stored window - only the key columns are read."""
+        if self._keys is None:
+            partitions = [feather.read_feather(path, columns=WINDOW_KEY, memory_map=True)
+                          for path in self.partition_paths()]
+            self._keys = pd.concat(partitions, ignore_index=True) if partitions else pd.DataFrame(columns=WINDOW_KEY)
+        return self._keys
+
+    @property
+    def windows(self):
+        """All stored window rows (every partition; not needed for syncing)."""
+        partitions = [feather.read_feather(path) for path in self.partition_paths()] + self._pending
+        return pd.concat(partitions, ignore_index=True) if partitions else pd.DataFrame(columns=WINDOW_KEY)
+
+    @property
+    def aggregates(self):
+        """Per-campaign aggregates indexed by Campaign_ID."""
+        if self._aggregates is None:
+            if os.path.exists(self.aggregates_path) and self.meta['window_count'] > 0:
+                self._aggregates = feather.read_feather(self.aggregates_path).set_index('Campaign_ID')
+            else:
+                self._aggregates = None
+        return self._aggregates
+
+    def _write(self):
+        """Write pending windows as new partitions, then the aggregates and metadata (commit point)."""
+        os.makedirs(self.windows_dir, exist_ok=True)
+        for df in self._pending:
+            name = f"part-{len(self.meta['partitions']):05d}.feather"
+            path = os.path.join(self.windows_dir, name)
+            feather.write_feather(df, path + '.tmp', compression='uncompressed')
+            os.replace(path + '.tmp', path)
+            self.meta['partitions'].append(name)
+        self._pending = []
+
+        if self._aggregates is not None:
+            tmp_path = self.aggregates_path + '.tmp'
+            feather.write_feather(self._aggregates.reset_index(), tmp_path, compression='uncompressed')
+            os.replace(tmp_path, self.aggregates_path)
+
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp_path, self.meta_path)
+
+    def ingest(self, df_new):
+        """
+        Queue windows not stored yet as a new partition and update the
+        aggregates with them. Returns the number of new window rows.
+        """
+        df_new = df_new.dropna(subset=WINDOW_KEY).drop_duplicates(subset=WINDOW_KEY, keep='first')
+
+        keys = self.keys
+        if len(keys) > 0:
+            seen = df_new[WINDOW_KEY].merge(keys, on=WINDOW_KEY, how='left', indicator=True)
+            df_new = df_new[(seen['_merge'] == 'left_only').to_numpy()]
+
+        if len(df_new) == 0:
+            return 0
+
+        df_new = df_new.reset_index(drop=True)
+        self._aggregates = merge_aggregates(self.aggregates, aggregate_windows(df_new))
+        self._pending.append(df_new)
+        self._keys = pd.concat([keys, df_new[WINDOW_KEY]], ignore_index=True) if len(keys) > 0 else df_new[WINDOW_KEY]
+        self.meta['window_count'] += len(df_new)
+        return len(df_new)
+
+    def sync_file(self, file_path):
+        """
+        Ingest a source file unless its fingerprint is unchanged since the last sync.
+        Returns the number of new window rows.
+        """
+        recorded = self.meta['sources'].get(os.path.abspath(file_path))
+        if recorded is not None and source_unchanged(file_path, recorded):
+            return 0
+
+        # Fingerprint first: a file rewritten during the ingest must not look synced
+        source = source_fingerprint(file_path)
+        added = self.ingest(read_rolling_export(file_path))
+        self.meta['sources'][os.path.abspath(file_path)] = source
+        self._write()
+        return added
+
+    def campaign_aggregates(self):
+        """
+        ['Campaign ID', 'Peak_Reach_Rolling', 'Avg_Frequency_Rolling'] per campaign:
+        peak Reach and mean Avg_Frequency across all stored windows.
+        """
+        aggregates = self.aggregates
+        if aggregates is None:
+            return pd.DataFrame(columns=['Campaign ID', 'Peak_Reach_Rolling', 'Avg_Frequency_Rolling'])
+
+        count = aggregates['Frequency_Count'].to_numpy(dtype=np.float64)
+        mean_frequency = np.divide(
+            aggregates['Frequency_Sum'].to_numpy(dtype=np.float64), count,
+            out=np.full(len(count), np.nan), where=count > 0
+        )
+        return pd.DataFrame({
+            'Campaign ID': aggregates.index.to_numpy(),
+            'Peak_Reach_Rolling': aggregates['Peak_Reach'].to_numpy(),
+            'Avg_Frequency_Rolling': mean_frequency,
+        })
+
+def load_rolling_aggregates(file_path=ROLLING_REACH_PATH, store_dir=CACHE_DIR):
+    """
+    Per-campaign rolling reach aggregates for the dashboard.
+    Syncs the store with file_path first (no-op when unchanged); without
+    pyarrow falls back to grouping the full file.
+    """
+    if feather is None:
+        df_rolling = read_rolling_export(file_path)
+        rolling_agg = df_rolling.groupby('Campaign_ID').agg({
+            'Reach': 'max',
+            'Avg_Frequency': 'mean'
+        }).reset_index()
+        rolling_agg.columns = ['Campaign ID', 'Peak_Reach_Rolling', 'Avg_Frequency_Rolling']
+        return rolling_agg
+
+    store = RollingReachStore(store_dir)
+    store.sync_file(file_path)
+    return store.campaign_aggregates()
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    if feather is None:
+        print("[ERROR] pyarrow is not installed - rolling store unavailable")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    if '--rebuild' in args:
+        args.remove('--rebuild')
+        shutil.rmtree(os.path.join(CACHE_DIR, WINDOWS_DIR), ignore_errors=True)
+        for file_name in [AGGREGATES_FILE, META_FILE]:
+            path = os.path.join(CACHE_DIR, file_name)
+            if os.path.exists(path):
+                os.remove(path)
+        print("[OK] Rolling store cleared")
+
+    store = RollingReachStore()
+    for file_path in [ROLLING_REACH_PATH] + args:
+        added = store.sync_file(file_path)
+        print(f"[OK] {file_path}: {added:,} new windows")
+
+    print(f"[OK] Store: {store.meta['window_count']:,} windows in {len(store.meta['partitions'])} partitions, "
+          f"{0 if store.aggregates is None else len(store.aggregates):,} campaigns")
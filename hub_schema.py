@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB SCHEMA - Typed schemas for the Google Ads CSV exports
+One registry entry per export type (path, delimiter, column -> kind) and a
+single reader that loads only the requested columns and returns them typed.
+
+Column kinds (converters are the vectorized hub_parsing functions, so typed
+values are EXACTLY what the scripts got from read_csv + parse_*):
+    text      - kept as text (object, NaN for empty cells)
+    number    - pd.to_numeric(errors='coerce'): ids, clean numeric sheets
+    count     - parse_number_series: '4,956,859' -> 4956859, '--' -> 0
+    money     - parse_cost_series: 'EUR 1,234.56' -> 1234.56
+    float     - parse_float_series: '0.56%' -> 0.56, '4,448.57' -> 4448.57
+    date      - parse_export_dates_series: '15 Apr 2025' (day first)
+    datetime  - pd.to_datetime(errors='coerce'): '2025/01/01', '2025-01-01'
+
+Files are read in one pass with the pyarrow CSV reader when pyarrow is
+installed (multi-threaded, only the requested columns) and with the pandas C
+parser otherwise; the converters then type what the reader left as text.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+from hub_parsing import parse_cost_series, parse_number_series, parse_float_series, parse_export_dates_series
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+ExportSchema = namedtuple('ExportSchema', [
+    'path',         # default location in the project tree
+    'delimiter',    # ';' for Google Ads UI exports, ',' for the rolling script sheet
+    'columns',      # dict column -> kind (file order)
+])
+
+_REACH_COLUMNS = {
+    'Campaign': 'text',
+    'Account': 'text',
+    'Campaign ID': 'number',
+    'Unique users': 'count',
+    'Avg. impr. freq. / user': 'float',
+}
+
+def _reach_schema(path):
+    return ExportSchema(path, ';', _REACH_COLUMNS)
+
+EXPORT_SCHEMAS = {
+    'campaign_metrics': ExportSchema(
+        "data - v3/campaign - metrics - v3/campaign metrics - version 3 - no segmentation - all campaigns.csv", ';', {
+            'Campaign': 'text',
+            'Account': 'text',
+            'Campaign ID': 'number',
+            'Impr.': 'count',
+            'Clicks': 'count',
+            'CTR': 'float',
+            'Avg. CPM': 'money',
+            'Avg. CPC': 'money',
+            'TrueView views': 'count',
+            'TrueView avg. CPV': 'money',
+            'Cost': 'money',
+            'Conversions': 'float',
+            'Conv. rate': 'float',
+            'Cost / conv.': 'money',
+        }),
+    'ad_format_metrics': ExportSchema(
+        "data - v3/campaign - metrics - v3/campaign metrics - version 3 - segmented by ad format - only youtube campaigns.csv", ';', {
+            'Ad format': 'text',
+            'Campaign': 'text',
+            'Account': 'text',
+            'Campaign ID': 'number',
+            'Clicks': 'count',
+            'CTR': 'float',
+            'Impr.': 'count',
+            'Avg. CPC': 'money',
+            'Avg. CPM': 'money',
+            'TrueView views': 'count',
+            'TrueView avg. CPV': 'money',
+            'Cost': 'money',
+            'Conversions': 'float',
+            'Cost / conv.': 'money',
+        }),
+    'age_gender': ExportSchema(
+        "data - v3/age - gender - v3/campaign age - gender - version 3.csv", ';', {
+            'Account name': 'text',
+            'Customer ID': 'text',
+            'Campaign': 'text',
+            'Campaign ID': 'number',
+            'Age': 'text',
+            'Gender': 'text',
+            'Currency code': 'text',
+            'Impr.': 'count',
+            'Clicks': 'count',
+            'Cost': 'money',
+        }),
+    'location': ExportSchema(
+        "data - v3/campaign - country - v3/campaign location - version 3.csv", ';', {
+            'Account name': 'text',
+            'Customer ID': 'text',
+            'Campaign': 'text',
+            'Campaign ID': 'number',
+            'Campaign type': 'text',
+            'Country/Territory (User location)': 'text',
+            'Currency code': 'text',
+            'Impr.': 'count',
+            'Clicks': 'count',
+            'Cost': 'money',
+        }),
+    'duration': ExportSchema(
+        "data - v3/campaign - duration - v3/campaign - duration - version 3.csv", ';', {
+            'Account name': 'text',
+            'Customer ID': 'text',
+            'Campaign': 'text',
+            'Campaign ID': 'number',
+            'Campaign type': 'text',
+            'Currency code': 'text',
+            'Campaign start date': 'date',
+            'Campaign end date': 'date',
+            'Impr.': 'count',
+            'Clicks': 'count',
+            'Cost': 'money',
+        }),
+    'bidding': ExportSchema(
+        "data - v3/campaign - bidding strategies - v3/campaign - bidding strategies - version 3.csv", ';', {
+            'Account name': 'text',
+            'Customer ID': 'text',
+            'Campaign': 'text',
+            'Campaign ID': 'number',
+            'Campaign type': 'text',
+            'Currency code': 'text',
+            'Campaign bid strategy type': 'text',
+            'Impr.': 'count',
+            'Clicks': 'count',
+            'Cost': 'money',
+        }),
+    'reach_q1': _reach_schema("data - v3/campaign reach - frequency - v3/campaign - reach - frequency - q1 - version 3.csv"),
+    'reach_q2': _reach_schema("data - v3/campaign reach - frequency - v3/campaign - reach - frequency - q2 - version 3.csv"),
+    'reach_q3': _reach_schema("data - v3/campaign reach - frequency - v3/campaign - reach - frequency - q3 - version 3.csv"),
+    'reach_q4': _reach_schema("data - v3/campaign reach - frequency - v3/campaign - reach - frequency - q4 - version.csv"),
+    # Google Ads script sheet (90-day windows); the cleaned master rolling file
+    # adds Brand / Target / Bid_Strategy, which are read as text
+    'rolling_sheet': ExportSchema(
+        "MASTER_ROLLING_DATA_2025_CLEAN.csv", ',', {
+            'Window_Start': 'datetime',
+            'Window_End': 'datetime',
+            'Account_ID': 'text',
+            'Account_Name': 'text',
+            'Campaign_ID': 'number',
+            'Campaign': 'text',
+            'Type': 'text',
+            'Cost': 'number',
+            'Impressions': 'number',
+            'Reach': 'number',
+            'Avg_Frequency': 'number',
+        }),
+}
+
+# ============================================================================
+# CONVERTERS
+# ============================================================================
+
+def _to_numeric(series):
+    return pd.to_numeric(series, errors='coerce')
+
+def _to_datetime(series):
+    return pd.to_datetime(series, errors='coerce')
+
+CONVERTERS = {
+    'text': None,
+    'number': _to_numeric,
+    'count': parse_number_series,
+    'money': parse_cost_series,
+    'float': parse_float_series,
+    'date': parse_export_dates_series,
+    'datetime': _to_datetime,
+}
+
+# Kinds read as text; the numeric kinds are typed by the CSV reader where the
+# cells allow it and the converters only clean up what is left ('1,234', '--')
+TEXT_KINDS = {'text', 'date', 'datetime'}
+
+# Cells read as missing - the pandas read_csv defaults, so both engines agree
+NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# ============================================================================
+# READER
+# ============================================================================
+
+def _read_pyarrow(file_path, delimiter, columns, text_columns):
+    """Requested columns with the pyarrow CSV reader (text_columns kept as text)."""
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=columns,
+        column_types={column: pa.string() for column in text_columns},
+        null_values=NULL_VALUES,
+        strings_can_be_null=True,
+    )
+    table = pa_csv.read_csv(file_path, parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+                            convert_options=convert_options)
+
+    data = {}
+    for name, chunked in zip(table.column_names, table.columns):
+        if name in text_columns:
+            # pyarrow nulls arrive as None - use NaN like the C parser
+            values = chunked.to_numpy(zero_copy_only=False).astype(object)
+            values[chunked.is_null().to_numpy(zero_copy_only=False)] = np.nan
+            data[name] = values
+        else:
+            data[name] = chunked.to_pandas()
+    return pd.DataFrame(data, columns=columns)
+
+def _read_c(file_path, delimiter, columns, text_columns):
+    """Requested columns with the pandas C parser (text_columns kept as text)."""
+    df = pd.read_csv(file_path, delimiter=delimiter, encoding='utf-8-sig', usecols=columns,
+                     dtype={column: object for column in text_columns},
+                     keep_default_na=False, na_values=NULL_VALUES)
+    return df[columns]
+
+def read_export(kind, file_path=None, columns=None, engine=None):
+    """
+    Load a Google Ads export as a typed DataFrame.
+
+    kind     - EXPORT_SCHEMAS key
+    columns  - columns to load (in this order); None loads every column of the
+               file, columns the schema does not know are kept as text
+    engine   - 'pyarrow' or 'c'; default pyarrow when installed
+
+    Raises ValueError if a declared / requested column is missing in the file.
+    """
+    schema = EXPORT_SCHEMAS[kind]
+    file_path = file_path or schema.path
+    columns = list(columns) if columns is not None else None
+
+    header = pd.read_csv(file_path, delimiter=schema.delimiter, encoding='utf-8-sig', nrows=0).columns
+    required = columns if columns is not None else list(schema.columns)
+    missing = [column for column in required if column not in header]
+    if missing:
+        raise ValueError(f"{kind}: missing columns {missing} in {file_path}")
+
+    columns = columns if columns is not None else list(header)
+    kinds = {column: schema.columns.get(column, 'text') for column in columns}
+    text_columns = [column for column in columns if kinds[column] in TEXT_KINDS]
+
+    engine = engine or ('pyarrow' if pa is not None else 'c')
+    if engine == 'pyarrow':
+        df = _read_pyarrow(file_path, schema.delimiter, columns, text_columns)
+    else:
+        df = _read_c(file_path, schema.delimiter, columns, text_columns)
+
+    for column in df.columns:
+        converter = CONVERTERS[kinds[column]]
+        if converter is not None:
+            df[column] = converter(df[column])
+
+    return df
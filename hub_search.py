@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB SEARCH - Trigram inverted index for the campaign name search box
+Built once at load time. A substring query is answered by intersecting the
+posting lists of its trigrams and verifying ONLY those candidate names,
+instead of a regex scan over every campaign name on every rerun.
+
+Semantics are identical to the old
+    df['Campaign'].str.lower().str.contains(query.strip().lower(), na=False)
+Queries shorter than 3 characters (no trigram) fall back to a plain substring
+scan; queries with regex metacharacters keep the regex scan, because
+str.contains() treats the query as a regular expression.
+"""
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+NGRAM_SIZE = 3
+
+# Characters with a special meaning in a regular expression
+REGEX_METACHARACTERS = set('.^$*+?{}[]\\|()')
+
+def _ngrams(text):
+    """Distinct n-grams of a string."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+# ============================================================================
+# TRIGRAM INDEX
+# ============================================================================
+
+class TrigramIndex:
+    """Inverted index trigram -> sorted row positions over one text column."""
+
+    def __init__(self, texts):
+        texts = pd.Series(texts)
+        self.n_rows = len(texts)
+        self.texts_lower = texts.str.lower()
+        self._lower_values = self.texts_lower.to_numpy(dtype=object)
+
+        postings = {}
+        for position, text in enumerate(self._lower_values):
+            if not isinstance(text, str):
+                continue
+            for gram in _ngrams(text):
+                postings.setdefault(gram, []).append(position)
+
+        self.postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+    def candidates(self, query_lower):
+        """
+        Row positions that contain EVERY trigram of the query (superset of matches).
+        Returns None when the query has no trigram (too short to use the index).
+        """
+        grams = _ngrams(query_lower)
+        if len(grams) == 0:
+            return None
+
+        lists = []
+        for gram in grams:
+            rows = self.postings.get(gram)
+            if rows is None:
+                return np.array([], dtype=np.int64)
+            lists.append(rows)
+
+        # Intersect shortest lists first - the candidate set shrinks fastest
+        lists.sort(key=len)
+        result = lists[0]
+        for rows in lists[1:]:
+            result = np.intersect1d(result, rows, assume_unique=True)
+            if len(result) == 0:
+                break
+        return result
+
+    def search_positions(self, query):
+        """Sorted row positions whose lower-cased text contains the query."""
+        query_lower = query.strip().lower()
+
+        if REGEX_METACHARACTERS & set(query_lower):
+            # Regex query - keep str.contains() semantics exactly
+            mask = self.texts_lower.str.contains(query_lower, na=False).to_numpy()
+            return np.flatnonzero(mask)
+
+        candidates = self.candidates(query_lower)
+        if candidates is None:
+            # No trigram in the query - plain (non-regex) scan over all names
+            mask = self.texts_lower.str.contains(query_lower, na=False, regex=False).to_numpy()
+            return np.flatnonzero(mask)
+
+        # Verify only the candidates (trigram hits can still be false positives)
+        values = self._lower_values
+        return np.array(
+            [row for row in candidates if query_lower in values[row]],
+            dtype=np.int64
+        )
+
+    def search_mask(self, query):
+        """Boolean mask version of search_positions()."""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.search_positions(query)] = True
+        return mask
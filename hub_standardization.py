@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB STANDARDIZATION - Name components of the standardized campaign name
+Brand, Ad_Format, Target, Date_Range, Bid_Strategy_Short and Goal of every
+campaign, as built by mega_merge_standardization_v4.py.
+
+The scalar helpers resolve ONE campaign (reference logic). The *_series
+functions resolve whole columns with string operations and np.select, and
+target_labels() builds every campaign's 'Age | Gender' target in one grouped
+pass over the age-gender export instead of scanning it once per campaign.
+Both produce EXACTLY the same strings.
+
+standardized_name_series() joins the components into the standardized
+campaign name (NaN parts skipped) for the merge scripts and the dashboards.
+"""
+
+import numpy as np
+import pandas as pd
+
+from hub_parsing import parse_export_dates_series
+
+# ============================================================================
+# SCALAR HELPERS (reference logic)
+# ============================================================================
+
+def shorten_bidding_strategy(bid_strategy):
+    """Skrati naziv bidding strategije."""
+    if pd.isna(bid_strategy):
+        return "Unknown"
+
+    bid = str(bid_strategy).strip()
+
+    # Mapping
+    mapping = {
+        'Viewable CPM': 'vCPM',
+        'viewable CPM': 'vCPM',
+        'Maximize conversions': 'MaxConv',
+        'Maximise conversions': 'MaxConv',
+        'Maximize conversion value': 'MaxConvValue',
+        'Maximise conversion value': 'MaxConvValue',
+        'Target CPA': 'tCPA',
+        'Target ROAS': 'tROAS',
+        'Target CPM': 'tCPM',
+        'Manual CPC': 'CPC',
+        'Manual CPM': 'CPM',
+        'Manual CPV': 'CPV',
+        'Target CPV': 'tCPV',
+        'Maximize clicks': 'MaxClicks',
+        'Maximise clicks': 'MaxClicks'
+    }
+
+    for key, value in mapping.items():
+        if key.lower() in bid.lower():
+            return value
+
+    return bid
+
+def format_date_range(start_date, end_date):
+    """Format date range to 'Oct-Dec 25' style."""
+    if pd.isna(start_date) or pd.isna(end_date):
+        return "Unknown Period"
+
+    try:
+        # Parse dates
+        start = pd.to_datetime(start_date, dayfirst=True, errors='coerce')
+        end = pd.to_datetime(end_date, dayfirst=True, errors='coerce')
+
+        if pd.isna(start) or pd.isna(end):
+            return "Unknown Period"
+
+        # Format
+        start_month = start.strftime('%b')
+        end_month = end.strftime('%b')
+        year = start.strftime('%y')
+
+        if start_month == end_month:
+            return f"{start_month} {year}"
+        else:
+            return f"{start_month}-{end_month} {year}"
+
+    except:
+        return "Unknown Period"
+
+def extract_brand_from_account(account_name, campaign_name):
+    """Extract brand from account or campaign name."""
+    if pd.isna(account_name):
+        account_name = ""
+    if pd.isna(campaign_name):
+        campaign_name = ""
+
+    name = str(campaign_name).lower()
+    account = str(account_name).lower()
+
+    # Known brands
+    if "mcdonald" in name or "mcdonald" in account:
+        return "McDonald's"
+    elif "kaufland" in account or "kaufland" in name:
+        return "Kaufland"
+    elif "nivea" in account or "nivea" in name:
+        return "Nivea"
+    elif "eucerin" in account or "eucerin" in name:
+        return "Eucerin"
+    elif "philips" in account or "philips" in name:
+        return "Philips"
+    elif "persil" in name or "persil" in account:
+        return "Persil"
+    elif "perwoll" in name or "perwoll" in account:
+        return "Perwoll"
+    elif "syoss" in name or "syoss" in account:
+        return "Syoss"
+    elif "weisser" in name or "weisser" in account:
+        return "Weisser Riese"
+    elif "somat" in name or "somat" in account:
+        return "Somat"
+    elif "bref" in name or "bref" in account:
+        return "Bref"
+    elif "porsche" in account:
+        return "Porsche"
+    elif "nissan" in account or "nissan" in name:
+        return "Nissan"
+    elif "zott" in account or "zott" in name:
+        return "Zott"
+    elif "jgl" in account:
+        return "JGL"
+    elif "energycom" in name or "energycom" in account:
+        return "Energycom"
+    elif "bosch" in account:
+        return "Bosch"
+    elif "saponia" in account:
+        return "Saponia"
+    else:
+        # Fallback
+        return str(account_name).split('_')[0].split('//')[0][:20] if account_name else "Unknown"
+
+def extract_ad_format(youtube_formats, campaign_name):
+    """Extract ad format."""
+    if pd.isna(youtube_formats) or youtube_formats == 'Non-YouTube Format':
+        # Non-YouTube - pokusaj iz naziva
+        name = str(campaign_name).lower()
+        if 'pmax' in name or 'performance max' in name:
+            return "PMax"
+        elif 'gdn' in name or 'display' in name:
+            return "Display"
+        elif 'demand' in name or '(dg)' in name:
+            return "Demand Gen"
+        else:
+            return "Other"
+    else:
+        # YouTube formats
+        formats = str(youtube_formats)
+        if 'Skippable in-stream' in formats:
+            return "YouTube In-Stream"
+        elif 'Bumper' in formats:
+            return "YouTube Bumper"
+        elif 'Shorts' in formats:
+            return "YouTube Shorts"
+        elif 'In-feed' in formats:
+            return "YouTube In-Feed"
+        elif 'Non-skippable' in formats:
+            return "YouTube Non-Skip"
+        else:
+            return "YouTube"
+
+def determine_goal(bid_strategy, ad_format):
+    """Determine campaign goal based on bidding strategy and ad format."""
+    bid = str(bid_strategy).lower()
+    fmt = str(ad_format).lower()
+
+    # Awareness goals
+    if 'vcpm' in bid or 'cpm' in bid:
+        return "Awareness"
+    # Action goals
+    elif 'maxconv' in bid or 'tcpa' in bid or 'troas' in bid:
+        return "Action"
+    # Consideration goals
+    elif 'cpv' in bid or 'tcpv' in bid:
+        return "Consideration"
+    # Based on format
+    elif 'bumper' in fmt or 'shorts' in fmt:
+        return "Awareness"
+    elif 'pmax' in fmt:
+        return "Action"
+    else:
+        return "Consideration"
+
+# Age buckets of the age-gender export ('Undetermined' never counts)
+AGE_MAPPING = {
+    '18-24': 18,
+    '25-34': 25,
+    '35-44': 35,
+    '45-54': 45,
+    '55-64': 55,
+    '65+': 65,
+    'Undetermined': 999
+}
+
+def extract_target_info(campaign_id, df_age):
+    """Extract target demographics info."""
+    campaign_data = df_age[df_age['Campaign ID'] == campaign_id]
+
+    if len(campaign_data) == 0:
+        return "All | All"
+
+    # Extract ages
+    ages = campaign_data['Age'].unique()
+    genders = campaign_data['Gender'].unique()
+
+    # Parsiraj age range
+    age_mapping = AGE_MAPPING
+
+    age_nums = []
+    for age in ages:
+        if pd.notna(age) and age in age_mapping:
+            age_nums.append(age_mapping[age])
+
+    if len(age_nums) > 0:
+        age_nums = [x for x in age_nums if x < 999]
+        if len(age_nums) == 0:
+            age_range = "All"
+        elif len(age_nums) == 1:
+            # Single age group
+            for age_label, age_num in age_mapping.items():
+                if age_num == age_nums[0]:
+                    age_range = age_label
+                    break
+        else:
+            # Range
+            min_age = min(age_nums)
+            max_age = max(age_nums)
+
+            # Find labels
+            min_label = None
+            max_label = None
+            for age_label, age_num in age_mapping.items():
+                if age_num == min_age:
+                    min_label = age_label.split('-')[0]
+                if age_num == max_age:
+                    if age_label == '65+':
+                        max_label = '65+'
+                    else:
+                        max_label = age_label.split('-')[1]
+
+            if min_label and max_label:
+                age_range = f"{min_label}-{max_label}"
+            else:
+                age_range = "All"
+    else:
+        age_range = "All"
+
+    # Gender
+    if len(genders) == 1 and genders[0] in ['Male', 'Female']:
+        if genders[0] == 'Male':
+            gender_str = "M"
+        else:
+            gender_str = "F"
+    elif set(genders) == {'Male', 'Female'}:
+        gender_str = "M/F"
+    else:
+        gender_str = "All"
+
+    return f"{age_range} | {gender_str}"
+
+# ============================================================================
+# COLUMN-WISE BUILDERS
+# ============================================================================
+
+# (pattern, brand, matched in the campaign name too) - first match wins
+BRAND_RULES = [
+    ("mcdonald", "McDonald's", True),
+    ("kaufland", "Kaufland", True),
+    ("nivea", "Nivea", True),
+    ("eucerin", "Eucerin", True),
+    ("philips", "Philips", True),
+    ("persil", "Persil", True),
+    ("perwoll", "Perwoll", True),
+    ("syoss", "Syoss", True),
+    ("weisser", "Weisser Riese", True),
+    ("somat", "Somat", True),
+    ("bref", "Bref", True),
+    ("porsche", "Porsche", False),
+    ("nissan", "Nissan", True),
+    ("zott", "Zott", True),
+    ("jgl", "JGL", False),
+    ("energycom", "Energycom", True),
+    ("bosch", "Bosch", False),
+    ("saponia", "Saponia", False),
+]
+
+# (patterns in the lower-cased campaign name, format) for non-YouTube campaigns
+NON_YOUTUBE_FORMAT_RULES = [
+    (['pmax', 'performance max'], "PMax"),
+    (['gdn', 'display'], "Display"),
+    (['demand', '(dg)'], "Demand Gen"),
+]
+
+# (pattern in the YouTube_Ad_Formats value, format)
+YOUTUBE_FORMAT_RULES = [
+    ('Skippable in-stream', "YouTube In-Stream"),
+    ('Bumper', "YouTube Bumper"),
+    ('Shorts', "YouTube Shorts"),
+    ('In-feed', "YouTube In-Feed"),
+    ('Non-skippable', "YouTube Non-Skip"),
+]
+
+def _contains_any(strings, patterns):
+    """Row mask: the string contains at least one of the (literal) patterns."""
+    mask = np.zeros(len(strings), dtype=bool)
+    for pattern in patterns:
+        mask |= strings.str.contains(pattern, regex=False).to_numpy()
+    return mask
+
+def _text(series):
+    """Strings with missing values as '' (the scalar helpers' NaN handling)."""
+    return series.where(series.notna(), '').astype(str)
+
+def brand_series(account, campaign):
+    """extract_brand_from_account() for whole columns."""
+    account_text = _text(account)
+    name = _text(campaign).str.lower()
+    account_lower = account_text.str.lower()
+
+    conditions = []
+    for pattern, _, in_name in BRAND_RULES:
+        mask = account_lower.str.contains(pattern, regex=False).to_numpy()
+        if in_name:
+            mask |= name.str.contains(pattern, regex=False).to_numpy()
+        conditions.append(mask)
+
+    fallback = account_text.str.split('_').str[0].str.split('//').str[0].str[:20]
+    fallback = fallback.where(account_text != '', "Unknown")
+
+    brands = np.select(conditions, [brand for _, brand, _ in BRAND_RULES], default=fallback.to_numpy(dtype=object))
+    return pd.Series(brands, index=account.index, dtype=object)
+
+def ad_format_series(youtube_formats, campaign):
+    """extract_ad_format() for whole columns."""
+    non_youtube = (youtube_formats.isna() | (youtube_formats == 'Non-YouTube Format')).to_numpy()
+    name = campaign.astype(str).str.lower()
+    formats = youtube_formats.astype(str)
+
+    conditions = [non_youtube & _contains_any(name, patterns) for patterns, _ in NON_YOUTUBE_FORMAT_RULES]
+    choices = [ad_format for _, ad_format in NON_YOUTUBE_FORMAT_RULES]
+    conditions.append(non_youtube)
+    choices.append("Other")
+
+    for pattern, ad_format in YOUTUBE_FORMAT_RULES:
+        conditions.append(formats.str.contains(pattern, regex=False).to_numpy())
+        choices.append(ad_format)
+
+    return pd.Series(np.select(conditions, choices, default="YouTube"), index=youtube_formats.index, dtype=object)
+
+def date_range_series(start_dates, end_dates):
+    """format_date_range() for whole columns."""
+    start = parse_export_dates_series(start_dates)
+    end = parse_export_dates_series(end_dates)
+
+    start_month = start.dt.strftime('%b')
+    end_month = end.dt.strftime('%b')
+    year = start.dt.strftime('%y')
+
+    labels = (start_month + '-' + end_month + ' ' + year).where(start_month != end_month, start_month + ' ' + year)
+    return labels.where(start.notna() & end.notna(), "Unknown Period").astype(object)
+
+def goal_series(bid_strategy, ad_format):
+    """determine_goal() for whole columns."""
+    bid = bid_strategy.astype(str).str.lower()
+    fmt = ad_format.astype(str).str.lower()
+
+    conditions = [
+        _contains_any(bid, ['vcpm', 'cpm']),
+        _contains_any(bid, ['maxconv', 'tcpa', 'troas']),
+        _contains_any(bid, ['cpv', 'tcpv']),
+        _contains_any(fmt, ['bumper', 'shorts']),
+        _contains_any(fmt, ['pmax']),
+    ]
+    choices = ["Awareness", "Action", "Consideration", "Awareness", "Action"]
+    return pd.Series(np.select(conditions, choices, default="Consideration"), index=bid_strategy.index, dtype=object)
+
+# ============================================================================
+# TARGETS (grouped pass over the age-gender export)
+# ============================================================================
+
+AGE_LABELS = {age_num: age_label for age_label, age_num in AGE_MAPPING.items()}
+
+def _age_bound_label(age_num, upper):
+    """Start or end of a range label ('18-24' -> '18' / '24', '65+' -> '65+' as the end)."""
+    label = AGE_LABELS[age_num]
+    if upper:
+        return '65+' if label == '65+' else label.split('-')[1]
+    return label.split('-')[0]
+
+def target_labels(df_age):
+    """
+    'Age | Gender' target of every campaign in the age-gender export
+    (extract_target_info() for all campaigns, one grouped pass).
+    Returns a Series indexed by Campaign ID.
+    """
+    df_age = df_age[df_age['Campaign ID'].notna()]
+    campaign_ids = pd.Index(df_age['Campaign ID'].unique())
+
+    # Age: distinct known buckets, without 'Undetermined'
+    age_nums = df_age['Age'].map(AGE_MAPPING)
+    known = age_nums.notna() & (age_nums < 999)
+    age_stats = age_nums[known].groupby(df_age.loc[known, 'Campaign ID']).agg(['nunique', 'min', 'max'])
+
+    age_range = pd.Series("All", index=campaign_ids, dtype=object)
+    labels = {}
+    for campaign_id, count, age_min, age_max in age_stats.itertuples():
+        if count == 1:
+            labels[campaign_id] = AGE_LABELS[age_min]
+        else:
+            labels[campaign_id] = f"{_age_bound_label(age_min, False)}-{_age_bound_label(age_max, True)}"
+    age_range.update(pd.Series(labels, dtype=object))
+
+    # Gender: exactly {Male}, {Female} or {Male, Female} among the distinct values (NaN included)
+    gender_groups = df_age['Gender'].groupby(df_age['Campaign ID'])
+    distinct = gender_groups.nunique(dropna=False).reindex(campaign_ids)
+    has_male = (df_age['Gender'] == 'Male').groupby(df_age['Campaign ID']).any().reindex(campaign_ids)
+    has_female = (df_age['Gender'] == 'Female').groupby(df_age['Campaign ID']).any().reindex(campaign_ids)
+
+    gender = np.select(
+        [(distinct == 1) & has_male, (distinct == 1) & has_female, (distinct == 2) & has_male & has_female],
+        ["M", "F", "M/F"],
+        default="All"
+    )
+
+    return age_range + " | " + pd.Series(gender, index=campaign_ids, dtype=object)
+
+def target_series(campaign_ids, has_demographics, df_age):
+    """Target of every campaign: its age-gender label, 'All | All' if absent, 'Auto | All' without demographics."""
+    targets = campaign_ids.map(target_labels(df_age)).fillna("All | All")
+    return targets.where(has_demographics.astype(bool), "Auto | All").astype(object)
+
+# ============================================================================
+# STANDARDIZED CAMPAIGN NAME
+# ============================================================================
+
+# Name parts in order: [BRAND] | [AD_FORMAT] | [TARGET] | [DATE_RANGE] | [BID_STRATEGY] | [GOAL]
+NAME_COLUMNS = ['Brand', 'Ad_Format', 'Target', 'Date_Range', 'Bid_Strategy_Short', 'Goal']
+NAME_SEPARATOR = " | "
+
+def rebuild_campaign_name(row):
+    """Rebuild standardized name with correct demographics and brand."""
+    parts = []
+
+    if pd.notna(row.get('Brand')):
+        parts.append(str(row['Brand']))
+
+    if pd.notna(row.get('Ad_Format')):
+        parts.append(str(row['Ad_Format']))
+
+    # Use corrected demographics
+    if 'Target_Corrected' in row:
+        parts.append(row['Target_Corrected'])
+    elif pd.notna(row.get('Target')):
+        parts.append(str(row['Target']))
+
+    if pd.notna(row.get('Date_Range')):
+        parts.append(str(row['Date_Range']))
+
+    if pd.notna(row.get('Bid_Strategy_Short')):
+        parts.append(str(row['Bid_Strategy_Short']))
+
+    if pd.notna(row.get('Goal')):
+        parts.append(str(row['Goal']))
+
+    return " | ".join(parts)
+
+def standardized_name_series(df, target_column=None):
+    """
+    rebuild_campaign_name() for every row, built column by column.
+
+    Missing values and missing columns are skipped. target_column defaults
+    to 'Target_Corrected' when the frame has it, otherwise 'Target' (the
+    row function's choice); pass 'Target' to ignore corrected demographics.
+    """
+    if target_column is None:
+        target_column = 'Target_Corrected' if 'Target_Corrected' in df.columns else 'Target'
+    columns = [target_column if column == 'Target' else column for column in NAME_COLUMNS]
+
+    names = pd.Series('', index=df.index, dtype=object)
+    has_part = np.zeros(len(df), dtype=bool)
+
+    for column in columns:
+        if column not in df.columns:
+            continue
+        values = df[column]
+        present = values.notna().to_numpy()
+        text = values.astype(str).astype(object).where(present, '')
+        separator = np.where(present & has_part, NAME_SEPARATOR, '')
+        names = names + separator + text
+        has_part |= present
+
+    return names
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUB TIMING - Per-rerun stage timers, counters and a rotating timing log
+Answers "where did this rerun spend its time": loading, demographics
+resolution, Campaign ID aggregation, every filter stage, the display frame
+and every chart are timed under their own name.
+
+    timer = hub_timing.start_rerun('hub_app')      # top of the script
+    with timer.stage('display_frame'):
+        ...
+    hub_timing.finish_rerun(timer)                 # end: one line in the log
+
+Library code (hub_data, hub_filters) uses the module-level timed() / count(),
+which record into the timer of the running rerun and do nothing when there
+is none (offline scripts, tests, worker processes). Stages nest: a parent
+stage includes the time of the stages inside it.
+
+Every finished rerun is appended as one JSON line to a size-rotated log in
+the local cache directory for offline analysis.
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+TIMING_LOG_PATH = os.path.join(".hub_cache", "logs", "hub_timing.log")
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Timer of the rerun running in this thread / context (None = not timing)
+_active_timer = contextvars.ContextVar('hub_timing_active_timer', default=None)
+
+# ============================================================================
+# TIMER
+# ============================================================================
+
+class StageTimer:
+    """Wall-clock time and number of calls per named stage, plus counters, for one rerun."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.stages = {}      # stage -> [total ms, calls], in first-run order
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time the block under the given stage name (repeated stages accumulate)."""
+        entry = self.stages.setdefault(name, [0.0, 0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry[0] += (time.perf_counter() - start) * 1000
+            entry[1] += 1
+
+    def count(self, name, n=1):
+        """Add n to a named counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def elapsed_ms(self):
+        """Milliseconds since the rerun started."""
+        return (time.perf_counter() - self._start) * 1000
+
+    def records(self):
+        """One dict per stage: stage, ms, calls."""
+        return [{'stage': name, 'ms': round(ms, 3), 'calls': calls} for name, (ms, calls) in self.stages.items()]
+
+    def to_record(self, **extra):
+        """JSON-serializable summary of the rerun (extra = stats to log with it)."""
+        record = {
+            'time': self.started_at.isoformat(timespec='milliseconds'),
+            'name': self.name,
+            'total_ms': round(self.elapsed_ms(), 3),
+            'stages': {name: {'ms': round(ms, 3), 'calls': calls} for name, (ms, calls) in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+        record.update(extra)
+        return record
+
+# ============================================================================
+# ACTIVE RERUN
+# ============================================================================
+
+def start_rerun(name):
+    """Start timing a rerun; timed() / count() record into it from now on."""
+    timer = StageTimer(name)
+    _active_timer.set(timer)
+    return timer
+
+def active_timer():
+    """Timer of the running rerun (None when not timing)."""
+    return _active_timer.get()
+
+@contextmanager
+def timed(name):
+    """Stage timer of the running rerun - a no-op when nothing is being timed."""
+    timer = _active_timer.get()
+    if timer is None:
+        yield
+    else:
+        with timer.stage(name):
+            yield
+
+def count(name, n=1):
+    """Counter of the running rerun - a no-op when nothing is being timed."""
+    timer = _active_timer.get()
+    if timer is not None:
+        timer.count(name, n)
+
+def finish_rerun(timer, log_path=TIMING_LOG_PATH, **extra):
+    """Stop timing, append the rerun to the rotating log and return its record."""
+    if _active_timer.get() is timer:
+        _active_timer.set(None)
+
+    record = timer.to_record(**extra)
+    if log_path:
+        try:
+            timing_logger(log_path).info(json.dumps(record, default=str))
+        except OSError:
+            # Diagnostics must never break the app (read-only disk etc.)
+            pass
+    return record
+
+# ============================================================================
+# ROTATING LOG
+# ============================================================================
+
+def timing_logger(log_path=TIMING_LOG_PATH):
+    """Logger writing plain JSON lines to a size-rotated file (created once per path)."""
+    log_path = os.path.abspath(log_path)
+    logger = logging.getLogger(f"hub_timing.{log_path}")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+def read_timing_log(log_path=TIMING_LOG_PATH):
+    """All logged reruns (oldest first, rotated files included)."""
+    paths = [f"{log_path}.{number}" for number in range(LOG_BACKUP_COUNT, 0, -1)] + [log_path]
+    records = []
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+    return records
@@ -8,28 +8,13 @@ Kompletni filter engine sa strukturiranim prikazom
 import pandas as pd
 import numpy as np
 
+from hub_parsing import parse_cost_series, parse_number_series
+from hub_data import load_demographics_data, load_location_data
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_cost(value):
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
-def parse_impressions(value):
-    if pd.isna(value):
-        return 0
-    value_str = str(value).strip().replace(',', '').strip()
-    try:
-        return int(float(value_str))
-    except:
-        return 0
-
 def safe_print(text):
     """Safely print text with encoding handling."""
     try:
@@ -50,11 +35,11 @@ class InteractiveFilterEngine:
         self.df_country = df_country.copy()
 
         # Parse numeric columns
-        self.df_campaigns['Cost_parsed'] = self.df_campaigns['Cost'].apply(parse_cost)
-        self.df_campaigns['Impr_parsed'] = self.df_campaigns['Impr.'].apply(parse_impressions)
+        self.df_campaigns['Cost_parsed'] = parse_cost_series(self.df_campaigns['Cost'])
+        self.df_campaigns['Impr_parsed'] = parse_number_series(self.df_campaigns['Impr.'])
 
-        self.df_age_gender['Cost_parsed'] = self.df_age_gender['Cost'].apply(parse_cost)
-        self.df_country['Cost_parsed'] = self.df_country['Cost'].apply(parse_cost)
+        self.df_age_gender['Cost_parsed'] = parse_cost_series(self.df_age_gender['Cost'])
+        self.df_country['Cost_parsed'] = parse_cost_series(self.df_country['Cost'])
 
     def filter_campaigns(self, brand=None, format_type=None, target_gender=None, target_age=None, period=None):
         """Apply filters to campaigns."""
@@ -294,8 +279,8 @@ if __name__ == "__main__":
 
     # Load data
     df_campaigns = pd.read_csv(PATH_PROTOTYPE, delimiter=';', encoding='utf-8-sig')
-    df_age_gender = pd.read_csv(PATH_AGE_GENDER, delimiter=';', encoding='utf-8-sig')
-    df_country = pd.read_csv(PATH_COUNTRY, delimiter=';', encoding='utf-8-sig')
+    df_age_gender = load_demographics_data(PATH_AGE_GENDER)
+    df_country = load_location_data(PATH_COUNTRY)
 
     print(f"OK Campaigns:      {len(df_campaigns):,}")
     print(f"OK Age-Gender:     {len(df_age_gender):,} rows")
@@ -10,20 +10,12 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from hub_parsing import parse_cost_series
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_cost(value):
-    """Parsiraj Cost vrijednost."""
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
 def safe_print(text):
     """Safely print text with encoding handling."""
     try:
@@ -63,7 +55,7 @@ print("STEP 1: UCITAVANJE MASTER FILE (Financijsko Sidro)")
 print("=" * 120)
 
 df_master = pd.read_csv(PATH_ANCHOR, delimiter=';', encoding='utf-8-sig')
-df_master['Cost_parsed'] = df_master['Cost'].apply(parse_cost)
+df_master['Cost_parsed'] = parse_cost_series(df_master['Cost'])
 
 print(f"\nMaster file: {PATH_ANCHOR}")
 print(f"Broj kampanja: {len(df_master):,}")
@@ -10,19 +10,15 @@ import numpy as np
 from datetime import datetime
 import re
 
+from hub_standardization import (
+    shorten_bidding_strategy, target_series, brand_series, ad_format_series,
+    date_range_series, goal_series
+)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_cost(value):
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
 def safe_print(text):
     """Safely print text with encoding handling."""
     try:
@@ -30,166 +26,6 @@ def safe_print(text):
     except UnicodeEncodeError:
         print(text.encode('ascii', 'ignore').decode('ascii'))
 
-def shorten_bidding_strategy(bid_strategy):
-    """Skrati naziv bidding strategije."""
-    if pd.isna(bid_strategy):
-        return "Unknown"
-
-    bid = str(bid_strategy).strip()
-
-    # Mapping
-    mapping = {
-        'Viewable CPM': 'vCPM',
-        'viewable CPM': 'vCPM',
-        'Maximize conversions': 'MaxConv',
-        'Maximise conversions': 'MaxConv',
-        'Maximize conversion value': 'MaxConvValue',
-        'Maximise conversion value': 'MaxConvValue',
-        'Target CPA': 'tCPA',
-        'Target ROAS': 'tROAS',
-        'Target CPM': 'tCPM',
-        'Manual CPC': 'CPC',
-        'Manual CPM': 'CPM',
-        'Manual CPV': 'CPV',
-        'Target CPV': 'tCPV',
-        'Maximize clicks': 'MaxClicks',
-        'Maximise clicks': 'MaxClicks'
-    }
-
-    for key, value in mapping.items():
-        if key.lower() in bid.lower():
-            return value
-
-    return bid
-
-def format_date_range(start_date, end_date):
-    """Format date range to 'Oct-Dec 25' style."""
-    if pd.isna(start_date) or pd.isna(end_date):
-        return "Unknown Period"
-
-    try:
-        # Parse dates
-        start = pd.to_datetime(start_date, dayfirst=True, errors='coerce')
-        end = pd.to_datetime(end_date, dayfirst=True, errors='coerce')
-
-        if pd.isna(start) or pd.isna(end):
-            return "Unknown Period"
-
-        # Format
-        start_month = start.strftime('%b')
-        end_month = end.strftime('%b')
-        year = start.strftime('%y')
-
-        if start_month == end_month:
-            return f"{start_month} {year}"
-        else:
-            return f"{start_month}-{end_month} {year}"
-
-    except:
-        return "Unknown Period"
-
-def extract_brand_from_account(account_name, campaign_name):
-    """Extract brand from account or campaign name."""
-    if pd.isna(account_name):
-        account_name = ""
-    if pd.isna(campaign_name):
-        campaign_name = ""
-
-    name = str(campaign_name).lower()
-    account = str(account_name).lower()
-
-    # Known brands
-    if "mcdonald" in name or "mcdonald" in account:
-        return "McDonald's"
-    elif "kaufland" in account or "kaufland" in name:
-        return "Kaufland"
-    elif "nivea" in account or "nivea" in name:
-        return "Nivea"
-    elif "eucerin" in account or "eucerin" in name:
-        return "Eucerin"
-    elif "philips" in account or "philips" in name:
-        return "Philips"
-    elif "persil" in name or "persil" in account:
-        return "Persil"
-    elif "perwoll" in name or "perwoll" in account:
-        return "Perwoll"
-    elif "syoss" in name or "syoss" in account:
-        return "Syoss"
-    elif "weisser" in name or "weisser" in account:
-        return "Weisser Riese"
-    elif "somat" in name or "somat" in account:
-        return "Somat"
-    elif "bref" in name or "bref" in account:
-        return "Bref"
-    elif "porsche" in account:
-        return "Porsche"
-    elif "nissan" in account or "nissan" in name:
-        return "Nissan"
-    elif "zott" in account or "zott" in name:
-        return "Zott"
-    elif "jgl" in account:
-        return "JGL"
-    elif "energycom" in name or "energycom" in account:
-        return "Energycom"
-    elif "bosch" in account:
-        return "Bosch"
-    elif "saponia" in account:
-        return "Saponia"
-    else:
-        # Fallback
-        return str(account_name).split('_')[0].split('//')[0][:20] if account_name else "Unknown"
-
-def extract_ad_format(youtube_formats, campaign_name):
-    """Extract ad format."""
-    if pd.isna(youtube_formats) or youtube_formats == 'Non-YouTube Format':
-        # Non-YouTube - pokusaj iz naziva
-        name = str(campaign_name).lower()
-        if 'pmax' in name or 'performance max' in name:
-            return "PMax"
-        elif 'gdn' in name or 'display' in name:
-            return "Display"
-        elif 'demand' in name or '(dg)' in name:
-            return "Demand Gen"
-        else:
-            return "Other"
-    else:
-        # YouTube formats
-        formats = str(youtube_formats)
-        if 'Skippable in-stream' in formats:
-            return "YouTube In-Stream"
-        elif 'Bumper' in formats:
-            return "YouTube Bumper"
-        elif 'Shorts' in formats:
-            return "YouTube Shorts"
-        elif 'In-feed' in formats:
-            return "YouTube In-Feed"
-        elif 'Non-skippable' in formats:
-            return "YouTube Non-Skip"
-        else:
-            return "YouTube"
-
-def determine_goal(bid_strategy, ad_format):
-    """Determine campaign goal based on bidding strategy and ad format."""
-    bid = str(bid_strategy).lower()
-    fmt = str(ad_format).lower()
-
-    # Awareness goals
-    if 'vcpm' in bid or 'cpm' in bid:
-        return "Awareness"
-    # Action goals
-    elif 'maxconv' in bid or 'tcpa' in bid or 'troas' in bid:
-        return "Action"
-    # Consideration goals
-    elif 'cpv' in bid or 'tcpv' in bid:
-        return "Consideration"
-    # Based on format
-    elif 'bumper' in fmt or 'shorts' in fmt:
-        return "Awareness"
-    elif 'pmax' in fmt:
-        return "Action"
-    else:
-        return "Consideration"
-
 # ============================================================================
 # PATHS
 # ============================================================================
@@ -255,87 +91,9 @@ df_age = pd.read_csv(PATH_AGE_GENDER, delimiter=';', encoding='utf-8-sig')
 print(f"\nAge-Gender file: {PATH_AGE_GENDER}")
 print(f"Broj redaka: {len(df_age):,}")
 
-# Grupiraj po Campaign ID i izvuci age/gender info
-def extract_target_info(campaign_id):
-    """Extract target demographics info."""
-    campaign_data = df_age[df_age['Campaign ID'] == campaign_id]
-
-    if len(campaign_data) == 0:
-        return "All | All"
-
-    # Extract ages
-    ages = campaign_data['Age'].unique()
-    genders = campaign_data['Gender'].unique()
-
-    # Parsiraj age range
-    age_mapping = {
-        '18-24': 18,
-        '25-34': 25,
-        '35-44': 35,
-        '45-54': 45,
-        '55-64': 55,
-        '65+': 65,
-        'Undetermined': 999
-    }
-
-    age_nums = []
-    for age in ages:
-        if pd.notna(age) and age in age_mapping:
-            age_nums.append(age_mapping[age])
-
-    if len(age_nums) > 0:
-        age_nums = [x for x in age_nums if x < 999]
-        if len(age_nums) == 0:
-            age_range = "All"
-        elif len(age_nums) == 1:
-            # Single age group
-            for age_label, age_num in age_mapping.items():
-                if age_num == age_nums[0]:
-                    age_range = age_label
-                    break
-        else:
-            # Range
-            min_age = min(age_nums)
-            max_age = max(age_nums)
-
-            # Find labels
-            min_label = None
-            max_label = None
-            for age_label, age_num in age_mapping.items():
-                if age_num == min_age:
-                    min_label = age_label.split('-')[0]
-                if age_num == max_age:
-                    if age_label == '65+':
-                        max_label = '65+'
-                    else:
-                        max_label = age_label.split('-')[1]
-
-            if min_label and max_label:
-                age_range = f"{min_label}-{max_label}"
-            else:
-                age_range = "All"
-    else:
-        age_range = "All"
-
-    # Gender
-    if len(genders) == 1 and genders[0] in ['Male', 'Female']:
-        if genders[0] == 'Male':
-            gender_str = "M"
-        else:
-            gender_str = "F"
-    elif set(genders) == {'Male', 'Female'}:
-        gender_str = "M/F"
-    else:
-        gender_str = "All"
-
-    return f"{age_range} | {gender_str}"
-
-# Dodaj TARGET kolonu
+# Dodaj TARGET kolonu - svi age/gender labeli u jednom grupiranom prolazu kroz age-gender file
 print("\nIzvlacenje TARGET informacija...")
-df_hr['Target'] = df_hr.apply(
-    lambda row: extract_target_info(row['Campaign ID']) if row['Has_Demographics'] else "Auto | All",
-    axis=1
-)
+df_hr['Target'] = target_series(df_hr['Campaign ID'], df_hr['Has_Demographics'], df_age)
 
 print(f"  OK - TARGET kolona kreirana")
 
@@ -348,31 +106,19 @@ print("STEP 4: KREIRANJE KOMPONENTI ZA MEGA NAME")
 print("=" * 120)
 
 # Brand
-df_hr['Brand'] = df_hr.apply(
-    lambda row: extract_brand_from_account(row['Account'], row['Campaign']),
-    axis=1
-)
+df_hr['Brand'] = brand_series(df_hr['Account'], df_hr['Campaign'])
 
 # Ad Format
-df_hr['Ad_Format'] = df_hr.apply(
-    lambda row: extract_ad_format(row['YouTube_Ad_Formats'], row['Campaign']),
-    axis=1
-)
+df_hr['Ad_Format'] = ad_format_series(df_hr['YouTube_Ad_Formats'], df_hr['Campaign'])
 
 # Date Range
-df_hr['Date_Range'] = df_hr.apply(
-    lambda row: format_date_range(row['Start_Date'], row['End_Date']),
-    axis=1
-)
+df_hr['Date_Range'] = date_range_series(df_hr['Start_Date'], df_hr['End_Date'])
 
 # Bidding Strategy (shortened)
 df_hr['Bid_Strategy_Short'] = df_hr['Campaign bid strategy type'].apply(shorten_bidding_strategy)
 
 # Goal
-df_hr['Goal'] = df_hr.apply(
-    lambda row: determine_goal(row['Bid_Strategy_Short'], row['Ad_Format']),
-    axis=1
-)
+df_hr['Goal'] = goal_series(df_hr['Bid_Strategy_Short'], df_hr['Ad_Format'])
 
 print(f"\nKomponente kreirane:")
 print(f"  Brand: {df_hr['Brand'].nunique()} unikatnih")
@@ -11,6 +11,8 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+from hub_rolling import saturation_analysis
+
 print("=" * 80)
 print("ROLLING REACH V2 - PROCESSING PIPELINE")
 print("=" * 80)
@@ -141,61 +143,27 @@ print(format_stats)
 print("\n[STEP 4] S-CURVE SATURATION ANALYSIS...")
 print("-" * 80)
 
-# Sort by Campaign_ID and Window_Start
-df_rolling_sorted = df_rolling.sort_values(['Campaign_ID', 'Window_Start'])
-
 # Find campaigns with multiple windows
-campaign_window_counts = df_rolling_sorted.groupby('Campaign_ID').size()
+campaign_window_counts = df_rolling.groupby('Campaign_ID').size()
 multi_window_campaigns = campaign_window_counts[campaign_window_counts > 1]
 
 print(f"Campaigns with multiple windows: {len(multi_window_campaigns)}")
-print(f"Total campaigns: {df_rolling_sorted['Campaign_ID'].nunique()}")
-
-# Analyze reach growth patterns
-saturation_data = []
-
-for campaign_id in multi_window_campaigns.index[:50]:  # Analyze top 50 campaigns
-    campaign_data = df_rolling_sorted[df_rolling_sorted['Campaign_ID'] == campaign_id].copy()
-    campaign_data = campaign_data.sort_values('Window_Start')
-
-    if len(campaign_data) >= 3:  # Need at least 3 windows
-        reaches = campaign_data['Reach'].values
-
-        # Calculate growth rates
-        growth_rates = []
-        for i in range(1, len(reaches)):
-            if reaches[i-1] > 0:
-                growth_rate = (reaches[i] - reaches[i-1]) / reaches[i-1] * 100
-                growth_rates.append(growth_rate)
-
-        if len(growth_rates) >= 2:
-            # Check if growth is slowing (saturation)
-            early_growth = np.mean(growth_rates[:len(growth_rates)//2])
-            late_growth = np.mean(growth_rates[len(growth_rates)//2:])
-
-            saturation_indicator = 'Yes' if late_growth < early_growth * 0.5 else 'No'
-
-            saturation_data.append({
-                'Campaign_ID': campaign_id,
-                'Campaign': campaign_data.iloc[0]['Campaign'],
-                'Brand': campaign_data.iloc[0]['Brand'],
-                'Windows': len(campaign_data),
-                'Initial_Reach': reaches[0],
-                'Peak_Reach': reaches.max(),
-                'Final_Reach': reaches[-1],
-                'Early_Growth_%': round(early_growth, 2),
-                'Late_Growth_%': round(late_growth, 2),
-                'Saturation': saturation_indicator
-            })
-
-df_saturation = pd.DataFrame(saturation_data)
+print(f"Total campaigns: {df_rolling['Campaign_ID'].nunique()}")
+
+# Analyze reach growth patterns for ALL campaigns in one grouped pass
+df_saturation = saturation_analysis(df_rolling)
 
 if len(df_saturation) > 0:
-    print("\nSaturation Analysis (Top campaigns with multiple windows):")
+    print("\nSaturation Analysis (all campaigns with 3+ windows):")
     print(df_saturation.head(20))
 
     saturated_count = len(df_saturation[df_saturation['Saturation'] == 'Yes'])
     print(f"\nCampaigns showing saturation: {saturated_count}/{len(df_saturation)} ({saturated_count/len(df_saturation)*100:.1f}%)")
+
+    # Saturation table for the whole portfolio
+    saturation_file = 'ROLLING_SATURATION_ANALYSIS_2025.csv'
+    df_saturation.to_csv(saturation_file, index=False, encoding='utf-8-sig')
+    print(f"Saturation table saved: {saturation_file}")
 else:
     print("\nNot enough data for saturation analysis")
 
@@ -8,6 +8,8 @@ Spajanje no segmentation (SIDRO) i segmented (YOUTUBE DETALJI)
 import pandas as pd
 import numpy as np
 
+from hub_parsing import parse_cost_series
+
 # ============================================================================
 # PATHS
 # ============================================================================
@@ -35,16 +37,7 @@ print(f"Broj kolona: {len(df_master.columns)}")
 print(f"Kolone: {list(df_master.columns)}\n")
 
 # Parsiraj Cost
-def parse_cost(value):
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
-df_master['Cost_parsed'] = df_master['Cost'].apply(parse_cost)
+df_master['Cost_parsed'] = parse_cost_series(df_master['Cost'])
 
 # GRAND TOTAL SPEND (APSOLUTNA ISTINA)
 grand_total = df_master['Cost_parsed'].sum()
@@ -75,7 +68,7 @@ print(f"Broj redaka: {len(df_segmented):,}")
 print(f"Broj kolona: {len(df_segmented.columns)}")
 
 # Parsiraj Cost u segmented
-df_segmented['Cost_parsed'] = df_segmented['Cost'].apply(parse_cost)
+df_segmented['Cost_parsed'] = parse_cost_series(df_segmented['Cost'])
 
 # Youtube Total Spend
 youtube_total = df_segmented['Cost_parsed'].sum()
@@ -7,5 +7,6 @@ echo Pokrecem aplikaciju...
 echo.
 
 cd /d "%~dp0"
+python hub_cache.py
 python -m streamlit run hub_app.py
 pause
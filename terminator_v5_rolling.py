@@ -12,6 +12,14 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
+import hub_cache
+import hub_data
+import hub_datasets
+import hub_rolling
+from hub_parsing import parse_cost_series, parse_number_series, parse_float_series, parse_date_range_series
+from hub_demographics import resolve_demographics_batch
+from hub_standardization import standardized_name_series
+
 # ============================================================================
 # PAGE CONFIG
 # ============================================================================
@@ -237,36 +245,6 @@ st.markdown("""
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_cost(value):
-    """Parse cost values."""
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
-def parse_number(value):
-    """Parse numeric values."""
-    if pd.isna(value):
-        return 0
-    value_str = str(value).strip().replace(',', '').strip()
-    try:
-        return int(float(value_str))
-    except:
-        return 0
-
-def parse_float(value):
-    """Parse float values."""
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace(',', '').replace('%', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
 @st.cache_data
 def load_campaign_data(file_path):
     """Load and parse the campaign data.
@@ -275,287 +253,81 @@ def load_campaign_data(file_path):
     df = pd.read_csv(file_path, delimiter=';', encoding='utf-8-sig')
 
     # Parse numeric columns
-    df['Cost_parsed'] = df['Cost'].apply(parse_cost)
-    df['Impr_parsed'] = df['Impr.'].apply(parse_number)
-    df['Reach_parsed'] = df['Peak_Reach'].apply(parse_number)  # Temporary, will be replaced
+    df['Cost_parsed'] = parse_cost_series(df['Cost'])
+    df['Impr_parsed'] = parse_number_series(df['Impr.'])
+    df['Reach_parsed'] = parse_number_series(df['Peak_Reach'])  # Temporary, will be replaced
 
     # Parse additional metrics if they exist
     if 'Clicks' in df.columns:
-        df['Clicks_parsed'] = df['Clicks'].apply(parse_number)
+        df['Clicks_parsed'] = parse_number_series(df['Clicks'])
     else:
         df['Clicks_parsed'] = 0
 
     if 'CTR' in df.columns:
-        df['CTR_parsed'] = df['CTR'].apply(parse_float)
+        df['CTR_parsed'] = parse_float_series(df['CTR'])
     else:
         df['CTR_parsed'] = 0.0
 
     if 'Avg. CPC' in df.columns:
-        df['Avg_CPC_parsed'] = df['Avg. CPC'].apply(parse_cost)
+        df['Avg_CPC_parsed'] = parse_cost_series(df['Avg. CPC'])
     else:
         df['Avg_CPC_parsed'] = 0.0
 
     if 'Avg. CPM' in df.columns:
-        df['Avg_CPM_parsed'] = df['Avg. CPM'].apply(parse_cost)
+        df['Avg_CPM_parsed'] = parse_cost_series(df['Avg. CPM'])
     else:
         df['Avg_CPM_parsed'] = 0.0
 
     if 'TrueView views' in df.columns:
-        df['TrueView_views_parsed'] = df['TrueView views'].apply(parse_number)
+        df['TrueView_views_parsed'] = parse_number_series(df['TrueView views'])
     else:
         df['TrueView_views_parsed'] = 0
 
     if 'TrueView avg. CPV' in df.columns:
-        df['TrueView_CPV_parsed'] = df['TrueView avg. CPV'].apply(parse_cost)
+        df['TrueView_CPV_parsed'] = parse_cost_series(df['TrueView avg. CPV'])
     else:
         df['TrueView_CPV_parsed'] = 0.0
 
     if 'Conversions' in df.columns:
-        df['Conversions_parsed'] = df['Conversions'].apply(parse_float)
+        df['Conversions_parsed'] = parse_float_series(df['Conversions'])
     else:
         df['Conversions_parsed'] = 0.0
 
     if 'Conv. rate' in df.columns:
-        df['Conv_rate_parsed'] = df['Conv. rate'].apply(parse_float)
+        df['Conv_rate_parsed'] = parse_float_series(df['Conv. rate'])
     else:
         df['Conv_rate_parsed'] = 0.0
 
     if 'Cost / conv.' in df.columns:
-        df['Cost_per_conv_parsed'] = df['Cost / conv.'].apply(parse_cost)
+        df['Cost_per_conv_parsed'] = parse_cost_series(df['Cost / conv.'])
     else:
         df['Cost_per_conv_parsed'] = 0.0
 
     # Calculate CPM
     df['CPM'] = np.where(df['Impr_parsed'] > 0, (df['Cost_parsed'] / df['Impr_parsed']) * 1000, 0)
 
-    # Extract Quarter from Date_Range
-    def extract_quarter(date_range):
-        if pd.isna(date_range):
-            return 'Unknown'
-        date_str = str(date_range).lower()
-
-        if any(month in date_str for month in ['jan', 'feb', 'mar']):
-            if '25' in date_str:
-                return 'Q1 2025'
-        if any(month in date_str for month in ['apr', 'may', 'jun']):
-            if '25' in date_str:
-                return 'Q2 2025'
-        if any(month in date_str for month in ['jul', 'aug', 'sep']):
-            if '25' in date_str:
-                return 'Q3 2025'
-        if any(month in date_str for month in ['oct', 'nov', 'dec']):
-            if '25' in date_str:
-                return 'Q4 2025'
-
-        return 'Unknown'
-
-    df['Quarter'] = df['Date_Range'].apply(extract_quarter)
+    # Parse Date_Range into typed Range_Start / Range_End / Year / Quarter columns
+    date_columns = parse_date_range_series(df['Date_Range'])
+    for column in date_columns.columns:
+        df[column] = date_columns[column]
 
     return df
 
-@st.cache_data
-def load_demographics_data(file_path):
-    """Load demographics (age-gender) data."""
-    try:
-        df = pd.read_csv(file_path, delimiter=';', encoding='utf-8-sig')
-        df['Cost_parsed'] = df['Cost'].apply(parse_cost)
-        return df
-    except:
-        return pd.DataFrame()
-
-def parse_age_range(age_str):
-    """
-    Parse age range string to get min and max age.
-    Examples:
-    - '18-24' -> (18, 24)
-    - '25 - 34' -> (25, 34)  [handles spaces]
-    - '65+' -> (65, 100)
-    - 'Unknown' -> (0, 0)
-    """
-    age_str = str(age_str).strip()
-
-    if age_str in ['Unknown', '', 'N/A']:
-        return (0, 0)
-
-    # Remove all spaces for easier parsing
-    age_str_clean = age_str.replace(' ', '')
-
-    if '-' in age_str_clean:
-        # Format: "18-24" or "25-34" or "25 - 34"
-        parts = age_str_clean.split('-')
-        try:
-            age_min = int(parts[0])
-            age_max_str = parts[1].replace('+', '')
-            age_max = int(age_max_str) if age_max_str else 100
-        except:
-            return (0, 0)
-    elif '+' in age_str_clean:
-        # Format: "65+" or "65 +"
-        try:
-            age_min = int(age_str_clean.replace('+', ''))
-            age_max = 100
-        except:
-            return (0, 0)
-    else:
-        # Single number or unknown
-        try:
-            age_min = age_max = int(age_str_clean)
-        except:
-            return (0, 0)
-
-    return (age_min, age_max)
-
-def get_full_range_demographics(campaign_id, df_demographics, threshold=0.10):
-    """
-    Get FULL RANGE demographics with THRESHOLD FILTERING.
-
-    CRITICAL CHANGE: Only includes age/gender segments that account for at least
-    10% of total campaign spend. This eliminates noise from optimized targeting
-    and accidental impressions.
-
-    Examples:
-    - Campaign with 95% spend in 25-34 → Returns "25-34" (NOT "18-65+")
-    - Campaign with 40% in 18-24, 45% in 25-34 → Returns "18-34"
-    - Campaign with 5% in each age → Returns dominant segment only
-
-    This ensures accurate targeting representation and meaningful filter options.
-    """
-    if df_demographics is None or len(df_demographics) == 0:
-        return ("Unknown", "Unknown")
-
-    # Filter for this campaign
-    demo_data = df_demographics[df_demographics['Campaign ID'] == campaign_id]
-
-    if len(demo_data) == 0:
-        return ("Unknown", "Unknown")
-
-    # Calculate total spend for this campaign
-    total_spend = demo_data['Cost_parsed'].sum()
-
-    if total_spend == 0:
-        return ("Unknown", "Unknown")
+@st.cache_data(max_entries=1)
+def load_rolling_aggregates_version(file_path, source_version):
+    """Peak reach / mean frequency per campaign for one version (size, mtime) of the rolling file."""
+    return hub_rolling.load_rolling_aggregates(file_path)
 
-    # Group by Age and calculate spend per segment
-    age_spend = demo_data.groupby('Age')['Cost_parsed'].sum()
-
-    # Filter ages by threshold (10% minimum) AND exclude Unknown
-    significant_ages = []
-    for age, spend in age_spend.items():
-        age_str = str(age).strip()
-
-        # CRITICAL: Skip Unknown and invalid values
-        if age_str in ['Unknown', 'nan', '', 'N/A']:
-            continue
-
-        percentage = spend / total_spend
-
-        # Only include if meets 10% threshold
-        if percentage >= threshold:
-            significant_ages.append((age_str, spend, percentage))
-
-    # If no significant ages meet threshold, fall back to dominant segment
-    if len(significant_ages) == 0:
-        valid_ages = {age: spend for age, spend in age_spend.items()
-                      if str(age).strip() not in ['Unknown', 'nan', '', 'N/A']}
-
-        if len(valid_ages) > 0:
-            dominant_age = max(valid_ages, key=valid_ages.get)
-            dominant_spend = valid_ages[dominant_age]
-            significant_ages = [(str(dominant_age), dominant_spend, dominant_spend / total_spend)]
-        else:
-            return ("Unknown", "Unknown")
+def load_rolling_aggregates(file_path):
+    """Rolling aggregates from the incremental store - synced again whenever the rolling file changes."""
+    source = hub_cache.source_fingerprint(file_path, with_hash=False)
+    source_version = None if source is None else (source['size'], source['mtime_ns'])
+    return load_rolling_aggregates_version(file_path, source_version)
 
-    # Sort by percentage descending
-    significant_ages.sort(key=lambda x: x[2], reverse=True)
-
-    # CRITICAL: If only ONE significant age segment, return it AS IS (don't create range)
-    if len(significant_ages) == 1:
-        age_range = significant_ages[0][0]
-    else:
-        # Multiple significant segments - create range from min to max
-        age_strings = [a[0] for a in significant_ages]
-
-        # Parse all significant ages to find min/max
-        age_min = 999
-        age_max = 0
-
-        for age_str in age_strings:
-            min_age, max_age = parse_age_range(age_str)
-            if min_age > 0:
-                if min_age < age_min:
-                    age_min = min_age
-                # Don't let 65+ (100) inflate the max
-                if max_age < 100 and max_age > age_max:
-                    age_max = max_age
-                elif max_age >= 100:  # This is 65+
-                    age_max = 65
-
-        # Construct range
-        if age_min == 999 or age_max == 0:
-            age_range = significant_ages[0][0]  # Fallback to dominant
-        elif age_min == age_max:
-            age_range = str(age_min)
-        elif age_max >= 65:
-            age_range = f"{age_min}-65+"
-        else:
-            age_range = f"{age_min}-{age_max}"
-
-    # Gender logic with threshold
-    gender_spend = demo_data.groupby('Gender')['Cost_parsed'].sum()
-
-    significant_genders = []
-    for gender, spend in gender_spend.items():
-        gender_str = str(gender).strip()
-
-        # CRITICAL: Skip Unknown
-        if gender_str in ['Unknown', 'nan', '', 'N/A']:
-            continue
-
-        percentage = spend / total_spend
-
-        if percentage >= threshold:
-            significant_genders.append(gender_str)
-
-    # If no significant genders, fall back to dominant
-    if len(significant_genders) == 0:
-        valid_genders = {gender: spend for gender, spend in gender_spend.items()
-                        if str(gender).strip() not in ['Unknown', 'nan', '', 'N/A']}
-
-        if len(valid_genders) > 0:
-            dominant_gender = max(valid_genders, key=valid_genders.get)
-            significant_genders = [str(dominant_gender)]
-        else:
-            gender = 'Unknown'
-            return (age_range, gender)
-
-    # Map gender codes
-    gender_map = {
-        'F': 'Female',
-        'M': 'Male',
-        'Female': 'Female',
-        'Male': 'Male',
-    }
-
-    genders_normalized = [gender_map.get(g, g) for g in significant_genders]
-
-    if len(genders_normalized) > 1:
-        gender = 'All'
-    else:
-        gender = genders_normalized[0]
-
-    # CRITICAL: Check if campaign has ANY spend in Unknown category
-    # If yes, add '+ UNK' suffix to indicate "grey zone" users
-    unknown_spend = 0
-    for age, spend in age_spend.items():
-        age_str = str(age).strip()
-        if age_str in ['Unknown', 'nan', '', 'N/A', 'Undetermined']:
-            unknown_spend += spend
-
-    # Add + UNK suffix if there's at least 0.01 EUR in Unknown
-    if unknown_spend >= 0.01:
-        age_range = age_range + ' + UNK'
-
-    return (age_range, gender)
+@st.cache_resource
+def load_demographics_data(file_path):
+    """Load demographics (age-gender) data - one read-only copy shared by every session."""
+    return hub_datasets.freeze_frame(hub_data.load_demographics_data(file_path))
 
 def calculate_weighted_cpm(df):
     """Calculate weighted average CPM."""
@@ -602,33 +374,6 @@ def get_targeting_level(df_filtered):
     else:
         return ('🌍 NATIONAL TARGETING', 'Croatia', '#28a745')  # Green - default
 
-def rebuild_campaign_name(row):
-    """Rebuild standardized name with correct demographics and brand."""
-    parts = []
-
-    if pd.notna(row.get('Brand')):
-        parts.append(str(row['Brand']))
-
-    if pd.notna(row.get('Ad_Format')):
-        parts.append(str(row['Ad_Format']))
-
-    # Use corrected demographics
-    if 'Target_Corrected' in row:
-        parts.append(row['Target_Corrected'])
-    elif pd.notna(row.get('Target')):
-        parts.append(str(row['Target']))
-
-    if pd.notna(row.get('Date_Range')):
-        parts.append(str(row['Date_Range']))
-
-    if pd.notna(row.get('Bid_Strategy_Short')):
-        parts.append(str(row['Bid_Strategy_Short']))
-
-    if pd.notna(row.get('Goal')):
-        parts.append(str(row['Goal']))
-
-    return " | ".join(parts)
-
 # ============================================================================
 # LOAD DATA
 # ============================================================================
@@ -641,24 +386,15 @@ try:
     df_campaigns = load_campaign_data(CAMPAIGN_PATH)
     df_demographics = load_demographics_data(DEMOGRAPHICS_PATH)
 
-    # Load rolling reach data
-    df_rolling = pd.read_csv(ROLLING_REACH_PATH, encoding='utf-8-sig')
-    df_rolling['Reach'] = pd.to_numeric(df_rolling['Reach'], errors='coerce')
-    df_rolling['Avg_Frequency'] = pd.to_numeric(df_rolling['Avg_Frequency'], errors='coerce')
-
-    # Get peak reach and avg frequency per campaign from rolling data
-    rolling_agg = df_rolling.groupby('Campaign_ID').agg({
-        'Reach': 'max',  # Peak reach across all windows
-        'Avg_Frequency': 'mean'  # Average frequency across windows
-    }).reset_index()
-    rolling_agg.columns = ['Campaign ID', 'Peak_Reach_Rolling', 'Avg_Frequency_Rolling']
+    # Peak reach and avg frequency per campaign (incremental rolling store)
+    rolling_agg = load_rolling_aggregates(ROLLING_REACH_PATH)
 
     # Merge rolling reach data into campaigns dataframe
     df_campaigns = df_campaigns.merge(rolling_agg, on='Campaign ID', how='left')
 
     # Use rolling reach if available, otherwise fallback to original
     df_campaigns['Peak_Reach_Final'] = df_campaigns['Peak_Reach_Rolling'].fillna(df_campaigns['Peak_Reach'])
-    df_campaigns['Reach_parsed'] = df_campaigns['Peak_Reach_Final'].apply(parse_number)
+    df_campaigns['Reach_parsed'] = parse_number_series(df_campaigns['Peak_Reach_Final'])
 
     # Add frequency from rolling data
     df_campaigns['Avg_Frequency'] = df_campaigns['Avg_Frequency_Rolling']
@@ -674,19 +410,17 @@ try:
     if unknown_quarter_count > 0:
         df_campaigns = df_campaigns[df_campaigns['Quarter'] != 'Unknown']
 
-    # Calculate FULL RANGE demographics with THRESHOLD filtering
-    demographics_results = df_campaigns['Campaign ID'].apply(
-        lambda cid: get_full_range_demographics(cid, df_demographics)
-    )
+    # Calculate FULL RANGE demographics with THRESHOLD filtering (one grouped pass)
+    demographics_results = resolve_demographics_batch(df_demographics).set_index('Campaign ID')
 
-    df_campaigns['Age_Range'] = demographics_results.apply(lambda x: x[0])
-    df_campaigns['Gender'] = demographics_results.apply(lambda x: x[1])
+    df_campaigns['Age_Range'] = df_campaigns['Campaign ID'].map(demographics_results['Age_Range']).fillna('Unknown')
+    df_campaigns['Gender'] = df_campaigns['Campaign ID'].map(demographics_results['Gender']).fillna('Unknown')
 
     # Update Target column with corrected demographics
     df_campaigns['Target_Corrected'] = df_campaigns['Age_Range'] + " | " + df_campaigns['Gender']
 
     # Rebuild Standardized_Campaign_Name with corrected demographics
-    df_campaigns['Standardized_Campaign_Name_Corrected'] = df_campaigns.apply(rebuild_campaign_name, axis=1)
+    df_campaigns['Standardized_Campaign_Name_Corrected'] = standardized_name_series(df_campaigns)
 
     # Aggregate by Campaign ID to ensure one campaign = one row
     duplicate_count = df_campaigns['Campaign ID'].duplicated().sum()
@@ -718,6 +452,9 @@ try:
             'Cost_per_conv_parsed': 'mean',
             'CPM': 'mean',
             'Quarter': 'first',
+            'Range_Start': 'first',
+            'Range_End': 'first',
+            'Year': 'first',
             'Age_Range': 'first',
             'Gender': 'first',
             'Target_Corrected': 'first',
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Benchmark Suite
+Tests that the synthetic datasets keep the schemas of the real files, scale
+their row counts, are reproducible for a seed and resolve to the demographics
+of their template campaigns, and that a benchmark run writes the JSON results
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import hub_benchmark
+import hub_generator
+from hub_cache import CAMPAIGN_PATH, DEMOGRAPHICS_PATH
+from hub_data import load_campaign_data, load_demographics_data, prepare_campaigns
+from hub_rolling import ROLLING_REACH_PATH
+from hub_checks import banner, check, finish
+
+banner("BENCHMARK SUITE TEST")
+
+SOURCES = {'campaigns': (CAMPAIGN_PATH, ';'), 'demographics': (DEMOGRAPHICS_PATH, ';'), 'rolling': (ROLLING_REACH_PATH, ',')}
+
+with tempfile.TemporaryDirectory() as tmp:
+
+    # ========================================================================
+    # TEST 1: SYNTHETIC DATA
+    # ========================================================================
+
+    print("\n[TEST 1] Synthetic files: schema, size, reproducibility")
+
+    paths = hub_benchmark.write_synthetic_data(os.path.join(tmp, 'x3'), 3)
+    again = hub_benchmark.write_synthetic_data(os.path.join(tmp, 'x3_again'), 3)
+
+    for name, (source_path, delimiter) in SOURCES.items():
+        source = hub_generator.read_raw(source_path, delimiter)
+        synthetic = hub_generator.read_raw(paths[name], delimiter)
+        check(list(synthetic.columns) == list(source.columns) and len(synthetic) == 3 * len(source),
+              f"{name}: same columns, {len(synthetic):,} rows = 3 x {len(source):,}")
+        ids = pd.to_numeric(synthetic['Campaign_ID' if name == 'rolling' else 'Campaign ID'])
+        check((ids >= hub_generator.SYNTHETIC_ID_BASE).all(), f"{name}: synthetic Campaign IDs only")
+        with open(paths[name], 'rb') as a, open(again[name], 'rb') as b:
+            check(a.read() == b.read(), f"{name}: same seed -> identical file")
+
+    # ========================================================================
+    # TEST 2: SYNTHETIC CAMPAIGNS BEHAVE LIKE THEIR TEMPLATES
+    # ========================================================================
+
+    print("\n[TEST 2] Synthetic campaigns resolve to the demographics of their templates")
+
+    df_campaigns = prepare_campaigns(load_campaign_data(paths['campaigns']), load_demographics_data(paths['demographics']))
+    real = prepare_campaigns(load_campaign_data(CAMPAIGN_PATH), load_demographics_data(DEMOGRAPHICS_PATH))
+
+    # Template of every synthetic campaign, from the generator's seeded blocks
+    template_ids = pd.to_numeric(hub_generator.read_raw(CAMPAIGN_PATH)['Campaign ID']).to_numpy(dtype=np.int64)
+    numbers = (df_campaigns['Campaign ID'] - hub_generator.SYNTHETIC_ID_BASE).to_numpy(dtype=np.int64)
+    templates = np.empty(len(numbers), dtype=np.int64)
+    for block in np.unique(numbers // hub_generator.BLOCK_CAMPAIGNS):
+        in_block = numbers // hub_generator.BLOCK_CAMPAIGNS == block
+        block_templates = hub_generator.campaign_block(block, len(template_ids), hub_benchmark.SEED)[1]
+        templates[in_block] = block_templates[numbers[in_block] % hub_generator.BLOCK_CAMPAIGNS]
+
+    paired = df_campaigns.assign(Template_ID=template_ids[templates]).merge(
+        real[['Campaign ID', 'Age_Range', 'Gender']], left_on='Template_ID', right_on='Campaign ID', suffixes=('', '_template'))
+
+    # Costs are written rounded to the cent, which can tip a near-threshold segment of a ~1 EUR campaign
+    same = [paired[column].astype(str) == paired[f'{column}_template'].astype(str) for column in ['Age_Range', 'Gender']]
+    consistent = (same[0] & same[1]).mean()
+    check(len(paired) > 0.9 * len(df_campaigns), f"{len(paired):,} of {len(df_campaigns):,} campaigns matched to their template")
+    check(consistent >= 0.99, f"{consistent:.1%} of campaigns: Age_Range / Gender of their template")
+    check(len(df_campaigns) > 2 * len(real), f"{len(df_campaigns):,} synthetic campaigns from {len(real):,} templates")
+
+    ratio = df_campaigns['Cost_parsed'].sum() / (3 * real['Cost_parsed'].sum())
+    print(f"[INFO] synthetic spend / 3 x real spend: {ratio:.2f}")
+    check(0.5 < ratio < 2.0, "synthetic campaigns have realistic (scaled, not identical) spend")
+
+    # ========================================================================
+    # TEST 3: RESULTS JSON
+    # ========================================================================
+
+    print("\n[TEST 3] Benchmark run writes machine-readable results")
+
+    output = os.path.join(tmp, 'results.json')
+    results, written = hub_benchmark.run_benchmark(scales=[1, 2], repeat=1, output=output, log=lambda message: None)
+    with open(written, encoding='utf-8') as f:
+        loaded = json.load(f)
+
+    check(written == output and loaded == results, "results written to --output")
+    check([scale['scale'] for scale in loaded['scales']] == [1, 2], "one entry per scale")
+    check(loaded['scales'][1]['rows']['demographics'] == 2 * loaded['scales'][0]['rows']['demographics'],
+          "row counts recorded per scale")
+
+    stages = loaded['scales'][0]['stages']
+    expected = ['load:campaigns', 'load:demographics', 'load:rolling', 'prepare_campaigns', 'demographics_resolution',
+                'filter_index', 'scenario:all', 'render:age_chart', 'rolling:fit_reach_curves']
+    check(all(name in stages for name in expected), f"{len(stages)} stages timed")
+    check(all({'median_ms', 'min_ms', 'calls'} <= set(stage) for stage in stages.values()), "median / min / calls per stage")
+    check(stages['render:age_chart']['calls'] == len(hub_benchmark.filter_scenarios(real)), "render stages once per scenario")
+    print(hub_benchmark.format_results(loaded).split('\n')[0])
+
+finish("Benchmark Suite")
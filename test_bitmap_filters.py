@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Bitmap Index Filter Engine
+Tests that FilterIndex.select() returns exactly the rows of the old sequential
+DataFrame filtering, and measures per-interaction latency
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import time
+
+from hub_data import build_campaign_frame
+from hub_filters import FilterIndex, FilterPipeline, SelectionCache, FILTER_COLUMNS, is_filter_active
+
+# Set UTF-8 encoding for output
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+print("=" * 80)
+print("BITMAP FILTER ENGINE TEST")
+print("=" * 80)
+
+failures = 0
+
+def sequential_filter(df, search_query, budget_range, selections):
+    """The original hub_app.py filter chain (one DataFrame per step)."""
+    df_filtered = df.copy()
+
+    if search_query and search_query.strip():
+        search_lower = search_query.strip().lower()
+        df_filtered = df_filtered[df_filtered['Campaign'].str.lower().str.contains(search_lower, na=False)]
+
+    df_filtered = df_filtered[
+        (df_filtered['Cost_parsed'] >= budget_range[0]) &
+        (df_filtered['Cost_parsed'] <= budget_range[1])
+    ]
+
+    for column, selected in selections.items():
+        if is_filter_active(selected):
+            df_filtered = df_filtered[df_filtered[column].isin(selected)]
+
+    return df_filtered
+
+print("\n[LOAD] Preparing campaign frame...")
+df = build_campaign_frame(
+    'MASTER_ADS_HR_CLEANED.csv',
+    'data - v3/age - gender - v3/campaign age - gender - version 3.csv'
+)
+print(f"[OK] {len(df)} campaigns")
+
+start = time.perf_counter()
+index = FilterIndex(df)
+print(f"[OK] Index built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+# ============================================================================
+# TEST 1: RANDOM FILTER COMBINATIONS
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 1: RANDOM FILTER COMBINATIONS")
+print("=" * 80)
+
+rng = np.random.default_rng(42)
+options = {col: ['Svi'] + sorted(df[col].dropna().unique().tolist()) for col in FILTER_COLUMNS}
+queries = ['', '', 'mcd', 'split', '2025', 'yt', 'zzz']
+max_cost = df['Cost_parsed'].max()
+
+mismatches = 0
+n_cases = 300
+for _ in range(n_cases):
+    selections = {}
+    for col in FILTER_COLUMNS:
+        k = rng.integers(0, 3)
+        selections[col] = list(rng.choice(options[col], size=min(k, len(options[col])), replace=False))
+
+    mode = rng.integers(0, 3)
+    if mode == 0:
+        # Slider range
+        low = float(rng.uniform(0, max_cost / 2))
+        budget_range = (low, float(low + rng.uniform(0, max_cost)))
+    elif mode == 1:
+        # Bounds exactly on existing costs (inclusive edges)
+        bounds = sorted(rng.choice(df['Cost_parsed'].to_numpy(), size=2))
+        budget_range = (float(bounds[0]), float(bounds[1]))
+    else:
+        # Benchmark mode: target budget +- 10%
+        target_budget = float(rng.uniform(100, 20000))
+        budget_range = (target_budget * 0.9, target_budget * 1.1)
+    query = queries[rng.integers(0, len(queries))]
+
+    expected = sequential_filter(df, query, budget_range, selections)
+    result = index.materialize(index.select(query, budget_range, selections))
+
+    if not expected.equals(result):
+        mismatches += 1
+
+if mismatches == 0:
+    print(f"[PASS] {n_cases} random combinations - identical rows, order and values")
+else:
+    failures += 1
+    print(f"[FAIL] {mismatches}/{n_cases} combinations differ")
+
+# ============================================================================
+# TEST 2: LATENCY
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 2: LATENCY (10x campaigns)")
+print("=" * 80)
+
+df_big = pd.concat([df] * 10, ignore_index=True)
+index_big = FilterIndex(df_big)
+selections = {col: options[col][1:3] for col in FILTER_COLUMNS[:2]}
+budget_range = (0.0, max_cost)
+
+start = time.perf_counter()
+for _ in range(20):
+    sequential_filter(df_big, '', budget_range, selections)
+sequential_ms = (time.perf_counter() - start) / 20 * 1000
+
+start = time.perf_counter()
+for _ in range(20):
+    index_big.materialize(index_big.select('', budget_range, selections))
+bitmap_ms = (time.perf_counter() - start) / 20 * 1000
+
+print(f"[INFO] {len(df_big):,} rows - sequential: {sequential_ms:.2f} ms, bitmap: {bitmap_ms:.2f} ms")
+
+# ============================================================================
+# TEST 3: BENCHMARK MODE LOOKUP (sorted cost index)
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 3: BENCHMARK LOOKUP (100x campaigns)")
+print("=" * 80)
+
+df_huge = pd.concat([df] * 100, ignore_index=True)
+index_huge = FilterIndex(df_huge)
+cost = df_huge['Cost_parsed'].to_numpy()
+target_budget = 5000.0
+
+start = time.perf_counter()
+for _ in range(100):
+    scan_rows = np.flatnonzero((cost >= target_budget * 0.9) & (cost <= target_budget * 1.1))
+scan_ms = (time.perf_counter() - start) / 100 * 1000
+
+start = time.perf_counter()
+for _ in range(100):
+    lookup_rows = index_huge.budget_positions(target_budget * 0.9, target_budget * 1.1)
+lookup_ms = (time.perf_counter() - start) / 100 * 1000
+
+if np.array_equal(scan_rows, lookup_rows):
+    print(f"[PASS] Sorted lookup returns the same {len(lookup_rows):,} rows as the full scan")
+else:
+    failures += 1
+    print("[FAIL] Sorted lookup differs from full scan")
+
+print(f"[INFO] {len(df_huge):,} rows - full scan: {scan_ms:.3f} ms, binary search: {lookup_ms:.3f} ms")
+
+# ============================================================================
+# TEST 4: MEMOIZED PIPELINE (incremental reruns)
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 4: MEMOIZED PIPELINE")
+print("=" * 80)
+
+pipeline = FilterPipeline(index)
+state = {'search': '', 'budget': (0.0, float(max_cost)), 'selections': {col: [] for col in FILTER_COLUMNS}}
+
+# Random walk: one widget changes per rerun, like a user in the sidebar
+mismatches = 0
+n_steps = 300
+for _ in range(n_steps):
+    widget = rng.integers(0, len(FILTER_COLUMNS) + 2)
+    if widget == 0:
+        state['search'] = queries[rng.integers(0, len(queries))]
+    elif widget == 1:
+        low = float(rng.uniform(0, max_cost / 2))
+        state['budget'] = (low, float(low + rng.uniform(0, max_cost)))
+    else:
+        col = FILTER_COLUMNS[widget - 2]
+        k = rng.integers(0, 3)
+        state['selections'][col] = list(rng.choice(options[col], size=min(k, len(options[col])), replace=False))
+
+    expected = index.select(state['search'], state['budget'], state['selections'])
+    result = pipeline.run(state['search'], state['budget'], state['selections'])
+    if not np.array_equal(expected, result):
+        mismatches += 1
+
+if mismatches == 0:
+    print(f"[PASS] {n_steps} incremental reruns - same rows as a full select()")
+else:
+    failures += 1
+    print(f"[FAIL] {mismatches}/{n_steps} incremental reruns differ")
+
+# Display-only rerun: no stage may be recomputed
+runs_before = pipeline.stage_runs
+pipeline.run(state['search'], state['budget'], state['selections'])
+if pipeline.stage_runs == runs_before:
+    print("[PASS] Unchanged filters (display-only rerun) - no filtering")
+else:
+    failures += 1
+    print("[FAIL] Unchanged filters recomputed a stage")
+
+# Downstream change: only the last stage is recomputed
+last_col = FILTER_COLUMNS[-1]
+state['selections'][last_col] = options[last_col][1:2]
+runs_before = pipeline.stage_runs
+pipeline.run(state['search'], state['budget'], state['selections'])
+if pipeline.stage_runs - runs_before == 1:
+    print(f"[PASS] Changing '{last_col}' recomputed 1 stage, upstream reused")
+else:
+    failures += 1
+    print(f"[FAIL] Changing '{last_col}' recomputed {pipeline.stage_runs - runs_before} stages")
+
+print(f"[INFO] stage runs: {pipeline.stage_runs}, reuses: {pipeline.stage_reuses}")
+
+# ============================================================================
+# TEST 5: LRU CACHE OF FILTER COMBINATIONS
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 5: LRU CACHE OF FILTER COMBINATIONS")
+print("=" * 80)
+
+def calculate_totals(df):
+    total_impressions = df['Impr_parsed'].sum()
+    cpm = (df['Cost_parsed'].sum() / total_impressions * 1000) if total_impressions > 0 else 0.0
+    return (df['Cost_parsed'].sum(), total_impressions, cpm)
+
+pipeline = FilterPipeline(index, totals_function=calculate_totals, cache_size=4)
+full_range = (0.0, float(max_cost))
+views = [{'Brand': options['Brand'][i:i + 1], 'Quarter': []} for i in range(1, 6)]
+
+# Toggle between 3 views, then come back to the first one
+for view in views[:3] + views[:1]:
+    rows = pipeline.run('', full_range, view)
+
+expected_rows = index.select('', full_range, views[0])
+stats = pipeline.cache.stats()
+if np.array_equal(rows, expected_rows) and stats['hits'] == 1 and stats['misses'] == 3:
+    print(f"[PASS] Returning to a recent view is a cache hit ({stats['hits']} hit, {stats['misses']} misses)")
+else:
+    failures += 1
+    print(f"[FAIL] Unexpected cache behaviour: {stats}")
+
+if pipeline.totals() == calculate_totals(index.materialize(expected_rows)):
+    print("[PASS] Cached totals equal freshly computed totals")
+else:
+    failures += 1
+    print("[FAIL] Cached totals differ")
+
+# Order-insensitive key: same selection in another order is a hit
+pipeline.run('', full_range, {'Brand': options['Brand'][2:4], 'Quarter': []})
+hits_before = pipeline.cache.hits
+pipeline.run('', full_range, {'Brand': options['Brand'][2:4][::-1], 'Quarter': []})
+pipeline.run('', full_range, views[0])
+pipeline.run('', full_range, {'Brand': options['Brand'][2:4][::-1], 'Quarter': []})
+if pipeline.cache.hits - hits_before == 2:
+    print("[PASS] Multiselect order does not change the cache key")
+else:
+    failures += 1
+    print("[FAIL] Reordered selection missed the cache")
+
+# Eviction: entry cap and memory cap
+cache = SelectionCache(max_entries=2, max_bytes=10 ** 9)
+for i in range(3):
+    cache.put(('view', i), np.arange(10), None)
+if cache.get(('view', 0)) is None and cache.get(('view', 2)) is not None and cache.evictions == 1:
+    print("[PASS] Entry cap evicts the least recently used entry")
+else:
+    failures += 1
+    print("[FAIL] Entry cap eviction")
+
+cache = SelectionCache(max_entries=100, max_bytes=2 * (8000 + SelectionCache.ENTRY_OVERHEAD_BYTES))
+for i in range(5):
+    cache.put(('view', i), np.arange(1000), None)
+if len(cache.entries) == 2 and cache.nbytes <= cache.max_bytes:
+    print(f"[PASS] Memory cap keeps {len(cache.entries)} entries ({cache.nbytes:,} bytes)")
+else:
+    failures += 1
+    print(f"[FAIL] Memory cap: {len(cache.entries)} entries, {cache.nbytes:,} bytes")
+
+# ============================================================================
+# TEST 6: DATE-RANGE FILTER (typed Range_Start / Range_End)
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 6: DATE-RANGE FILTER")
+print("=" * 80)
+
+date_windows = [('2025-01-01', '2025-03-31'), ('2025-06-15', '2025-06-15'), ('2024-01-01', '2024-12-31')]
+date_mismatches = 0
+for first_day, last_day in date_windows:
+    expected = np.flatnonzero(
+        ((df['Range_Start'] <= pd.Timestamp(last_day)) & (df['Range_End'] >= pd.Timestamp(first_day))).to_numpy()
+    )
+    result = index.select(date_range=(first_day, last_day))
+    piped = FilterPipeline(index).run(date_range=(first_day, last_day))
+    if not (np.array_equal(expected, result) and np.array_equal(expected, piped)):
+        date_mismatches += 1
+    print(f"[INFO] {first_day} .. {last_day}: {len(result)} campaigns")
+
+if date_mismatches == 0:
+    print("[PASS] Date-range overlap filter matches the DataFrame comparison")
+else:
+    failures += 1
+    print(f"[FAIL] {date_mismatches} date windows differ")
+
+print("\n" + "=" * 80)
+if failures == 0:
+    print("[DONE] Bitmap Filter Test Complete - all checks passed")
+else:
+    print(f"[DONE] Bitmap Filter Test Complete - {failures} FAILED")
+print("=" * 80)
+
+if failures > 0:
+    sys.exit(1)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Prepared Campaign Frame Cache
+Tests that the Feather cache returns the same frame as the full pipeline and
+is invalidated by source changes and threshold changes
+"""
+
+import pandas as pd
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import hub_cache
+from hub_data import build_campaign_frame, category_options, CATEGORICAL_COLUMNS
+from hub_checks import banner, check, finish
+
+banner("CAMPAIGN CACHE TEST")
+
+if hub_cache.feather is None:
+    print("[SKIP] pyarrow not installed - cache disabled")
+    sys.exit(0)
+
+# Work on copies so the real cache and sources are never touched
+work_dir = tempfile.mkdtemp(prefix='hub_cache_test_')
+campaign_path = os.path.join(work_dir, 'campaigns.csv')
+demographics_path = os.path.join(work_dir, 'demographics.csv')
+cache_dir = os.path.join(work_dir, 'cache')
+
+shutil.copy(hub_cache.CAMPAIGN_PATH, campaign_path)
+if os.path.exists(hub_cache.DEMOGRAPHICS_PATH):
+    shutil.copy(hub_cache.DEMOGRAPHICS_PATH, demographics_path)
+
+try:
+    # ========================================================================
+    # TEST 1: ROUND TRIP
+    # ========================================================================
+
+    print("\n[TEST 1] Cached frame equals freshly built frame")
+
+    start = time.perf_counter()
+    expected = build_campaign_frame(campaign_path, demographics_path, 0.10)
+    build_time = time.perf_counter() - start
+
+    check(not hub_cache.is_cache_fresh(campaign_path, demographics_path, 0.10, cache_dir),
+          "No cache before first build")
+
+    hub_cache.load_prepared_campaigns(campaign_path, demographics_path, 0.10, cache_dir)
+    check(hub_cache.is_cache_fresh(campaign_path, demographics_path, 0.10, cache_dir),
+          "Cache is fresh after first load")
+
+    start = time.perf_counter()
+    cached = hub_cache.load_prepared_campaigns(campaign_path, demographics_path, 0.10, cache_dir)
+    cached_time = time.perf_counter() - start
+
+    try:
+        pd.testing.assert_frame_equal(expected, cached)
+        check(True, f"{len(cached)} campaigns, identical values and dtypes")
+    except AssertionError as e:
+        check(False, f"Frames differ: {e}")
+
+    print(f"[INFO] full pipeline: {build_time * 1000:.1f} ms, cached read: {cached_time * 1000:.1f} ms")
+
+    # ========================================================================
+    # TEST 2: INVALIDATION
+    # ========================================================================
+
+    print("\n[TEST 2] Invalidation")
+
+    check(not hub_cache.is_cache_fresh(campaign_path, demographics_path, 0.20, cache_dir),
+          "Different threshold -> stale")
+
+    # Touch without changing content -> hash confirms cache is still valid
+    os.utime(campaign_path, None)
+    time.sleep(0.01)
+    os.utime(campaign_path, None)
+    check(hub_cache.is_cache_fresh(campaign_path, demographics_path, 0.10, cache_dir),
+          "Touched but unchanged source -> still fresh")
+
+    # ... and the new mtime is recorded, so the next start does not hash again
+    with open(os.path.join(cache_dir, hub_cache.META_FILE), 'r', encoding='utf-8') as f:
+        recorded = json.load(f)['sources'][campaign_path]
+    check(recorded['mtime_ns'] == os.stat(campaign_path).st_mtime_ns,
+          "Touched source -> metadata mtime refreshed after the hash matched")
+
+    # Source changed while the frame was being built -> fingerprints from
+    # before the build do not match the file, the next check rebuilds
+    sources = hub_cache.source_fingerprints(campaign_path, demographics_path)
+    rebuilt = build_campaign_frame(campaign_path, demographics_path, 0.10)
+    with open(campaign_path, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    hub_cache.write_cache(rebuilt, campaign_path, demographics_path, 0.10, cache_dir, sources)
+    check(not hub_cache.is_cache_fresh(campaign_path, demographics_path, 0.10, cache_dir),
+          "Source modified during the build -> stale")
+
+    # Rebuild from the current file, then modify it
+    hub_cache.load_prepared_campaigns(campaign_path, demographics_path, 0.10, cache_dir)
+
+    # Append a byte -> size changes
+    with open(campaign_path, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    check(not hub_cache.is_cache_fresh(campaign_path, demographics_path, 0.10, cache_dir),
+          "Modified source -> stale")
+
+    # ========================================================================
+    # TEST 3: CATEGORICAL DIMENSION COLUMNS
+    # ========================================================================
+
+    print("\n[TEST 3] Categorical dimension columns")
+
+    columns = [col for col in CATEGORICAL_COLUMNS if col in cached.columns]
+    check(all(isinstance(cached[col].dtype, pd.CategoricalDtype) for col in columns),
+          f"{len(columns)} columns stored as Categorical")
+    check(all(category_options(cached[col]) == sorted(cached[col].dropna().astype(str).unique().tolist()) for col in columns),
+          "Sidebar options from categories equal sorted unique values")
+
+    object_bytes = cached[columns].astype(object).memory_usage(deep=True, index=False).sum()
+    categorical_bytes = cached[columns].memory_usage(deep=True, index=False).sum()
+    print(f"[INFO] Dimension columns: {object_bytes / 1024:.1f} KB as object, "
+          f"{categorical_bytes / 1024:.1f} KB as Categorical "
+          f"({(1 - categorical_bytes / object_bytes) * 100:.0f}% less)")
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+finish("Campaign Cache")
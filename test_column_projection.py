@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Column-pruned Export Loading
+Tests that the shared demographics / location loaders return only the
+declared columns with the same values as a full load, and how much parse
+time and memory the projection saves
+"""
+
+import time
+
+import pandas as pd
+
+from hub_data import DEMOGRAPHICS_COLUMNS, LOCATION_COLUMNS, load_demographics_data, load_location_data
+from hub_demographics import resolve_demographics_batch
+from hub_checks import banner, check, finish
+
+banner("COLUMN PROJECTION TEST")
+
+def timed(loader, *args, **kwargs):
+    start = time.perf_counter()
+    df = loader(*args, **kwargs)
+    return df, (time.perf_counter() - start) * 1000
+
+PATH_AGE_GENDER = "data - v3/age - gender - v3/campaign age - gender - version 3.csv"
+PATH_COUNTRY = "data - v3/campaign - country - v3/campaign location - version 3.csv"
+
+# ============================================================================
+# TEST 1: DEFAULT PROJECTIONS
+# ============================================================================
+
+print("\n[TEST 1] Declared columns, same values as a full load")
+
+for label, loader, path, columns in [
+    ('age-gender', load_demographics_data, PATH_AGE_GENDER, DEMOGRAPHICS_COLUMNS),
+    ('location', load_location_data, PATH_COUNTRY, LOCATION_COLUMNS),
+]:
+    full, full_ms = timed(loader, path, columns=None)
+    pruned, pruned_ms = timed(loader, path)
+
+    check(list(pruned.columns) == columns + ['Cost_parsed'], f"{label}: columns {list(pruned.columns)}")
+    check(full[columns + ['Cost_parsed']].equals(pruned), f"{label}: {len(pruned):,} rows identical to the full load")
+
+    full_mb = full.memory_usage(deep=True).sum() / 1e6
+    pruned_mb = pruned.memory_usage(deep=True).sum() / 1e6
+    print(f"[INFO] {label}: full {full_ms:.0f} ms / {full_mb:.1f} MB -> "
+          f"pruned {pruned_ms:.0f} ms / {pruned_mb:.1f} MB")
+    check(pruned_mb < full_mb, f"{label}: resident memory drops")
+
+# ============================================================================
+# TEST 2: CONSUMERS
+# ============================================================================
+
+print("\n[TEST 2] Consumers get the same results from pruned frames")
+
+full = load_demographics_data(PATH_AGE_GENDER, columns=None)
+pruned = load_demographics_data(PATH_AGE_GENDER)
+check(resolve_demographics_batch(full).equals(resolve_demographics_batch(pruned)),
+      "resolve_demographics_batch() unchanged")
+
+custom = load_location_data(PATH_COUNTRY, columns=LOCATION_COLUMNS + ['Campaign', 'Account name'])
+check(list(custom.columns) == LOCATION_COLUMNS + ['Campaign', 'Account name', 'Cost_parsed'],
+      "consumer-declared extra columns are loaded")
+
+only_ids = load_location_data(PATH_COUNTRY, columns=['Campaign ID'])
+check(list(only_ids.columns) == ['Campaign ID'], "projection without Cost has no Cost_parsed")
+
+check(len(load_demographics_data('missing file.csv')) == 0, "missing demographics file -> empty frame")
+
+finish("Column Projection")
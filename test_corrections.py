@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Bulk Ad_Format Corrections
+Tests that the keyed correction engine gives exactly the results of the old
+create_master_file.py / update_formats_from_cleaned.py loops (values, counts,
+not-found campaigns) and how it scales with the corrections table
+"""
+
+import pandas as pd
+import numpy as np
+import time
+
+from hub_corrections import apply_corrections
+from hub_checks import banner, check, finish
+
+banner("BULK CORRECTIONS TEST")
+
+def master_file_loop(df_main, df_format_fix):
+    """The original create_master_file.py KORAK 3."""
+    format_fix_dict = {}
+    for idx, row in df_format_fix.iterrows():
+        format_fix_dict[row['Campaign']] = row['Campaign Type']
+
+    fixed_count = 0
+    for idx, row in df_main.iterrows():
+        campaign_name = row['Campaign']
+        if campaign_name in format_fix_dict:
+            df_main.at[idx, 'Ad_Format'] = format_fix_dict[campaign_name]
+            fixed_count += 1
+    return fixed_count
+
+def update_formats_loop(df_main, df_cleaned):
+    """The original update_formats_from_cleaned.py update loop."""
+    format_mapping = dict(zip(df_cleaned['Campaign'], df_cleaned['Campaign Type']))
+    updated = []
+    not_found_campaigns = []
+    for campaign_name, new_format in format_mapping.items():
+        mask = df_main['Campaign'] == campaign_name
+        if mask.any():
+            updated.append((campaign_name, df_main.loc[mask, 'Ad_Format'].iloc[0], new_format))
+            df_main.loc[mask, 'Ad_Format'] = new_format
+        else:
+            not_found_campaigns.append(campaign_name)
+    return updated, not_found_campaigns
+
+df_main = pd.read_csv('ads_estimation_hub_HR_PROTOTYPE_V4_STANDARDIZED.csv', delimiter=';', encoding='utf-8-sig')
+df_fix = pd.read_csv('other-format-cleaned.csv', delimiter=';', encoding='utf-8-sig')
+print(f"[OK] {len(df_main):,} campaigns, {len(df_fix):,} corrections")
+
+# Analyst table with repeated keys (last one wins) and campaigns missing from the database
+df_messy = pd.concat([
+    df_fix,
+    df_fix.sample(20, random_state=1).assign(**{'Campaign Type': 'YouTube In-Stream'}),
+    pd.DataFrame({'Campaign': [f'Renamed campaign {i}' for i in range(15)], 'Campaign Type': 'Display'}),
+], ignore_index=True)
+df_messy = df_messy.sample(frac=1.0, random_state=2).reset_index(drop=True)
+
+# ============================================================================
+# TEST 1: create_master_file.py semantics
+# ============================================================================
+
+print("\n[TEST 1] Same result as the create_master_file.py loops")
+
+for label, corrections in [('analyst file', df_fix), ('repeated + unknown keys', df_messy)]:
+    expected_df = df_main.copy()
+    expected_count = master_file_loop(expected_df, corrections)
+
+    result_df = df_main.copy()
+    report = apply_corrections(result_df, corrections)
+
+    check(expected_df.equals(result_df) and expected_count == report.matched_rows,
+          f"{label}: {report.matched_rows} rows corrected")
+
+# ============================================================================
+# TEST 2: update_formats_from_cleaned.py semantics
+# ============================================================================
+
+print("\n[TEST 2] Same result as the update_formats_from_cleaned.py loop")
+
+for label, corrections in [('analyst file', df_fix), ('repeated + unknown keys', df_messy)]:
+    expected_df = df_main.copy()
+    updated, not_found = update_formats_loop(expected_df, corrections)
+
+    result_df = df_main.copy()
+    report = apply_corrections(result_df, corrections)
+
+    same_changes = list(report.changes.itertuples(index=False, name=None)) == updated
+    check(expected_df.equals(result_df) and same_changes and report.unmatched_keys == not_found,
+          f"{label}: {report.matched_keys} keys matched, {len(report.unmatched_keys)} unmatched reported")
+
+# ============================================================================
+# TEST 3: Campaign ID keys
+# ============================================================================
+
+print("\n[TEST 3] Corrections keyed by Campaign ID")
+
+id_table = pd.DataFrame({
+    'ID': list(df_main['Campaign ID'].sample(40, random_state=3)) + [1, 2, 3],
+    'Format': 'Demand Gen',
+})
+result_df = df_main.copy()
+report = apply_corrections(result_df, id_table, key='Campaign ID', value='Format', table_key='ID')
+corrected = result_df['Campaign ID'].isin(id_table['ID'])
+check((result_df.loc[corrected, 'Ad_Format'] == 'Demand Gen').all() and report.unmatched_keys == [1, 2, 3],
+      f"{report.matched_rows} rows corrected by ID, unknown IDs reported")
+
+# ============================================================================
+# TEST 4: SCALING
+# ============================================================================
+
+print("\n[TEST 4] Growing corrections tables")
+
+for factor in [1, 10, 100]:
+    big_main = pd.concat([df_main] * factor, ignore_index=True)
+    big_main['Campaign'] = big_main['Campaign'] + ' #' + (big_main.index // len(df_main)).astype(str)
+    big_fix = pd.concat([df_fix] * factor, ignore_index=True)
+    big_fix['Campaign'] = big_fix['Campaign'] + ' #' + (big_fix.index // len(df_fix)).astype(str)
+
+    start = time.perf_counter()
+    report = apply_corrections(big_main, big_fix)
+    engine_ms = (time.perf_counter() - start) * 1000
+
+    if factor <= 10:
+        loop_main = pd.concat([df_main] * factor, ignore_index=True)
+        loop_main['Campaign'] = big_main['Campaign']
+        start = time.perf_counter()
+        update_formats_loop(loop_main, big_fix)
+        loop_text = f"loop {(time.perf_counter() - start) * 1000:,.0f} ms"
+    else:
+        loop_text = "loop skipped"
+
+    print(f"[INFO] x{factor}: {len(big_main):,} campaigns, {len(big_fix):,} corrections -> "
+          f"engine {engine_ms:.1f} ms, {loop_text}")
+    check(report.matched_keys == len(big_fix.drop_duplicates('Campaign')), f"x{factor}: every correction applied")
+
+finish("Corrections")
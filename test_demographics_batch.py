@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Batch Demographics Resolver
+Tests that resolve_demographics_batch() returns exactly the same Age_Range / Gender
+labels as the per-campaign get_full_range_demographics()
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import time
+
+from hub_demographics import get_full_range_demographics, resolve_demographics_batch
+
+# Set UTF-8 encoding for output
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+print("=" * 80)
+print("BATCH DEMOGRAPHICS RESOLVER TEST")
+print("=" * 80)
+
+failures = 0
+
+AGES = ['18-24', '25-34', '35-44', '45-54', '55-64', '65+', 'Undetermined', 'Unknown', '25 - 34', np.nan]
+GENDERS = ['Female', 'Male', 'F', 'M', 'Unknown', 'Undetermined', np.nan]
+
+def make_demographics(n_campaigns, seed):
+    """Synthetic age-gender export covering thresholds, ties, zero spend and noise."""
+    rng = np.random.default_rng(seed)
+    rows = []
+
+    for i in range(n_campaigns):
+        campaign_id = 22000000000 + i
+        n_rows = rng.integers(1, 25)
+        mode = rng.integers(0, 5)
+
+        for _ in range(n_rows):
+            if mode == 0:
+                cost = 0.0                                   # Zero-spend campaign
+            elif mode == 1:
+                cost = float(rng.choice([10.0, 20.0, 0.005]))  # Ties + sub-cent noise
+            else:
+                cost = round(float(rng.exponential(500)), 2)
+
+            rows.append({
+                'Campaign ID': campaign_id,
+                'Age': AGES[rng.integers(0, len(AGES))],
+                'Gender': GENDERS[rng.integers(0, len(GENDERS))],
+                'Cost_parsed': cost,
+            })
+
+    return pd.DataFrame(rows)
+
+def reference_labels(df_demographics, threshold):
+    """Per-campaign reference resolution."""
+    campaign_ids = df_demographics['Campaign ID'].unique()
+    return {
+        cid: get_full_range_demographics(cid, df_demographics, threshold)
+        for cid in campaign_ids
+    }
+
+# ============================================================================
+# TEST 1: EQUIVALENCE ON SYNTHETIC DATA
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 1: EQUIVALENCE WITH get_full_range_demographics")
+print("=" * 80)
+
+for seed, threshold in [(1, 0.10), (2, 0.10), (3, 0.05), (4, 0.25)]:
+    df_demo = make_demographics(300, seed)
+
+    expected = reference_labels(df_demo, threshold)
+    batch = resolve_demographics_batch(df_demo, threshold).set_index('Campaign ID')
+
+    mismatches = [
+        (cid, labels, (batch.at[cid, 'Age_Range'], batch.at[cid, 'Gender']))
+        for cid, labels in expected.items()
+        if labels != (batch.at[cid, 'Age_Range'], batch.at[cid, 'Gender'])
+    ]
+
+    if len(mismatches) == 0 and len(batch) == len(expected):
+        print(f"[PASS] seed={seed} threshold={threshold:.2f}: {len(expected)} campaigns identical")
+    else:
+        failures += 1
+        print(f"[FAIL] seed={seed} threshold={threshold:.2f}: {len(mismatches)} mismatches")
+        for cid, exp, got in mismatches[:5]:
+            print(f"  {cid}: expected {exp}, got {got}")
+
+# ============================================================================
+# TEST 2: EMPTY INPUT
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 2: EMPTY DEMOGRAPHICS")
+print("=" * 80)
+
+empty = resolve_demographics_batch(pd.DataFrame())
+if list(empty.columns) == ['Campaign ID', 'Age_Range', 'Gender'] and len(empty) == 0:
+    print("[PASS] Empty input returns empty frame with join columns")
+else:
+    failures += 1
+    print("[FAIL] Empty input")
+
+# ============================================================================
+# TEST 3: SPEED
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 3: SPEED")
+print("=" * 80)
+
+df_demo = make_demographics(1000, 5)
+
+start = time.perf_counter()
+reference_labels(df_demo, 0.10)
+reference_time = time.perf_counter() - start
+
+start = time.perf_counter()
+resolve_demographics_batch(df_demo, 0.10)
+batch_time = time.perf_counter() - start
+
+print(f"[INFO] {len(df_demo):,} demographic rows, 1,000 campaigns")
+print(f"[INFO] per-campaign: {reference_time * 1000:.0f} ms, batch: {batch_time * 1000:.0f} ms")
+
+print("\n" + "=" * 80)
+if failures == 0:
+    print("[DONE] Batch Demographics Test Complete - all checks passed")
+else:
+    print(f"[DONE] Batch Demographics Test Complete - {failures} FAILED")
+print("=" * 80)
+
+if failures > 0:
+    sys.exit(1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Synthetic Export Generator
+Tests that the generated exports load through the typed schemas with the
+real column sets, reproduce the real distributions (age buckets, campaign
+types, accounts, formats, bid strategies), agree with each other on shared
+campaigns, are reproducible for a seed and are written with flat memory
+"""
+
+import os
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import hub_generator
+from hub_schema import EXPORT_SCHEMAS, read_export
+from hub_checks import banner, check, finish
+
+banner("SYNTHETIC EXPORT GENERATOR TEST")
+
+def shares(series):
+    return series.value_counts(normalize=True)
+
+def distance(real, synthetic):
+    """Total variation distance of two categorical distributions."""
+    return 0.5 * shares(real).subtract(shares(synthetic), fill_value=0).abs().sum()
+
+ROWS = 60_000
+quiet = lambda message: None
+
+with tempfile.TemporaryDirectory() as tmp:
+    paths = hub_generator.generate_exports(os.path.join(tmp, 'eur'), ROWS, log=quiet)
+    real = {kind: read_export(kind) for kind in hub_generator.GENERATED_EXPORTS}
+    synthetic = {kind: read_export(kind, path) for kind, path in paths.items()}
+
+    # ========================================================================
+    # TEST 1: SCHEMAS + FORMATTING
+    # ========================================================================
+
+    print("\n[TEST 1] Column sets, row counts, formatting")
+
+    for kind, df in synthetic.items():
+        check(list(df.columns) == list(real[kind].columns) and len(df) == ROWS,
+              f"{kind}: {len(df):,} rows, columns of the real export")
+        check(df['Cost'].notna().all() and (df['Cost'] > 0).mean() > 0.5, f"{kind}: every Cost parses")
+
+    with open(paths['age_gender'], encoding='utf-8-sig') as f:
+        f.readline()
+        first = f.readline().rstrip('\n').split(';')
+    print(f"[INFO] age_gender row: {first}")
+    check(first[-1].startswith('EUR ') and first[3].startswith('9'), "'EUR 1,234.56' money, synthetic Campaign IDs")
+
+    plain = hub_generator.generate_exports(os.path.join(tmp, 'plain'), 5000, money_style='plain',
+                                           kinds=['campaign_metrics'], log=quiet)
+    df_plain = read_export('campaign_metrics', plain['campaign_metrics'])
+    check(np.allclose(df_plain['Cost'], synthetic['campaign_metrics']['Cost'].iloc[:5000]),
+          "plain money style parses to the same values")
+
+    # ========================================================================
+    # TEST 2: DISTRIBUTIONS
+    # ========================================================================
+
+    print("\n[TEST 2] Distributions of the real files")
+
+    age = synthetic['age_gender']
+    check(set(age['Age']) == set(real['age_gender']['Age']) and set(age['Gender']) == set(real['age_gender']['Gender']),
+          f"age buckets {sorted(set(age['Age']))}")
+    check(age.groupby('Campaign ID').size().iloc[:-1].eq(21).all(), "21 age x gender rows per campaign")
+
+    for kind, column in [('campaign_metrics', 'Account'), ('location', 'Campaign type'),
+                         ('location', 'Country/Territory (User location)'), ('rolling_sheet', 'Type'),
+                         ('rolling_sheet', 'Bid_Strategy'), ('rolling_sheet', 'Brand')]:
+        tvd = distance(real[kind][column], synthetic[kind][column])
+        check(tvd < 0.05, f"{kind} {column}: distance {tvd:.3f}")
+
+    real_cost = real['campaign_metrics']['Cost']
+    synthetic_cost = synthetic['campaign_metrics']['Cost']
+    ratio = synthetic_cost.median() / real_cost.median()
+    print(f"[INFO] median campaign cost: real {real_cost.median():,.2f}, synthetic {synthetic_cost.median():,.2f}")
+    check(0.7 < ratio < 1.4, "campaign cost distribution close to the real one")
+
+    # ========================================================================
+    # TEST 3: CONSISTENT CAMPAIGNS
+    # ========================================================================
+
+    print("\n[TEST 3] Exports agree on shared campaigns")
+
+    metrics = synthetic['campaign_metrics'].set_index('Campaign ID')
+    for kind in ['age_gender', 'location', 'rolling_sheet']:
+        id_column = 'Campaign_ID' if kind == 'rolling_sheet' else 'Campaign ID'
+        names = synthetic[kind].drop_duplicates(id_column).set_index(id_column)['Campaign']
+        check(names.index.isin(metrics.index).all() and (metrics.loc[names.index, 'Campaign'] == names).all(),
+              f"{kind}: every campaign is in the metrics export with the same name")
+
+    location_cost = synthetic['location'].groupby('Campaign ID')['Cost'].sum()
+    relative = (location_cost / metrics.loc[location_cost.index, 'Cost']).median()
+    print(f"[INFO] median location / metrics cost per campaign: {relative:.3f}")
+    check(abs(relative - 1) < 0.05, "location spend adds up to the campaign spend")
+
+    # ========================================================================
+    # TEST 4: REPRODUCIBILITY + STREAMING
+    # ========================================================================
+
+    print("\n[TEST 4] Seeds and memory")
+
+    profiles = hub_generator.build_profiles(['age_gender'])
+    same = os.path.join(tmp, 'same.csv')
+    hub_generator.write_export(profiles['age_gender'], same, ROWS)
+    with open(same, 'rb') as a, open(paths['age_gender'], 'rb') as b:
+        check(a.read() == b.read(), "same seed -> identical file")
+
+    other = os.path.join(tmp, 'other.csv')
+    hub_generator.write_export(profiles['age_gender'], other, ROWS, seed=7)
+    check(not read_export('age_gender', other)['Cost'].equals(age['Cost']), "other seed -> other data")
+
+    peaks = {}
+    for rows in [200_000, 800_000]:
+        tracemalloc.start()
+        hub_generator.write_export(profiles['age_gender'], other, rows)
+        peaks[rows] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    print(f"[INFO] peak memory: {', '.join(f'{rows:,} rows {mb:.1f} MB' for rows, mb in peaks.items())}")
+    check(peaks[800_000] < 1.2 * peaks[200_000], "memory does not grow with the row count")
+
+finish("Synthetic Export Generator")
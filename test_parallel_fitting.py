@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Parallel Segment Curve Fitting
+Tests that the sharded ProcessPoolExecutor fit gives exactly the same
+parameter table as one serial fit, that the table is served as a ReachCurveModel,
+and reports the refit time per worker count
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import shutil
+import tempfile
+import time
+
+import hub_curves
+import hub_fitting
+from hub_cache import load_prepared_campaigns
+from hub_checks import banner, check, finish
+
+if __name__ == '__main__':
+    banner("PARALLEL CURVE FITTING TEST")
+
+    # ========================================================================
+    # TEST 1: SHARD BOUNDS
+    # ========================================================================
+
+    print("\n[TEST 1] Shards never split a segment")
+
+    rng = np.random.default_rng(5)
+    codes = np.sort(rng.integers(0, 500, 20000))
+    bounds = hub_fitting.shard_bounds(codes, 16)
+    covered = sum(stop - start for start, stop in bounds)
+    split = sum(1 for start, _ in bounds if start > 0 and codes[start] == codes[start - 1])
+    check(covered == len(codes) and split == 0, f"{len(bounds)} shards cover {covered:,} points, {split} segments split")
+
+    # ========================================================================
+    # TEST 2: CAMPAIGN SEGMENTS (real data)
+    # ========================================================================
+
+    print("\n[TEST 2] Brand x Ad_Format x Age_Range x Gender x Bid_Strategy_Short")
+
+    df_campaigns = load_prepared_campaigns()
+    serial = hub_fitting.fit_segment_curves(df_campaigns, max_workers=1)
+    parallel = hub_fitting.fit_segment_curves(df_campaigns, max_workers=2)
+    try:
+        pd.testing.assert_frame_equal(serial, parallel, check_exact=True)
+        check(True, f"{len(parallel)} segment fits identical (serial vs 2 workers)")
+    except AssertionError as e:
+        check(False, f"Parameter tables differ: {e}")
+
+    segment_sizes = df_campaigns.groupby(hub_fitting.SEGMENT_COLUMNS, observed=True).size()
+    print(f"[INFO] {len(segment_sizes)} segments, {(segment_sizes >= hub_curves.MIN_POINTS).sum()} with >= {hub_curves.MIN_POINTS} campaigns")
+
+    # Served through hub_curves.ReachCurveModel
+    curve_path = os.path.join(tempfile.mkdtemp(prefix='hub_fitting_test_'), hub_fitting.SEGMENT_CURVE_FILE)
+    hub_fitting.write_segment_curves(parallel, curve_path)
+    model = hub_fitting.load_segment_curves(curve_path)
+    first = parallel.iloc[0]
+    segment = [str(first[column]) for column in hub_fitting.SEGMENT_COLUMNS]
+    expected_reach = hub_curves.negative_exponential(5000.0, first['R_Max'], first['Scale'])
+    check(np.isclose(model.forecast(5000.0, *segment), expected_reach),
+          f"segment table served as ReachCurveModel ({' x '.join(segment)})")
+    check(model.forecast(5000.0, 'Nepostojeći brand', *segment[1:]) is None, "unfitted segment -> no forecast")
+    shutil.rmtree(os.path.dirname(curve_path), ignore_errors=True)
+
+    # ========================================================================
+    # TEST 3: NIGHTLY-SIZE REFIT (synthetic)
+    # ========================================================================
+
+    print("\n[TEST 3] Synthetic refit: 5,000 segments")
+
+    n_segments = 5000
+    points = rng.integers(5, 60, n_segments)
+    codes = rng.permutation(np.repeat(np.arange(n_segments), points))
+    scale = rng.uniform(500, 8000, n_segments)[codes]
+    cost = rng.uniform(0.05, 3.0, len(codes)) * scale
+    reach = hub_curves.negative_exponential(cost, rng.uniform(2e5, 2e6, n_segments)[codes], scale)
+
+    start = time.perf_counter()
+    expected = hub_curves.fit_negative_exponential(cost, reach, codes)
+    single_s = time.perf_counter() - start
+    print(f"[INFO] {len(codes):,} points, one unsharded fit: {single_s:.2f} s")
+
+    cores = hub_fitting.default_workers()
+    for workers in sorted({1, 2, cores}):
+        start = time.perf_counter()
+        result = hub_fitting.fit_curves_parallel(cost, reach, codes, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        try:
+            pd.testing.assert_frame_equal(expected, result, check_exact=True)
+            check(True, f"{workers} worker(s): identical parameters in {elapsed:.2f} s")
+        except AssertionError as e:
+            check(False, f"{workers} worker(s): parameters differ: {e}")
+    print(f"[INFO] {cores} core(s) available")
+
+    finish("Parallel Fitting")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Declarative Data Pipeline
+Tests step skipping by content hash (scripts and their imported modules),
+early cut-off, in-place steps, concurrent branches and failure handling on a
+small DAG of toy scripts
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import hub_pipeline
+from hub_pipeline import PipelineStep
+from hub_checks import banner, check, finish
+
+banner("PIPELINE TEST")
+
+BRANCH_SECONDS = 0.5
+
+SCRIPTS = {
+    # source -> upper-cased copy
+    'upper.py': "open('upper.txt', 'w').write(open('source.txt').read().upper())",
+    # two independent branches off upper.txt
+    'left.py': f"import time; time.sleep({BRANCH_SECONDS}); open('left.txt', 'w').write(open('upper.txt').read() + 'L')",
+    'right.py': f"import time; time.sleep({BRANCH_SECONDS}); open('right.txt', 'w').write(open('upper.txt').read() + 'R')",
+    # rewrites right.txt in place (idempotent)
+    'fix.py': "text = open('right.txt').read().rstrip('!'); open('right.txt', 'w').write(text + '!')",
+    'final.py': "from toy_helpers import join\nopen('final.txt', 'w').write(join(open('right.txt').read(), open('fixes.txt').read()))",
+    # shared code of final.py (imported, not declared as an input)
+    'toy_helpers.py': "from toy_format import SUFFIX\ndef join(left, right):\n    return left + right + SUFFIX",
+    'toy_format.py': "SUFFIX = ''",
+}
+
+STEPS = [
+    PipelineStep('upper', 'upper.py', inputs=['source.txt'], outputs=['upper.txt']),
+    PipelineStep('left', 'left.py', inputs=['upper.txt'], outputs=['left.txt']),
+    PipelineStep('right', 'right.py', inputs=['upper.txt'], outputs=['right.txt']),
+    PipelineStep('fix', 'fix.py', inputs=['right.txt'], outputs=['right.txt']),
+    PipelineStep('final', 'final.py', inputs=['right.txt', 'fixes.txt'], outputs=['final.txt']),
+]
+
+def write(root, path, text):
+    with open(os.path.join(root, path), 'w') as f:
+        f.write(text)
+
+def run(root, **kwargs):
+    return hub_pipeline.run_pipeline(STEPS, root=root, log=lambda message: None, **kwargs)
+
+def built(status):
+    return sorted(name for name, state in status.items() if state == 'built')
+
+root = tempfile.mkdtemp(prefix='hub_pipeline_test_')
+
+try:
+    for name, code in SCRIPTS.items():
+        write(root, name, code)
+    write(root, 'source.txt', 'campaigns')
+    write(root, 'fixes.txt', '+fix')
+
+    # ========================================================================
+    # TEST 1: DAG
+    # ========================================================================
+
+    print("\n[TEST 1] Dependencies follow the declared files")
+
+    dependencies = hub_pipeline.step_dependencies(STEPS)
+    check(dependencies['left'] == ['upper'] and dependencies['right'] == ['upper'], "left / right branch off upper")
+    check(dependencies['fix'] == ['right'] and dependencies['final'] == ['fix'], "final waits for the in-place fix")
+
+    dependencies = hub_pipeline.step_dependencies(hub_pipeline.PIPELINE_STEPS)
+    check(dependencies['hr_prototype'] == ['master_merge'] and dependencies['deep_cleaning'] == ['master_merge'],
+          "HR prototype and deep cleaning are independent branches")
+    check(dependencies['master_file'] == ['format_update'], "Master file waits for the format update")
+    check(dependencies['segment_curves'] == ['master_file'], "Segment curves are refitted after the master file")
+
+    check(hub_pipeline.script_modules('final.py', root) == ['toy_format.py', 'toy_helpers.py'],
+          "Local modules found through nested imports")
+    standardization = [step for step in hub_pipeline.PIPELINE_STEPS if step.name == 'standardization'][0]
+    check('hub_standardization.py' in hub_pipeline.step_sources(standardization),
+          "Standardization step depends on hub_standardization.py")
+
+    # ========================================================================
+    # TEST 2: FIRST BUILD
+    # ========================================================================
+
+    print("\n[TEST 2] First build runs every step, branches concurrently")
+
+    start = time.perf_counter()
+    status = run(root)
+    elapsed = time.perf_counter() - start
+    check(built(status) == sorted(step.name for step in STEPS), f"All {len(STEPS)} steps built in {elapsed:.2f} s")
+    check(elapsed < 2 * BRANCH_SECONDS + 0.4, "left / right ran concurrently")
+    with open(os.path.join(root, 'final.txt')) as f:
+        check(f.read() == 'CAMPAIGNSR!+fix', "Output of the chain is correct")
+
+    # ========================================================================
+    # TEST 3: SKIPPING
+    # ========================================================================
+
+    print("\n[TEST 3] Unchanged inputs skip")
+
+    status = run(root)
+    check(built(status) == [], "Second run builds nothing (in-place step included)")
+
+    os.utime(os.path.join(root, 'source.txt'))
+    check(built(run(root)) == [], "Touched but unchanged source builds nothing")
+
+    write(root, 'source.txt', 'Campaigns')
+    check(built(run(root)) == ['upper'], "Same upper-cased output cuts off the rest of the DAG")
+
+    write(root, 'fixes.txt', '+fix2')
+    check(built(run(root)) == ['final'], "Changed side input re-runs only its step")
+
+    write(root, 'toy_format.py', "SUFFIX = '#'")
+    check(built(run(root)) == ['final'], "Edited shared module re-runs the step that imports it")
+    with open(os.path.join(root, 'final.txt')) as f:
+        check(f.read().endswith('+fix2#'), "Rebuilt output uses the edited module")
+
+    os.remove(os.path.join(root, 'left.txt'))
+    check(built(run(root)) == ['left'], "Missing output re-runs only its step")
+
+    write(root, 'right.txt', 'edited by hand')
+    check(built(run(root)) == ['fix', 'right'], "Hand-edited in-place file re-runs its writers, not the unchanged dependant")
+
+    write(root, 'source.txt', 'reach')
+    status = run(root, dry_run=True)
+    check(set(status.values()) == {'stale'}, "Dry run reports the whole DAG stale, runs nothing")
+    check(built(run(root)) == sorted(step.name for step in STEPS), "Changed source rebuilds the whole DAG")
+
+    # ========================================================================
+    # TEST 4: FAILURES
+    # ========================================================================
+
+    print("\n[TEST 4] A failing step blocks only its dependants")
+
+    write(root, 'right.py', "raise SystemExit(3)")
+    status = run(root)
+    check(status['right'] == 'failed' and status['fix'] == 'blocked' and status['final'] == 'blocked',
+          "right failed, fix / final blocked")
+    check(status['left'] == 'skipped', "Independent branch unaffected")
+    check(os.path.exists(os.path.join(root, hub_pipeline.CACHE_DIR, hub_pipeline.LOG_DIR, 'right.log')),
+          "Step output captured in its log file")
+    check(run(root)['right'] == 'failed', "Failed step is retried on the next run")
+
+finally:
+    shutil.rmtree(root, ignore_errors=True)
+
+finish("Pipeline")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Fitted Reach Curves
+Tests the batch least-squares fit (parameter recovery, optimality against a
+dense per-segment search), forecast latency on the rolling windows and the
+freshness of the parameter cache
+"""
+
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+import numpy as np
+import time
+
+import hub_curves
+from hub_rolling import ROLLING_REACH_PATH, read_rolling_export
+from hub_checks import banner, check, finish
+
+banner("REACH CURVE TEST")
+
+# ============================================================================
+# TEST 1: PARAMETER RECOVERY (synthetic segments)
+# ============================================================================
+
+print("\n[TEST 1] Recover known curves from noisy synthetic windows")
+
+rng = np.random.default_rng(11)
+n_segments = 200
+true_r_max = rng.uniform(2e5, 2e6, n_segments)
+true_scale = rng.uniform(500, 8000, n_segments)
+points = rng.integers(5, 60, n_segments)
+
+codes = np.repeat(np.arange(n_segments), points)
+cost = rng.uniform(0.05, 3.0, len(codes)) * true_scale[codes]
+reach = hub_curves.negative_exponential(cost, true_r_max[codes], true_scale[codes])
+reach = reach * rng.normal(1.0, 0.01, len(codes))
+
+start = time.perf_counter()
+fitted = hub_curves.fit_negative_exponential(cost, reach, codes)
+fit_ms = (time.perf_counter() - start) * 1000
+
+r_max_error = np.abs(fitted['R_Max'].to_numpy() / true_r_max - 1)
+scale_error = np.abs(fitted['Scale'].to_numpy() / true_scale - 1)
+check(np.median(r_max_error) < 0.02 and np.median(scale_error) < 0.03,
+      f"Median error R_max {np.median(r_max_error) * 100:.2f}%, scale {np.median(scale_error) * 100:.2f}%")
+print(f"[INFO] {n_segments} segments, {len(codes):,} windows fitted in {fit_ms:.1f} ms")
+
+# ============================================================================
+# TEST 2: OPTIMALITY (dense search per segment on real windows)
+# ============================================================================
+
+print("\n[TEST 2] Batch fit is as good as a dense per-segment search")
+
+df_rolling = read_rolling_export(ROLLING_REACH_PATH)
+
+start = time.perf_counter()
+parameters = hub_curves.fit_reach_curves(df_rolling)
+fit_ms = (time.perf_counter() - start) * 1000
+print(f"[INFO] {len(parameters)} segments on {len(hub_curves.SEGMENT_LEVELS)} levels fitted in {fit_ms:.1f} ms")
+
+windows = hub_curves.prepare_windows(df_rolling)
+worse = 0
+for row in parameters[parameters['Level'] == 0].itertuples(index=False):
+    segment = windows[(windows['Brand'] == row.Brand) & (windows['Type'] == row.Type) & (windows['Target'] == row.Target)]
+    x = segment['Cost'].to_numpy()
+    y = segment['Reach'].to_numpy()
+
+    # Dense log grid, closed-form R_max for each candidate scale
+    scales = np.exp(np.linspace(np.log(x.mean() * 1e-2), np.log(x.mean() * 1e3), 20000))
+    basis = 1 - np.exp(-x[:, None] / scales[None, :])
+    r_max = np.maximum((y[:, None] * basis).sum(axis=0) / (basis * basis).sum(axis=0), 0)
+    dense_sse = ((y[:, None] - r_max * basis) ** 2).sum(axis=0).min()
+
+    fit_sse = ((y - hub_curves.negative_exponential(x, row.R_Max, row.Scale)) ** 2).sum()
+    if fit_sse > dense_sse * (1 + 1e-6) + 1e-6:
+        worse += 1
+
+check(worse == 0, f"All {len(parameters[parameters['Level'] == 0])} segment fits match the dense search")
+
+# ============================================================================
+# TEST 3: FORECASTS
+# ============================================================================
+
+print("\n[TEST 3] Forecast lookups")
+
+model = hub_curves.ReachCurveModel(parameters)
+segment = parameters[parameters['Level'] == 0].iloc[0]
+
+forecast = model.forecast(3000, segment['Brand'], segment['Type'], segment['Target'])
+expected = hub_curves.negative_exponential(3000, segment['R_Max'], segment['Scale'])
+check(abs(forecast - expected) < 1e-6, f"{segment['Brand']} / {segment['Type']}: €3,000 -> {forecast:,.0f} reach")
+
+fallback = model.curve(segment['Brand'], segment['Type'], 'Nepostojeći target')
+check(fallback is not None and fallback.Level == 1, "Unknown target falls back to Brand x Type")
+check(model.forecast(3000, 'Nepostojeći brand', 'Nepostojeći format') is None, "Unknown format -> no forecast")
+
+n_queries = 100000
+start = time.perf_counter()
+for _ in range(n_queries):
+    model.forecast(3000, segment['Brand'], segment['Type'], segment['Target'])
+query_us = (time.perf_counter() - start) / n_queries * 1e6
+print(f"[INFO] Forecast latency: {query_us:.2f} µs per query")
+
+# ============================================================================
+# TEST 4: PARAMETER CACHE
+# ============================================================================
+
+print("\n[TEST 4] Parameter cache follows the rolling file")
+
+with tempfile.TemporaryDirectory() as tmp:
+    rolling_path = os.path.join(tmp, 'rolling.csv')
+    cache_dir = os.path.join(tmp, 'cache')
+    shutil.copy(ROLLING_REACH_PATH, rolling_path)
+
+    hub_curves.load_reach_curves(rolling_path, cache_dir)
+    check(hub_curves.is_curve_cache_fresh(rolling_path, cache_dir), "Fitted parameters cached as fresh")
+
+    # The rolling file is rewritten while the curves are being fitted
+    fit = hub_curves.fit_reach_curves
+    def fit_while_rewritten(df):
+        with open(rolling_path, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        return fit(df)
+
+    hub_curves.fit_reach_curves = fit_while_rewritten
+    try:
+        os.remove(os.path.join(cache_dir, hub_curves.CURVE_META_FILE))
+        hub_curves.load_reach_curves(rolling_path, cache_dir)
+    finally:
+        hub_curves.fit_reach_curves = fit
+    check(not hub_curves.is_curve_cache_fresh(rolling_path, cache_dir), "Source modified during the fit -> stale")
+
+finish("Reach Curve")
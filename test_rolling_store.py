@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Incremental Rolling Reach Store
+Tests that weekly window ingestion gives the same per-campaign peak reach and
+mean frequency as grouping the full window history
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import hub_rolling
+from hub_checks import banner, check, finish
+
+banner("ROLLING REACH STORE TEST")
+
+def full_history_aggregates(df_rolling):
+    """The original terminator_v5_rolling.py aggregation."""
+    rolling_agg = df_rolling.groupby('Campaign_ID').agg({
+        'Reach': 'max',
+        'Avg_Frequency': 'mean'
+    }).reset_index()
+    rolling_agg.columns = ['Campaign ID', 'Peak_Reach_Rolling', 'Avg_Frequency_Rolling']
+    return rolling_agg
+
+def same_aggregates(expected, result):
+    merged = expected.merge(result, on='Campaign ID', how='outer', suffixes=('_expected', '_store'))
+    return (
+        len(merged) == len(expected) == len(result) and
+        np.array_equal(merged['Peak_Reach_Rolling_expected'], merged['Peak_Reach_Rolling_store']) and
+        np.allclose(merged['Avg_Frequency_Rolling_expected'], merged['Avg_Frequency_Rolling_store'],
+                    rtol=1e-12, equal_nan=True)
+    )
+
+if hub_rolling.feather is None:
+    print("[SKIP] pyarrow not installed - rolling store disabled")
+    sys.exit(0)
+
+df_rolling = pd.read_csv(hub_rolling.ROLLING_REACH_PATH, encoding='utf-8-sig')
+print(f"[OK] {len(df_rolling):,} window rows, {df_rolling['Campaign_ID'].nunique()} campaigns")
+
+work_dir = tempfile.mkdtemp(prefix='hub_rolling_test_')
+
+try:
+    # ========================================================================
+    # TEST 1: FULL FILE
+    # ========================================================================
+
+    print("\n[TEST 1] Store built from the full file equals the full-history groupby")
+
+    expected = full_history_aggregates(df_rolling)
+    result = hub_rolling.load_rolling_aggregates(hub_rolling.ROLLING_REACH_PATH, os.path.join(work_dir, 'full'))
+    check(same_aggregates(expected, result), f"{len(result)} campaigns identical")
+
+    # ========================================================================
+    # TEST 2: WEEKLY EXPORTS (overlapping)
+    # ========================================================================
+
+    print("\n[TEST 2] Weekly exports ingested one by one")
+
+    store_dir = os.path.join(work_dir, 'weekly')
+    store = hub_rolling.RollingReachStore(store_dir)
+
+    window_starts = sorted(df_rolling['Window_Start'].unique())
+    weeks = np.array_split(np.array(window_starts), 8)
+    previous = []
+    for week_number, week in enumerate(weeks, start=1):
+        # Every export repeats the previous week's windows - they must be skipped
+        export = df_rolling[df_rolling['Window_Start'].isin(list(week) + previous)]
+        export_path = os.path.join(work_dir, f'export_week_{week_number}.csv')
+        export.to_csv(export_path, index=False, encoding='utf-8-sig')
+
+        start = time.perf_counter()
+        added = store.sync_file(export_path)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"[INFO] Week {week_number}: {len(export):,} rows in export, {added:,} new windows ({elapsed:.1f} ms)")
+        previous = list(week)
+        if week_number == 1:
+            first_partition = store.partition_paths()[0]
+            first_written = os.stat(first_partition).st_mtime_ns
+
+    result = hub_rolling.RollingReachStore(store_dir).campaign_aggregates()
+    check(store.meta['window_count'] == len(df_rolling), f"{store.meta['window_count']:,} windows stored once each")
+    check(same_aggregates(expected, result), "Incremental aggregates equal the full-history groupby")
+    check(len(store.partition_paths()) == len(weeks), f"{len(store.partition_paths())} partitions, one per export")
+    check(os.stat(first_partition).st_mtime_ns == first_written, "Stored partitions are never rewritten")
+
+    reopened = hub_rolling.RollingReachStore(store_dir)
+    stored = reopened.windows
+    check(len(stored) == len(df_rolling) and not stored.duplicated(subset=hub_rolling.WINDOW_KEY).any(),
+          "Partitions together hold every window once")
+    check(reopened.ingest(hub_rolling.read_rolling_export(hub_rolling.ROLLING_REACH_PATH)) == 0,
+          "Reopened store dedupes against the stored key columns")
+
+    # ========================================================================
+    # TEST 3: UNCHANGED SOURCE
+    # ========================================================================
+
+    print("\n[TEST 3] Unchanged source is not re-read")
+
+    check(store.sync_file(export_path) == 0, "Re-sync of the last export adds nothing")
+
+    start = time.perf_counter()
+    hub_rolling.load_rolling_aggregates(hub_rolling.ROLLING_REACH_PATH, os.path.join(work_dir, 'full'))
+    cached_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    full_history_aggregates(pd.read_csv(hub_rolling.ROLLING_REACH_PATH, encoding='utf-8-sig'))
+    full_ms = (time.perf_counter() - start) * 1000
+    print(f"[INFO] full CSV read + groupby: {full_ms:.1f} ms, synced store: {cached_ms:.1f} ms")
+
+    # ========================================================================
+    # TEST 4: S-CURVE SATURATION (whole portfolio)
+    # ========================================================================
+
+    print("\n[TEST 4] Grouped saturation analysis equals the per-campaign loop")
+
+    def saturation_loop(df):
+        """The original process_rolling_reach_v2.py STEP 4 loop (without the 50-campaign cap)."""
+        df_sorted = df.sort_values(['Campaign_ID', 'Window_Start'])
+        window_counts = df_sorted.groupby('Campaign_ID').size()
+        saturation_data = []
+        for campaign_id in window_counts[window_counts > 1].index:
+            campaign_data = df_sorted[df_sorted['Campaign_ID'] == campaign_id].sort_values('Window_Start')
+            if len(campaign_data) >= 3:
+                reaches = campaign_data['Reach'].values
+                growth_rates = [(reaches[i] - reaches[i-1]) / reaches[i-1] * 100
+                                for i in range(1, len(reaches)) if reaches[i-1] > 0]
+                if len(growth_rates) >= 2:
+                    early_growth = np.mean(growth_rates[:len(growth_rates)//2])
+                    late_growth = np.mean(growth_rates[len(growth_rates)//2:])
+                    saturation_data.append({
+                        'Campaign_ID': campaign_id,
+                        'Campaign': campaign_data.iloc[0]['Campaign'],
+                        'Brand': campaign_data.iloc[0]['Brand'],
+                        'Windows': len(campaign_data),
+                        'Initial_Reach': reaches[0],
+                        'Peak_Reach': reaches.max(),
+                        'Final_Reach': reaches[-1],
+                        'Early_Growth_%': round(early_growth, 2),
+                        'Late_Growth_%': round(late_growth, 2),
+                        'Saturation': 'Yes' if late_growth < early_growth * 0.5 else 'No'
+                    })
+        return pd.DataFrame(saturation_data)
+
+    start = time.perf_counter()
+    expected = saturation_loop(df_rolling)
+    loop_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    result = hub_rolling.saturation_analysis(df_rolling)
+    grouped_ms = (time.perf_counter() - start) * 1000
+
+    try:
+        pd.testing.assert_frame_equal(expected, result)
+        check(True, f"{len(result)} campaigns identical")
+    except AssertionError as e:
+        check(False, f"Saturation tables differ: {e}")
+    print(f"[INFO] loop: {loop_ms:.1f} ms, grouped: {grouped_ms:.1f} ms")
+
+    # Edge cases: zero / missing reach, single-window and two-window campaigns
+    edge = df_rolling.head(600).copy()
+    edge['Reach'] = edge['Reach'].astype(float)
+    rng = np.random.default_rng(7)
+    edge.loc[rng.choice(edge.index, 40, replace=False), 'Reach'] = 0.0
+    edge.loc[rng.choice(edge.index, 20, replace=False), 'Reach'] = np.nan
+    try:
+        pd.testing.assert_frame_equal(saturation_loop(edge), hub_rolling.saturation_analysis(edge))
+        check(True, "Zero / missing reach handled like the loop")
+    except AssertionError as e:
+        check(False, f"Edge cases differ: {e}")
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+finish("Rolling Store")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Typed Export Schemas
+Tests that read_export() gives, for every registered Google Ads export, exactly
+the values of the old read_csv + parse_* path (both CSV engines), loads only
+the requested columns and rejects files with missing columns
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from hub_parsing import parse_cost_series, parse_number_series, parse_float_series, parse_export_dates_series
+from hub_schema import EXPORT_SCHEMAS, read_export, pa
+from hub_checks import banner, check, finish
+
+banner("EXPORT SCHEMA TEST")
+
+# The per-script way: infer dtypes, then re-parse every numeric column by hand
+OLD_PARSERS = {
+    'number': lambda s: pd.to_numeric(s, errors='coerce'),
+    'count': parse_number_series,
+    'money': parse_cost_series,
+    'float': parse_float_series,
+    'date': parse_export_dates_series,
+    'datetime': lambda s: pd.to_datetime(s, errors='coerce'),
+}
+
+def old_load(kind, file_path=None):
+    schema = EXPORT_SCHEMAS[kind]
+    df = pd.read_csv(file_path or schema.path, delimiter=schema.delimiter, encoding='utf-8-sig')
+    for column, column_kind in schema.columns.items():
+        if column_kind != 'text':
+            df[column] = OLD_PARSERS[column_kind](df[column])
+    return df
+
+engines = ['c'] + (['pyarrow'] if pa is not None else [])
+print(f"[INFO] engines: {', '.join(engines)}")
+
+# ============================================================================
+# TEST 1: EVERY EXPORT
+# ============================================================================
+
+print("\n[TEST 1] Typed loads equal read_csv + parse_*")
+
+for kind, schema in EXPORT_SCHEMAS.items():
+    if not os.path.exists(schema.path):
+        print(f"[INFO] {kind}: {schema.path} not found - skipped")
+        continue
+
+    start = time.perf_counter()
+    expected = old_load(kind)
+    old_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for engine in engines:
+        start = time.perf_counter()
+        result = read_export(kind, engine=engine)
+        timings.append(f"{engine} {(time.perf_counter() - start) * 1000:.0f} ms")
+        check(expected.equals(result), f"{kind} [{engine}]: {len(result):,} rows x {len(result.columns)} columns")
+
+    print(f"[INFO] {kind}: old {old_ms:.0f} ms, {', '.join(timings)}")
+
+# ============================================================================
+# TEST 2: EDGE CELLS (raw UI export formatting)
+# ============================================================================
+
+print("\n[TEST 2] 'EUR 1,234.56', '--', empty cells, script sheet dates")
+
+with tempfile.TemporaryDirectory() as tmp:
+    age_path = os.path.join(tmp, 'age.csv')
+    with open(age_path, 'w', encoding='utf-8-sig') as f:
+        f.write("Account name;Customer ID;Campaign;Campaign ID;Age;Gender;Currency code;Impr.;Clicks;Cost\n"
+                "Brand EUR;123-456-7890;Camp A;101;18 - 24;Female;EUR;1,234,567;2,155;EUR 1,234.56\n"
+                "Brand EUR;123-456-7890;Camp A;101;Unknown;;EUR;--;0;--\n"
+                ";123-456-7890;Camp B;102;65+;Male;EUR;;;\n"
+                "Brand EUR;123-456-7890;NA;103;25 - 34;None;EUR;12.9;1;0.04\n")
+
+    rolling_path = os.path.join(tmp, 'rolling.csv')
+    with open(rolling_path, 'w', encoding='utf-8-sig') as f:
+        f.write("Window_Start,Window_End,Account_ID,Account_Name,Campaign_ID,Campaign,Type,Cost,Impressions,Reach,Avg_Frequency\n"
+                "2025/01/01,2025/03/31,843-228-4976,Acc,222,Camp,VIDEO,1600.201855,1150315,388235,3.462773835\n"
+                "2025/04/01,not a date,843-228-4976,Acc,,Camp,VIDEO,12.5,10,,n/a\n")
+
+    for kind, path in [('age_gender', age_path), ('rolling_sheet', rolling_path)]:
+        expected = old_load(kind, path)
+        for engine in engines:
+            result = read_export(kind, path, engine=engine)
+            check(expected.equals(result), f"{kind} [{engine}]: edge rows identical")
+
+    result = read_export('age_gender', age_path)
+    check(result['Cost'].tolist() == [1234.56, 0.0, 0.0, 0.04] and result['Impr.'].tolist() == [1234567, 0, 0, 12],
+          "EUR / thousands separators / '--' parsed like parse_cost / parse_number")
+
+    # ========================================================================
+    # TEST 3: COLUMN SELECTION + VALIDATION
+    # ========================================================================
+
+    print("\n[TEST 3] Requested columns and missing columns")
+
+    for engine in engines:
+        result = read_export('age_gender', age_path, columns=['Cost', 'Campaign ID'], engine=engine)
+        check(list(result.columns) == ['Cost', 'Campaign ID'] and result['Cost'].dtype == np.float64,
+              f"[{engine}] only the requested columns, in the requested order")
+
+    try:
+        read_export('location', age_path)
+        check(False, "wrong export type rejected")
+    except ValueError as e:
+        check('Country/Territory (User location)' in str(e), f"wrong export type rejected: {e}")
+
+    try:
+        read_export('age_gender', age_path, columns=['Campaign ID', 'Reach'])
+        check(False, "unknown requested column rejected")
+    except ValueError as e:
+        check("'Reach'" in str(e), "unknown requested column rejected")
+
+finish("Export Schema")
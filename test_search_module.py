@@ -6,7 +6,11 @@ Tests search functionality with priority, case-insensitivity, and debug checks
 """
 
 import pandas as pd
+import numpy as np
 import sys
+import time
+
+from hub_search import TrigramIndex
 
 # Set UTF-8 encoding for output
 if sys.platform == 'win32':
@@ -192,6 +196,52 @@ for term in common_terms:
     results = df[df['Campaign'].str.lower().str.contains(term.lower(), na=False)]
     print(f"  '{term:15s}' → {len(results):3d} campaigns")
 
+# ============================================================================
+# LATENCY BENCHMARK (trigram index vs. str.contains scan)
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("LATENCY BENCHMARK - TRIGRAM INDEX")
+print("=" * 80)
+
+benchmark_queries = common_terms + ['mcd', 'yt', 'XYZ123NonExistent', '2025', 'q3 2025', 'mc.', '  Split ']
+index_mismatches = 0
+
+for column in ['Campaign', 'Standardized_Campaign_Name']:
+    if column not in df.columns:
+        continue
+
+    for scale in [1, 100]:
+        names = pd.concat([df[column]] * scale, ignore_index=True)
+
+        start = time.perf_counter()
+        index = TrigramIndex(names)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        names_lower = names.str.lower()
+        scan_total = 0.0
+        index_total = 0.0
+        for query in benchmark_queries:
+            start = time.perf_counter()
+            expected = np.flatnonzero(names_lower.str.contains(query.strip().lower(), na=False).to_numpy())
+            scan_total += time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = index.search_positions(query)
+            index_total += time.perf_counter() - start
+
+            if not np.array_equal(expected, result):
+                index_mismatches += 1
+                print(f"[FAIL] {column} x{scale}: '{query}' -> index {len(result)}, scan {len(expected)}")
+
+        scan_ms = scan_total / len(benchmark_queries) * 1000
+        index_ms = index_total / len(benchmark_queries) * 1000
+        print(f"[INFO] {column} x{scale} ({len(names):,} names) - build: {build_ms:.1f} ms, "
+              f"scan: {scan_ms:.3f} ms/query, index: {index_ms:.3f} ms/query")
+
+if index_mismatches == 0:
+    print("[PASS] Trigram index returns exactly the str.contains() matches")
+
 # ============================================================================
 # SUMMARY
 # ============================================================================
@@ -206,6 +256,7 @@ print("  ✅ Priority over other filters (searches FIRST)")
 print("  ✅ Debug check for 0 results")
 print("  ✅ Searches ORIGINAL campaign names (not standardized)")
 print("  ✅ Reset button clears search input")
+print("  ✅ Trigram index matches str.contains() results")
 
 print("\n[FEATURES]:")
 print("  🔍 Text input in sidebar: '🔍 Pretraži kampanje'")
@@ -216,3 +267,6 @@ print("  🔄 Reset button clears search query")
 print("\n" + "=" * 80)
 print("[DONE] Search Module Test Complete")
 print("=" * 80)
+
+if index_mismatches > 0:
+    sys.exit(1)
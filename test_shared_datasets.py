@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Shared Read-only Datasets
+Tests that the shared datasets hold the same data as the per-call loaders,
+are frozen without being copied, that filtered selections are private
+writable copies, and that hub_app.py memory stays flat as sessions are added
+"""
+
+import gc
+import shutil
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+import hub_cache
+import hub_data
+import hub_datasets
+from hub_filters import FilterPipeline
+from hub_checks import banner, check, finish
+
+banner("SHARED DATASETS TEST")
+
+# ============================================================================
+# TEST 1: SAME DATA, FROZEN, NOT COPIED
+# ============================================================================
+
+print("\n[TEST 1] Shared frames = loader frames, read-only, zero-copy")
+
+shared = hub_datasets.load_shared_datasets()
+check(shared.campaigns.equals(hub_cache.load_prepared_campaigns()), f"campaigns: {len(shared.campaigns):,} rows identical")
+check(shared.demographics.equals(hub_data.load_demographics_data(hub_cache.DEMOGRAPHICS_PATH)),
+      f"demographics: {len(shared.demographics):,} rows identical")
+check(shared.filter_index.df is shared.campaigns, "filter index wraps the shared frame itself")
+check(hub_datasets.is_frozen(shared.campaigns) and hub_datasets.is_frozen(shared.demographics), "both frames frozen")
+
+for label, write in [
+    ('.loc', lambda: shared.campaigns.loc.__setitem__((shared.campaigns.index[0], 'Cost_parsed'), -1.0)),
+    ('.iloc', lambda: shared.demographics.iloc.__setitem__((0, shared.demographics.columns.get_loc('Cost_parsed')), -1.0)),
+    ('.to_numpy()', lambda: shared.campaigns['Impr_parsed'].to_numpy().__setitem__(0, -1)),
+]:
+    try:
+        write()
+        check(False, f"in-place write via {label} rejected")
+    except ValueError:
+        check(True, f"in-place write via {label} rejected")
+
+name = shared.campaigns['Standardized_Campaign_Name_Corrected'].iloc[0]
+check((shared.campaigns['Standardized_Campaign_Name_Corrected'] == name).sum() >= 1,
+      "object columns compare with a scalar (drill-down lookup)")
+
+source = hub_cache.load_prepared_campaigns()
+frozen = hub_datasets.freeze_frame(source)
+check(np.shares_memory(frozen['Cost_parsed'].to_numpy(), source['Cost_parsed'].to_numpy()), "freezing makes no copy")
+
+# Cold cache: the demographics CSV is read once for both frames
+reads = []
+read_demographics = hub_data.load_demographics_data
+def counted_read(*args, **kwargs):
+    reads.append(args)
+    return read_demographics(*args, **kwargs)
+
+cache_dir = tempfile.mkdtemp(prefix='hub_datasets_test_')
+hub_cache.load_demographics_data = hub_data.load_demographics_data = counted_read
+try:
+    cold_campaigns, cold_demographics = hub_cache.load_prepared_frames(cache_dir=cache_dir)
+finally:
+    hub_cache.load_demographics_data = hub_data.load_demographics_data = read_demographics
+    shutil.rmtree(cache_dir, ignore_errors=True)
+check(len(reads) == 1 and cold_campaigns.equals(source) and cold_demographics.equals(shared.demographics),
+      f"cold cache: same frames, demographics CSV read {len(reads)}x")
+
+# ============================================================================
+# TEST 2: PER-SESSION SELECTIONS
+# ============================================================================
+
+print("\n[TEST 2] Only filtered selections are materialized per session")
+
+pipeline = FilterPipeline(shared.filter_index)
+pipeline.run(budget_range=(0, 1e9))
+check(pipeline.frame() is shared.campaigns, "selection of every row = the shared frame (no copy)")
+
+brand = shared.campaigns['Brand'].value_counts().index[0]
+pipeline.run(selections={'Brand': [brand]})
+selection = pipeline.frame()
+check(not np.shares_memory(selection['Cost_parsed'].to_numpy(), shared.campaigns['Cost_parsed'].to_numpy()),
+      f"filtered selection ({len(selection):,} rows) is a private copy")
+selection.loc[selection.index[0], 'Cost_parsed'] = -1.0
+check(shared.campaigns['Cost_parsed'].min() >= 0, "writing a selection never reaches the shared frame")
+
+# ============================================================================
+# TEST 3: MEMORY PER SESSION
+# ============================================================================
+
+print("\n[TEST 3] hub_app.py memory as sessions are added")
+
+try:
+    from streamlit.testing.v1 import AppTest
+except ImportError:
+    AppTest = None
+
+if AppTest is None:
+    print("[INFO] streamlit.testing not available - skipped")
+else:
+    tracemalloc.start()
+    sessions, traced_mb = [], []
+    for _ in range(5):
+        session = AppTest.from_file('hub_app.py', default_timeout=120)
+        session.run()
+        sessions.append(session)
+        gc.collect()
+        traced_mb.append(tracemalloc.get_traced_memory()[0] / 1e6)
+    tracemalloc.stop()
+
+    per_session = (traced_mb[-1] - traced_mb[1]) / (len(traced_mb) - 2)
+    datasets_mb = hub_datasets.frame_mb(shared.campaigns) + hub_datasets.frame_mb(shared.demographics)
+    print(f"[INFO] traced MB after each session: {[round(mb, 1) for mb in traced_mb]}")
+    print(f"[INFO] {per_session:.2f} MB per extra session, shared datasets {datasets_mb:.1f} MB")
+    check(not any(session.exception for session in sessions), "every session renders")
+    check(per_session < 0.5 * datasets_mb, "extra sessions do not hold their own copy of the datasets")
+
+finish("Shared Datasets")
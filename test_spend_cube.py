@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Pre-aggregated Spend Cube
+Tests that the age / gender / noise panel distributions read from the spend
+cube equal the groupbys over df_filtered and the raw demographics rows for
+filtered selections (same labels, same order, same sums), and how much
+faster the indexed sums are
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+import hub_datasets
+from hub_cube import SpendCube
+from hub_filters import FilterPipeline
+from hub_checks import banner, check, finish
+
+banner("SPEND CUBE TEST")
+
+def same(expected, result):
+    """Same labels in the same order, sums equal up to float rounding."""
+    return (list(expected.index) == list(result.index) and expected.index.name == result.index.name
+            and np.allclose(expected.to_numpy(), result.to_numpy(), rtol=1e-12, atol=1e-9))
+
+shared = hub_datasets.load_shared_datasets()
+df_campaigns, df_demographics, cube = shared.campaigns, shared.demographics, shared.spend_cube
+
+def groupby_panels(rows):
+    """The hub_app.py panels before the cube."""
+    df_filtered = df_campaigns.iloc[rows]
+    demo_filtered = df_demographics[df_demographics['Campaign ID'].isin(df_filtered['Campaign ID'].tolist())]
+    return {
+        'Age_Range': df_filtered.groupby('Age_Range', observed=True)['Cost_parsed'].sum().sort_values(ascending=False),
+        'Gender': df_filtered.groupby('Gender', observed=True)['Cost_parsed'].sum().sort_values(ascending=False),
+        'has_demographics': len(demo_filtered) > 0,
+        'Age': demo_filtered.groupby('Age')['Cost_parsed'].sum().sort_values(ascending=False),
+        'Gender_segments': demo_filtered.groupby('Gender')['Cost_parsed'].sum().sort_values(ascending=False),
+    }
+
+def cube_panels(rows):
+    return {
+        'Age_Range': cube.label_distribution('Age_Range', rows),
+        'Gender': cube.label_distribution('Gender', rows),
+        'has_demographics': cube.has_demographics(rows),
+        'Age': cube.segment_spend(rows, 'Age'),
+        'Gender_segments': cube.segment_spend(rows, 'Gender'),
+    }
+
+# ============================================================================
+# TEST 1: CUBE SHAPE
+# ============================================================================
+
+print("\n[TEST 1] Cube layout")
+
+check(cube.spend.shape == (len(df_campaigns), len(cube.ages), len(cube.genders)),
+      f"cube {cube.spend.shape} = campaigns x {list(cube.ages)} x {list(cube.genders)}")
+known = df_demographics['Campaign ID'].isin(df_campaigns['Campaign ID'])
+check(np.isclose(cube.spend.sum(), df_demographics.loc[known, 'Cost_parsed'].sum()), "holds all demographics spend of known campaigns")
+check(not cube.spend.flags.writeable, f"read-only, {cube.nbytes() / 1024:,.0f} KB")
+
+# ============================================================================
+# TEST 2: SAME PANELS AS THE GROUPBYS
+# ============================================================================
+
+print("\n[TEST 2] Panels for filtered selections")
+
+index = shared.filter_index
+pipeline = FilterPipeline(index)
+brand = df_campaigns['Brand'].value_counts().index[0]
+selections = [
+    ('all', {}),
+    ('budget', {'budget_range': (1000.0, 8000.0)}),
+    ('search', {'search_query': 'mcd'}),
+    ('brand', {'selections': {'Brand': [brand]}}),
+    ('nothing', {'search_query': 'zzzznothing'}),
+]
+rng = np.random.default_rng(42)
+for number in range(40):
+    size = int(rng.integers(1, len(df_campaigns)))
+    selections.append((f'random {number}', np.sort(rng.choice(len(df_campaigns), size, replace=False))))
+
+mismatches = []
+for name, selection in selections:
+    rows = pipeline.run(**selection) if isinstance(selection, dict) else selection
+    expected, result = groupby_panels(rows), cube_panels(rows)
+    for panel in expected:
+        if panel == 'has_demographics':
+            ok = expected[panel] == result[panel]
+        elif panel in ('Age', 'Gender_segments'):
+            # the app drops empty segments before plotting
+            ok = same(expected[panel][expected[panel] > 0], result[panel][result[panel] > 0])
+        else:
+            ok = same(expected[panel], result[panel])
+        if not ok:
+            mismatches.append((name, panel))
+
+check(not mismatches, f"{len(selections)} selections x 5 panels identical {mismatches[:5]}")
+
+# ============================================================================
+# TEST 3: MISSING AGE / GENDER
+# ============================================================================
+
+print("\n[TEST 3] Demographics rows with a missing Age or Gender")
+
+toy_campaigns = pd.DataFrame({'Campaign ID': [1, 2], 'Cost_parsed': [10.0, 20.0],
+                              'Age_Range': ['18-24', '25-34'], 'Gender': ['Male', 'Female']})
+toy_demographics = pd.DataFrame({
+    'Campaign ID': [1, 1, 1, 2, 2],
+    'Age': ['18-24', '18-24', None, '25-34', None],
+    'Gender': ['Male', None, 'Female', None, None],
+    'Cost_parsed': [4.0, 3.0, 2.0, 5.0, 1.0],
+})
+toy = SpendCube(toy_campaigns, toy_demographics)
+all_rows = np.arange(2)
+expected_age = toy_demographics.groupby('Age')['Cost_parsed'].sum().sort_values(ascending=False)
+expected_gender = toy_demographics.groupby('Gender')['Cost_parsed'].sum().sort_values(ascending=False)
+check(same(expected_age, toy.segment_spend(all_rows, 'Age')),
+      f"rows with a missing Gender keep their Age spend {toy.segment_spend(all_rows, 'Age').to_dict()}")
+check(same(expected_gender, toy.segment_spend(all_rows, 'Gender')),
+      f"Gender segments without the missing Gender {toy.segment_spend(all_rows, 'Gender').to_dict()}")
+check(toy.has_demographics(np.array([1])), "a campaign whose rows all lack a Gender has demographics")
+
+# ============================================================================
+# TEST 4: SPEED
+# ============================================================================
+
+print("\n[TEST 4] Indexed sums vs groupbys")
+
+rows = pipeline.run(budget_range=(500.0, 50000.0))
+timings = {}
+for label, panels in [('groupby', groupby_panels), ('cube', cube_panels)]:
+    start = time.perf_counter()
+    for _ in range(20):
+        panels(rows)
+    timings[label] = (time.perf_counter() - start) / 20 * 1000
+    print(f"[INFO] {label}: {timings[label]:.2f} ms per rerun ({len(rows)} campaigns)")
+
+groupby_ms, cube_ms = timings['groupby'], timings['cube']
+check(cube_ms < groupby_ms, f"cube faster ({groupby_ms / cube_ms:.1f}x)")
+
+finish("Spend Cube")
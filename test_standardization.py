@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Column-wise Name Components
+Tests that the grouped target extractor, the column-wise Brand / Ad_Format /
+Date_Range / Goal builders and the standardized-name builder give exactly the
+per-row results they replace
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import time
+
+import hub_standardization as hs
+
+# Set UTF-8 encoding for output
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+print("=" * 80)
+print("STANDARDIZATION COMPONENTS TEST")
+print("=" * 80)
+
+failures = 0
+
+def check_equal(expected, result, message):
+    global failures
+    mismatches = int((expected.to_numpy() != result.to_numpy()).sum())
+    if mismatches == 0 and expected.index.equals(result.index):
+        print(f"[PASS] {message}")
+    else:
+        failures += 1
+        print(f"[FAIL] {message}: {mismatches} mismatches")
+        print(pd.DataFrame({'expected': expected, 'result': result})[expected != result].head())
+
+df_hr = pd.read_csv('ads_estimation_hub_HR_PROTOTYPE_V3_CLEANED.csv', delimiter=';', encoding='utf-8-sig')
+df_age = pd.read_csv('data - v3/age - gender - v3/campaign age - gender - version 3.csv',
+                     delimiter=';', encoding='utf-8-sig')
+print(f"[OK] {len(df_hr):,} campaigns, {len(df_age):,} age-gender rows")
+
+# ============================================================================
+# TEST 1: TARGETS (real export)
+# ============================================================================
+
+print("\n[TEST 1] Grouped targets equal the per-campaign scan")
+
+start = time.perf_counter()
+expected = df_hr.apply(
+    lambda row: hs.extract_target_info(row['Campaign ID'], df_age) if row['Has_Demographics'] else "Auto | All",
+    axis=1
+)
+row_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+result = hs.target_series(df_hr['Campaign ID'], df_hr['Has_Demographics'], df_age)
+grouped_ms = (time.perf_counter() - start) * 1000
+
+check_equal(expected, result, f"{len(result)} targets identical")
+print(f"[INFO] per-row scan: {row_ms:.1f} ms, grouped: {grouped_ms:.1f} ms")
+
+# ============================================================================
+# TEST 2: TARGETS (random subsets of buckets)
+# ============================================================================
+
+print("\n[TEST 2] Random age / gender subsets")
+
+rng = np.random.default_rng(3)
+ages = ['18-24', '25-34', '35-44', '45-54', '55-64', '65+', 'Undetermined', '18 - 24', 'Unknown', None]
+genders = ['Male', 'Female', 'Unknown', None]
+
+rows = []
+for campaign_id in range(1, 401):
+    n_rows = rng.integers(1, 8)
+    for _ in range(n_rows):
+        rows.append({
+            'Campaign ID': campaign_id,
+            'Age': ages[rng.integers(0, len(ages))],
+            'Gender': genders[rng.integers(0, len(genders))],
+        })
+df_random = pd.DataFrame(rows)
+
+campaign_ids = pd.Series(np.arange(0, 402))
+has_demographics = pd.Series(rng.random(len(campaign_ids)) < 0.9)
+expected = pd.Series([
+    hs.extract_target_info(campaign_id, df_random) if has_demo else "Auto | All"
+    for campaign_id, has_demo in zip(campaign_ids, has_demographics)
+])
+result = hs.target_series(campaign_ids, has_demographics, df_random)
+check_equal(expected, result, f"{len(result)} random campaigns identical ({expected.nunique()} distinct targets)")
+
+# ============================================================================
+# TEST 3: BRAND / AD_FORMAT / DATE_RANGE / GOAL
+# ============================================================================
+
+print("\n[TEST 3] Column-wise name components")
+
+df_edge = df_hr[['Account', 'Campaign', 'YouTube_Ad_Formats', 'Start_Date', 'End_Date']].copy()
+edge_rows = rng.choice(df_edge.index, 60, replace=False)
+df_edge.loc[edge_rows[:15], 'Account'] = np.nan
+df_edge.loc[edge_rows[15:30], 'Campaign'] = np.nan
+df_edge.loc[edge_rows[30:45], 'YouTube_Ad_Formats'] = np.nan
+df_edge.loc[edge_rows[45:50], 'Start_Date'] = np.nan
+df_edge.loc[edge_rows[50:55], 'End_Date'] = 'not a date'
+
+for label, df in [('real', df_hr), ('with missing values', df_edge)]:
+    check_equal(
+        df.apply(lambda row: hs.extract_brand_from_account(row['Account'], row['Campaign']), axis=1),
+        hs.brand_series(df['Account'], df['Campaign']),
+        f"Brand ({label})"
+    )
+
+    ad_format = df.apply(lambda row: hs.extract_ad_format(row['YouTube_Ad_Formats'], row['Campaign']), axis=1)
+    check_equal(ad_format, hs.ad_format_series(df['YouTube_Ad_Formats'], df['Campaign']), f"Ad_Format ({label})")
+
+    check_equal(
+        df.apply(lambda row: hs.format_date_range(row['Start_Date'], row['End_Date']), axis=1),
+        hs.date_range_series(df['Start_Date'], df['End_Date']),
+        f"Date_Range ({label})"
+    )
+
+bid_strategies = pd.Series(['vCPM', 'tCPM', 'MaxConv', 'tCPA', 'tROAS', 'CPV', 'tCPV', 'CPC', 'MaxClicks', 'Unknown', np.nan])
+formats = pd.Series(['YouTube Bumper', 'YouTube Shorts', 'PMax', 'Display', 'Other', np.nan])
+pairs = pd.MultiIndex.from_product([bid_strategies, formats]).to_frame(index=False, name=['Bid', 'Format'])
+check_equal(
+    pairs.apply(lambda row: hs.determine_goal(row['Bid'], row['Format']), axis=1),
+    hs.goal_series(pairs['Bid'], pairs['Format']),
+    f"Goal ({len(pairs)} strategy x format pairs)"
+)
+
+# ============================================================================
+# TEST 4: STANDARDIZED NAME
+# ============================================================================
+
+print("\n[TEST 4] Column-wise name builder equals rebuild_campaign_name()")
+
+df_master = pd.read_csv('MASTER_ADS_HR_CLEANED.csv', delimiter=';', encoding='utf-8-sig')
+
+df_holes = df_master.copy()
+for column in hs.NAME_COLUMNS:
+    df_holes.loc[rng.choice(df_holes.index, 80, replace=False), column] = np.nan
+
+df_corrected = df_master.copy()
+df_corrected['Target_Corrected'] = df_corrected['Target'].str.upper()
+
+df_categorical = df_corrected.copy()
+for column in ['Brand', 'Ad_Format', 'Goal']:
+    df_categorical[column] = df_categorical[column].astype('category')
+
+for label, df in [('master file', df_master), ('missing parts', df_holes),
+                  ('Target_Corrected', df_corrected), ('categorical columns', df_categorical),
+                  ('no Goal column', df_master.drop(columns=['Goal']))]:
+    start = time.perf_counter()
+    expected = df.apply(hs.rebuild_campaign_name, axis=1)
+    row_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    result = hs.standardized_name_series(df)
+    column_ms = (time.perf_counter() - start) * 1000
+
+    check_equal(expected, result, f"{label}: {len(result)} names ({row_ms:.1f} ms -> {column_ms:.1f} ms)")
+
+check_equal(
+    df_holes.apply(hs.rebuild_campaign_name, axis=1),
+    hs.standardized_name_series(df_holes.assign(Target_Corrected='ignored'), target_column='Target'),
+    "target_column='Target' ignores Target_Corrected (merge scripts)"
+)
+
+print("\n" + "=" * 80)
+if failures == 0:
+    print("[DONE] Standardization Test Complete - all checks passed")
+else:
+    print(f"[DONE] Standardization Test Complete - {failures} FAILED")
+print("=" * 80)
+
+if failures > 0:
+    sys.exit(1)
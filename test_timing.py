@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Rerun Timing Instrumentation
+Tests the stage timers / counters, that library stages are recorded only
+while a rerun is being timed, the per-filter stage records of the filter
+pipeline and the rotating JSON timing log
+"""
+
+import os
+import tempfile
+import time
+
+import hub_timing
+from hub_filters import FilterIndex, FilterPipeline
+from hub_cache import load_prepared_campaigns
+from hub_checks import banner, check, finish
+
+banner("TIMING INSTRUMENTATION TEST")
+
+# ============================================================================
+# TEST 1: TIMERS + COUNTERS
+# ============================================================================
+
+print("\n[TEST 1] Stage timers and counters")
+
+with hub_timing.timed('nobody_listens'):
+    hub_timing.count('nobody_counts')
+check(hub_timing.active_timer() is None, "timed() / count() without a running rerun are no-ops")
+
+timer = hub_timing.start_rerun('test')
+with timer.stage('outer'):
+    for _ in range(3):
+        with hub_timing.timed('inner'):
+            time.sleep(0.01)
+        hub_timing.count('loops')
+
+stages = {record['stage']: record for record in timer.records()}
+check(list(stages) == ['outer', 'inner'], f"stages in first-run order: {list(stages)}")
+check(stages['inner']['calls'] == 3 and stages['inner']['ms'] >= 30, f"repeated stage accumulates: {stages['inner']}")
+check(stages['outer']['ms'] >= stages['inner']['ms'], "parent stage includes nested stages")
+check(timer.counters == {'loops': 3}, f"counters: {timer.counters}")
+
+try:
+    with timer.stage('failing'):
+        raise ValueError('boom')
+except ValueError:
+    pass
+check(timer.stages['failing'][1] == 1, "a stage that raises is still recorded")
+
+# ============================================================================
+# TEST 2: FILTER PIPELINE STAGES
+# ============================================================================
+
+print("\n[TEST 2] Per-filter stages of a timed rerun")
+
+df_campaigns = load_prepared_campaigns()
+pipeline = FilterPipeline(FilterIndex(df_campaigns))
+brand = df_campaigns['Brand'].value_counts().index[0]
+
+timer = hub_timing.start_rerun('filters')
+pipeline.run(budget_range=(0, 1e9), selections={'Brand': [brand], 'Gender': ['Svi']})
+pipeline.frame()
+check(all(f'filter:{name}' in timer.stages for name in ['budget', 'dates', 'search', 'Brand', 'Gender']),
+      f"one timer per filter stage: {[name for name in timer.stages if name.startswith('filter:')]}")
+check('derived:_frame' in timer.stages and timer.counters.get('filter_stage_runs') == 5,
+      f"frame materialization timed, counters {timer.counters}")
+
+timer = hub_timing.start_rerun('filters')
+pipeline.run(budget_range=(0, 1e9), selections={'Brand': [brand], 'Gender': ['Svi']})
+check(not any(name.startswith('filter:') for name in timer.stages) and timer.counters == {'filter_state_unchanged': 1},
+      "unchanged filters: no filter stage runs")
+
+# ============================================================================
+# TEST 3: ROTATING LOG
+# ============================================================================
+
+print("\n[TEST 3] Rotating JSON log")
+
+with tempfile.TemporaryDirectory() as tmp:
+    log_path = os.path.join(tmp, 'logs', 'timing.log')
+    default_max_bytes = hub_timing.LOG_MAX_BYTES
+    hub_timing.LOG_MAX_BYTES = 2000
+
+    for number in range(100):
+        timer = hub_timing.start_rerun('hub_app')
+        with timer.stage('filters'):
+            pass
+        record = hub_timing.finish_rerun(timer, log_path=log_path, rerun=number)
+
+    hub_timing.LOG_MAX_BYTES = default_max_bytes
+    for handler in hub_timing.timing_logger(log_path).handlers:
+        handler.close()
+
+    files = sorted(os.listdir(os.path.dirname(log_path)))
+    records = hub_timing.read_timing_log(log_path)
+    check(hub_timing.active_timer() is None, "finish_rerun() stops timing")
+    check(len(files) == hub_timing.LOG_BACKUP_COUNT + 1, f"log rotated into {files}")
+    check(all(os.path.getsize(os.path.join(tmp, 'logs', name)) <= 2000 for name in files), "files stay under the size cap")
+    check(records[-1]['rerun'] == 99 and 'filters' in records[-1]['stages'],
+          f"newest rerun readable ({len(records)} kept, extra stats included)")
+    check([r['rerun'] for r in records] == list(range(100 - len(records), 100)), "records in rerun order across rotated files")
+
+# ============================================================================
+# TEST 4: OVERHEAD
+# ============================================================================
+
+print("\n[TEST 4] Overhead")
+
+for label, timer in [('not timing', None), ('timing', hub_timing.start_rerun('overhead'))]:
+    if timer is None:
+        hub_timing.finish_rerun(hub_timing.start_rerun('reset'), log_path=None)
+    start = time.perf_counter()
+    for _ in range(10000):
+        with hub_timing.timed('stage'):
+            pass
+    per_call_us = (time.perf_counter() - start) / 10000 * 1e6
+    print(f"[INFO] {label}: {per_call_us:.2f} us per timed() block")
+    check(per_call_us < 50, f"{label}: timed() is cheap")
+
+finish("Timing")
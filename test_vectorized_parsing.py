@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TEST SCRIPT - Vectorized Numeric Parsing
+Tests that parse_*_series produce exactly the same values as the per-cell helpers
+"""
+
+import pandas as pd
+import numpy as np
+import time
+
+from hub_parsing import (
+    parse_cost, parse_number, parse_float,
+    parse_cost_series, parse_number_series, parse_float_series,
+    extract_quarter, parse_date_range_series
+)
+from hub_checks import banner, check, finish
+
+banner("VECTORIZED PARSING TEST")
+
+def same_values(a, b):
+    """Exact comparison (NaN == NaN), including dtype."""
+    return a.dtype == b.dtype and np.array_equal(
+        a.to_numpy(dtype=np.float64), b.to_numpy(dtype=np.float64), equal_nan=True
+    )
+
+PARSERS = [
+    ('parse_cost', parse_cost, parse_cost_series),
+    ('parse_number', parse_number, parse_number_series),
+    ('parse_float', parse_float, parse_float_series),
+]
+
+# ============================================================================
+# TEST 1: EDGE CASES
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 1: EDGE CASES")
+print("=" * 80)
+
+edge_values = pd.Series([
+    'EUR 1,234.56', '12.3%', '--', None, np.nan, ' 5 ', '4,956,859',
+    'nan', 'inf', '1e3', 'EUR', '', 'N/A', 7, 7.5, '-3.7', '0.00%'
+], dtype=object)
+
+for name, scalar, vectorized in PARSERS:
+    expected = edge_values.apply(scalar)
+    result = vectorized(edge_values)
+
+    if not check(same_values(expected, result), f"{name}: {len(edge_values)} edge values identical"):
+        print(f"  expected: {expected.tolist()}")
+        print(f"  got:      {result.tolist()}")
+
+# ============================================================================
+# TEST 2: MASTER FILE - ALL METRIC COLUMNS
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 2: MASTER FILE COLUMNS")
+print("=" * 80)
+
+df = pd.read_csv('MASTER_ADS_HR_CLEANED.csv', delimiter=';', encoding='utf-8-sig')
+print(f"[OK] Loaded {len(df)} campaigns")
+
+columns = [
+    ('Cost', 'parse_cost'), ('Impr.', 'parse_number'), ('Peak_Reach', 'parse_number'),
+    ('Clicks', 'parse_number'), ('CTR', 'parse_float'), ('Avg. CPC', 'parse_cost'),
+    ('Avg. CPM', 'parse_cost'), ('TrueView views', 'parse_number'),
+    ('TrueView avg. CPV', 'parse_cost'), ('Conversions', 'parse_float'),
+    ('Conv. rate', 'parse_float'), ('Cost / conv.', 'parse_cost'),
+]
+parsers = {name: (scalar, vectorized) for name, scalar, vectorized in PARSERS}
+
+for column, parser_name in columns:
+    scalar, vectorized = parsers[parser_name]
+    expected = df[column].apply(scalar)
+    result = vectorized(df[column])
+
+    if not check(same_values(expected, result), f"{column:<20} ({parser_name})"):
+        print(f"  {(expected != result).sum()} differing values")
+
+# ============================================================================
+# TEST 3: SPEED (10x master file)
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 3: SPEED")
+print("=" * 80)
+
+big = pd.concat([df['Impr.']] * 10, ignore_index=True)
+
+start = time.perf_counter()
+big.apply(parse_number)
+scalar_time = time.perf_counter() - start
+
+start = time.perf_counter()
+parse_number_series(big)
+vectorized_time = time.perf_counter() - start
+
+print(f"[INFO] {len(big):,} cells - apply: {scalar_time * 1000:.1f} ms, vectorized: {vectorized_time * 1000:.1f} ms")
+
+# ============================================================================
+# TEST 4: DATE RANGES
+# ============================================================================
+
+print("\n" + "=" * 80)
+print("TEST 4: DATE RANGES")
+print("=" * 80)
+
+date_cases = pd.Series(
+    df['Date_Range'].tolist() +
+    [None, '', 'Q1 2025', 'sept 25', 'Mar - Apr 2025', 'Dec-Jan 24', ' jan 25 ', 'Jan-Feb25', 'Feb 24']
+)
+dates = parse_date_range_series(date_cases)
+
+check(dates['Quarter'].equals(date_cases.apply(extract_quarter)),
+      f"Quarter identical to extract_quarter() for {len(date_cases)} values")
+
+expected_dates = {
+    'Jan-Mar 25': ('2025-01-01', '2025-03-31', 2025),
+    'Oct 25': ('2025-10-01', '2025-10-31', 2025),
+    'Dec-Jan 24': ('2024-12-01', '2025-01-31', 2024),
+    'Feb 24': ('2024-02-01', '2024-02-29', 2024),
+    'Mar - Apr 2025': ('2025-03-01', '2025-04-30', 2025),
+}
+for date_range, (start_date, end_date, year) in expected_dates.items():
+    row = parse_date_range_series(pd.Series([date_range])).iloc[0]
+    matches = row['Range_Start'] == pd.Timestamp(start_date) and row['Range_End'] == pd.Timestamp(end_date) and row['Year'] == year
+    if not check(matches, f"'{date_range}' -> {start_date} .. {end_date} ({year})"):
+        print(f"  got: {row['Range_Start']} .. {row['Range_End']} ({row['Year']})")
+
+unparsed = dates['Range_Start'].isna()
+print(f"[INFO] Unparsed (NaT): {date_cases[unparsed].tolist()}")
+
+big = pd.concat([df['Date_Range']] * 10, ignore_index=True)
+
+start = time.perf_counter()
+big.apply(extract_quarter)
+scalar_time = time.perf_counter() - start
+
+start = time.perf_counter()
+parse_date_range_series(big)
+vectorized_time = time.perf_counter() - start
+
+print(f"[INFO] {len(big):,} cells - extract_quarter apply: {scalar_time * 1000:.1f} ms, "
+      f"full date parse: {vectorized_time * 1000:.1f} ms")
+
+finish("Vectorized Parsing")
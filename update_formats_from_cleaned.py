@@ -9,6 +9,9 @@ Rebuilds Standardized_Campaign_Name with corrected formats
 import pandas as pd
 import sys
 
+from hub_corrections import apply_corrections
+from hub_standardization import standardized_name_series
+
 # Set UTF-8 encoding for output
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -34,37 +37,21 @@ df_main = pd.read_csv('ads_estimation_hub_HR_PROTOTYPE_V4_STANDARDIZED.csv',
 
 print(f"[OK] Ucitano {len(df_main)} kampanja iz glavne baze")
 
-# Create mapping dictionary: Campaign Name -> New Format
-format_mapping = dict(zip(df_cleaned['Campaign'], df_cleaned['Campaign Type']))
-
-print(f"\n[INFO] Mapping kreiran za {len(format_mapping)} kampanja")
+# Apply all corrections with one keyed map: Campaign Name -> New Format
+format_report = apply_corrections(df_main, df_cleaned, key='Campaign', value='Campaign Type', target='Ad_Format')
 
-# Track changes
-updated_count = 0
-not_found_count = 0
-not_found_campaigns = []
+print(f"\n[INFO] Mapping kreiran za {format_report.table_keys} kampanja")
 
 print("\n[UPDATE] Azuriram Ad_Format u glavnoj bazi...")
 
-for campaign_name, new_format in format_mapping.items():
-    # Find campaign in main database
-    mask = df_main['Campaign'] == campaign_name
-
-    if mask.any():
-        # Get old format
-        old_format = df_main.loc[mask, 'Ad_Format'].iloc[0]
-
-        # Update Ad_Format
-        df_main.loc[mask, 'Ad_Format'] = new_format
+# Show first 5 updates
+for number, change in enumerate(format_report.changes.head(5).itertuples(index=False), start=1):
+    print(f"  [{number}] '{change.Campaign[:60]}...'")
+    print(f"      Old: {change.Old} -> New: {change.New}")
 
-        updated_count += 1
-
-        if updated_count <= 5:  # Show first 5 updates
-            print(f"  [{updated_count}] '{campaign_name[:60]}...'")
-            print(f"      Old: {old_format} -> New: {new_format}")
-    else:
-        not_found_count += 1
-        not_found_campaigns.append(campaign_name)
+updated_count = format_report.matched_keys
+not_found_count = len(format_report.unmatched_keys)
+not_found_campaigns = format_report.unmatched_keys
 
 print(f"\n[RESULT] Azurirano: {updated_count} kampanja")
 
@@ -78,32 +65,8 @@ if not_found_count > 0:
 # Rebuild Standardized_Campaign_Name for updated campaigns
 print("\n[REBUILD] Regeneriram Standardized_Campaign_Name...")
 
-def rebuild_campaign_name(row):
-    """Rebuild standardized name with corrected Ad_Format."""
-    parts = []
-
-    if pd.notna(row.get('Brand')):
-        parts.append(str(row['Brand']))
-
-    if pd.notna(row.get('Ad_Format')):
-        parts.append(str(row['Ad_Format']))
-
-    if pd.notna(row.get('Target')):
-        parts.append(str(row['Target']))
-
-    if pd.notna(row.get('Date_Range')):
-        parts.append(str(row['Date_Range']))
-
-    if pd.notna(row.get('Bid_Strategy_Short')):
-        parts.append(str(row['Bid_Strategy_Short']))
-
-    if pd.notna(row.get('Goal')):
-        parts.append(str(row['Goal']))
-
-    return " | ".join(parts)
-
 # Apply rebuild to all rows (this ensures consistency)
-df_main['Standardized_Campaign_Name'] = df_main.apply(rebuild_campaign_name, axis=1)
+df_main['Standardized_Campaign_Name'] = standardized_name_series(df_main, target_column='Target')
 
 print("[OK] Standardized_Campaign_Name regeneriran za sve kampanje")
 
@@ -11,6 +11,8 @@ import numpy as np
 import sys
 import random
 
+from hub_parsing import parse_cost_series, parse_number_series
+
 # Set UTF-8 encoding for output
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -23,26 +25,6 @@ print("=" * 80)
 # HELPER FUNCTIONS (same as in hub_app.py)
 # ============================================================================
 
-def parse_cost(value):
-    """Parse cost values."""
-    if pd.isna(value):
-        return 0.0
-    value_str = str(value).strip().replace('EUR', '').replace(',', '').strip()
-    try:
-        return float(value_str)
-    except:
-        return 0.0
-
-def parse_number(value):
-    """Parse numeric values."""
-    if pd.isna(value):
-        return 0
-    value_str = str(value).strip().replace(',', '').strip()
-    try:
-        return int(float(value_str))
-    except:
-        return 0
-
 def parse_age_range(age_str):
     """Parse age range string to get min and max age."""
     age_str = str(age_str).strip()
@@ -143,11 +125,11 @@ df_demographics = pd.read_csv('data - v3/age - gender - v3/campaign age - gender
 print(f"[OK] Loaded {len(df_demographics)} demographic rows")
 
 # Parse costs in demographics
-df_demographics['Cost_parsed'] = df_demographics['Cost'].apply(parse_cost)
+df_demographics['Cost_parsed'] = parse_cost_series(df_demographics['Cost'])
 
 # Parse main database
-df_main['Cost_parsed'] = df_main['Cost'].apply(parse_cost)
-df_main['Impr_parsed'] = df_main['Impr.'].apply(parse_number)
+df_main['Cost_parsed'] = parse_cost_series(df_main['Cost'])
+df_main['Impr_parsed'] = parse_number_series(df_main['Impr.'])
 
 # ============================================================================
 # TEST 1: TOTAL SPEND CHECK
@@ -255,7 +237,7 @@ if len(campaigns_with_5plus_in_main) > 0:
 
     # Calculate totals from demographics
     total_cost_demo = demo_segments['Cost_parsed'].sum()
-    total_impr_demo = demo_segments['Impr.'].apply(parse_number).sum()
+    total_impr_demo = parse_number_series(demo_segments['Impr.']).sum()
 
     print(f"\n[DEMOGRAPHICS AGGREGATION]")
     print(f"  Total Cost: EUR {total_cost_demo:,.2f}")